@@ -1,12 +1,93 @@
 import pygame
 import numpy as np
-import random
 import math
+from strategies import PursuerState, TargetEstimate, pursue
+
+class PositionHistory:
+    """Histórico de posições em um buffer circular NumPy de tamanho fixo.
+
+    Substitui a lista com pop(0): cada frame escreve uma linha do buffer, e as
+    consultas de deslocamento, velocidade e aceleração retornam floats sem criar arrays.
+    Índices seguem a convenção de lista (0 = mais antiga, -1 = mais recente).
+    """
+    __slots__ = ('buffer', 'capacity', 'count', 'head')
+
+    def __init__(self, capacity):
+        self.buffer = np.zeros((capacity, 2))
+        self.capacity = capacity
+        self.count = 0
+        self.head = 0  # Próxima linha a ser escrita
+
+    def clear(self):
+        self.count = 0
+        self.head = 0
+
+    def append(self, x, y):
+        buffer = self.buffer
+        head = self.head
+        buffer[head, 0] = x
+        buffer[head, 1] = y
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def get_state(self):
+        """Só as linhas ocupadas, da mais antiga para a mais recente"""
+        rows = (self.head - self.count + np.arange(self.count)) % self.capacity
+        return {'positions': self.buffer[rows].copy()}
+
+    def set_state(self, state):
+        positions = state['positions']
+        self.clear()
+        for x, y in positions[-self.capacity:]:
+            self.append(x, y)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('índice fora do histórico')
+        row = (self.head - self.count + index) % self.capacity
+        return (self.buffer.item(row, 0), self.buffer.item(row, 1))
+
+    def displacement(self):
+        """Deslocamento (dx, dy) entre a posição mais antiga e a mais recente"""
+        if self.count < 2:
+            return (0.0, 0.0)
+        x0, y0 = self[0]
+        x1, y1 = self[-1]
+        return (x1 - x0, y1 - y0)
+
+    def velocity(self):
+        """Velocidade (px/frame) entre as duas últimas posições"""
+        if self.count < 2:
+            return (0.0, 0.0)
+        x1, y1 = self[-2]
+        x2, y2 = self[-1]
+        return (x2 - x1, y2 - y1)
+
+    def acceleration(self):
+        """Mudança de velocidade entre as três últimas posições"""
+        if self.count < 3:
+            return (0.0, 0.0)
+        x1, y1 = self[-3]
+        x2, y2 = self[-2]
+        x3, y3 = self[-1]
+        return ((x3 - x2) - (x2 - x1), (y3 - y2) - (y2 - y1))
 
 class Target:
-    def __init__(self, config, sprite_manager):
+    __slots__ = ('config', 'sprite_manager', 'rng', 'size', 'color', 'angle',
+                 'width', 'height', 'x', 'y', 'dx', 'dy', 'speed', 'position_history')
+
+    def __init__(self, config, sprite_manager, rng=None):
         self.config = config
         self.sprite_manager = sprite_manager
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.width = config.WIDTH
+        self.height = config.HEIGHT
         self.size = config.TARGET_SIZE
         self.color = config.TARGET_COLOR
         self.angle = 0  # Ângulo para rotação do sprite
@@ -15,33 +96,36 @@ class Target:
         self.dx = 0
         self.dy = 0
         
+        # Histórico para detecção de movimento (buffer circular reaproveitado entre episódios)
+        self.position_history = PositionHistory(config.TARGET_HISTORY_SIZE)
+        
         self.reset()
         
     def reset(self):
         # Posição inicial em uma borda aleatória
-        side = random.choice(['top', 'bottom', 'left', 'right'])
+        side = ['top', 'bottom', 'left', 'right'][self.rng.integers(4)]
         
         if side == 'top':
-            self.x = random.uniform(0, self.config.WIDTH)
+            self.x = self.rng.uniform(0, self.config.WIDTH)
             self.y = 0
         elif side == 'bottom':
-            self.x = random.uniform(0, self.config.WIDTH)
+            self.x = self.rng.uniform(0, self.config.WIDTH)
             self.y = self.config.HEIGHT
         elif side == 'left':
             self.x = 0
-            self.y = random.uniform(0, self.config.HEIGHT)
+            self.y = self.rng.uniform(0, self.config.HEIGHT)
         else:  # right
             self.x = self.config.WIDTH
-            self.y = random.uniform(0, self.config.HEIGHT)
+            self.y = self.rng.uniform(0, self.config.HEIGHT)
         
         # Direção aleatória apontando para dentro do canvas
         center_x, center_y = self.config.WIDTH / 2, self.config.HEIGHT / 2
         angle = np.arctan2(center_y - self.y, center_x - self.x)
-        angle += random.uniform(-np.pi/4, np.pi/4)  # Variação de ±45 graus
+        angle += self.rng.uniform(-np.pi/4, np.pi/4)  # Variação de ±45 graus
         
         # Velocidade: 8-15 px/frame (50-150% do tamanho de 20px)
         # 50% de 20px = 10px, 150% de 20px = 30px, mas a especificação diz 8-15px
-        self.speed = random.uniform(8, 15)
+        self.speed = self.rng.uniform(self.config.TARGET_MIN_SPEED, self.config.TARGET_MAX_SPEED)
         
         # Vetor de direção
         self.dx = np.cos(angle) * self.speed
@@ -50,8 +134,7 @@ class Target:
         # Calcular ângulo inicial baseado na direção
         self.angle = math.degrees(math.atan2(-self.dy, self.dx)) - 90
         
-        # Histórico para detecção de movimento
-        self.position_history = []
+        self.position_history.clear()
         
     def update(self):
         # Salvar posição anterior para cálculo de rotação
@@ -62,22 +145,33 @@ class Target:
         self.y += self.dy
         
         # Verificar colisão com bordas e refletir
-        if self.x <= 0 or self.x >= self.config.WIDTH:
+        if self.x <= 0 or self.x >= self.width:
             self.dx = -self.dx
-            self.x = max(0, min(self.x, self.config.WIDTH))
+            self.x = max(0, min(self.x, self.width))
         
-        if self.y <= 0 or self.y >= self.config.HEIGHT:
+        if self.y <= 0 or self.y >= self.height:
             self.dy = -self.dy
-            self.y = max(0, min(self.y, self.config.HEIGHT))
+            self.y = max(0, min(self.y, self.height))
         
         # Atualizar ângulo baseado na direção do movimento
         if self.dx != 0 or self.dy != 0:
             self.angle = math.degrees(math.atan2(-self.dy, self.dx)) - 90
         
-        # Manter histórico de posições
-        self.position_history.append((self.x, self.y))
-        if len(self.position_history) > 10:  # Manter apenas últimas 10 posições
-            self.position_history.pop(0)
+        # Manter histórico das últimas TARGET_HISTORY_SIZE posições
+        self.position_history.append(self.x, self.y)
+    
+    def get_state(self):
+        """Estado dinâmico (snapshot.py); o gerador aleatório é salvo pela simulação"""
+        return {
+            'x': self.x, 'y': self.y, 'dx': self.dx, 'dy': self.dy,
+            'speed': self.speed, 'angle': self.angle,
+            'position_history': self.position_history.get_state(),
+        }
+    
+    def set_state(self, state):
+        for name in ('x', 'y', 'dx', 'dy', 'speed', 'angle'):
+            setattr(self, name, state[name])
+        self.position_history.set_state(state['position_history'])
     
     def draw(self, screen):
         sprite = self.sprite_manager.get_sprite('target')
@@ -100,10 +194,27 @@ class Target:
                             (self.x - self.size/2, self.y - self.size/2, 
                              self.size, self.size))
 
+    def bounds(self):
+        """Retângulo ocupado pelo alvo na tela (usado pela renderização por retângulos sujos)"""
+        sprite = self.sprite_manager.get_sprite('target')
+        if sprite and self.config.ROTATE_SPRITES:
+            sprite = self.sprite_manager.get_rotated_sprite('target', self.angle) or sprite
+        if sprite:
+            return sprite.get_rect(center=(int(self.x), int(self.y)))
+        return pygame.Rect(int(self.x - self.size/2), int(self.y - self.size/2),
+                           self.size + 1, self.size + 1)
+
 class Pursuer:
-    def __init__(self, config, sprite_manager, target_speed=None):
+    __slots__ = ('config', 'sprite_manager', 'size', 'color', 'reaction_counter',
+                 'angle', 'x', 'y', 'speed', 'target_detected', 'last_known_position',
+                 'predicted_position', 'target_velocity', 'frames_since_detection',
+                 'heading', 'los_angle')
+
+    def __init__(self, config, sprite_manager, target_speed=None, rng=None):
         self.config = config
         self.sprite_manager = sprite_manager
+        # rng: sorteio da velocidade inicial
+        rng = rng if rng is not None else np.random.default_rng()
         self.size = config.PURSUER_SIZE
         self.color = config.PURSUER_COLOR
         self.reaction_counter = 0
@@ -120,18 +231,35 @@ class Pursuer:
             self.speed = max(6, min(12, calculated_speed))
         else:
             # Se não temos a velocidade do alvo, usa um valor aleatório no intervalo
-            self.speed = random.uniform(6, 12)
+            self.speed = rng.uniform(6, 12)
+            if config.PURSUER_SPEED is not None:
+                # Sorteia mesmo assim: o fluxo de surgimento segue igual para qualquer valor
+                self.speed = config.PURSUER_SPEED
         
         # Estado de detecção
         self.target_detected = False
         self.last_known_position = None
         self.predicted_position = None
+        self.target_velocity = (0.0, 0.0)  # Estimada a partir de detecções consecutivas
+        self.frames_since_detection = 0
+        
+        # Estado das estratégias (rumo e linha de visada no último movimento)
+        self.heading = math.nan
+        self.los_angle = math.nan
         
     def update(self, target_position, strategy="direct"):
         if target_position is None:
             self.target_detected = False
+            self.frames_since_detection += 1
             return
         
+        # Velocidade do alvo entre esta detecção e a anterior
+        if self.last_known_position is not None:
+            elapsed = self.frames_since_detection + 1
+            self.target_velocity = ((target_position[0] - self.last_known_position[0]) / elapsed,
+                                    (target_position[1] - self.last_known_position[1]) / elapsed)
+        self.frames_since_detection = 0
+        
         self.target_detected = True
         self.last_known_position = target_position
         
@@ -142,79 +270,40 @@ class Pursuer:
         
         self.reaction_counter = 0
         
-        # Salvar posição anterior
-        old_x, old_y = self.x, self.y
-        
-        # Aplicar estratégia de perseguição
-        if strategy == "direct":
-            self._direct_pursuit(target_position)
-        elif strategy == "intercept":
-            self._intercept_pursuit(target_position)
-        elif strategy == "proportional":
-            self._proportional_navigation(target_position)
+        # Aplicar estratégia de perseguição (kernels de strategies.py)
+        pursuer_state = PursuerState(self.x, self.y, self.speed, self.heading, self.los_angle)
+        estimate = TargetEstimate(target_position[0], target_position[1], *self.target_velocity)
+        dx, dy, heading, los = pursue(strategy, pursuer_state, estimate, self.config)
+        dx, dy = float(dx), float(dy)
+        self.x += dx
+        self.y += dy
+        self.heading = float(heading)
+        self.los_angle = float(los)
         
         # Atualizar ângulo baseado na direção do movimento
-        dx = self.x - old_x
-        dy = self.y - old_y
         if dx != 0 or dy != 0:
             self.angle = math.degrees(math.atan2(-dy, dx)) - 90
     
-    def _direct_pursuit(self, target_pos):
-        tx, ty = target_pos
-        
-        # Calcular direção
-        dx = tx - self.x
-        dy = ty - self.y
-        distance = np.sqrt(dx**2 + dy**2)
-        
-        if distance > 0:
-            # Normalizar e aplicar velocidade
-            self.x += (dx / distance) * self.speed
-            self.y += (dy / distance) * self.speed
+    def get_state(self):
+        """Estado dinâmico (snapshot.py)"""
+        return {
+            'x': self.x, 'y': self.y, 'speed': self.speed, 'angle': self.angle,
+            'reaction_counter': self.reaction_counter,
+            'target_detected': self.target_detected,
+            'last_known_position': self.last_known_position,
+            'predicted_position': self.predicted_position,
+            'target_velocity': self.target_velocity,
+            'frames_since_detection': self.frames_since_detection,
+            'heading': self.heading, 'los_angle': self.los_angle,
+        }
     
-    def _intercept_pursuit(self, target_pos):
-        # Predição de interceptação (simplificada)
-        tx, ty = target_pos
-        
-        # Estimativa de posição futura baseada na velocidade atual
-        future_x = tx
-        future_y = ty
-        
-        # Calcular direção para o ponto de interceptação
-        dx = future_x - self.x
-        dy = future_y - self.y
-        distance = np.sqrt(dx**2 + dy**2)
-        
-        if distance > 0:
-            # Normalizar e aplicar velocidade
-            self.x += (dx / distance) * self.speed
-            self.y += (dy / distance) * self.speed
+    def set_state(self, state):
+        for name, value in state.items():
+            if name in ('last_known_position', 'predicted_position', 'target_velocity') and value is not None:
+                value = tuple(value)
+            setattr(self, name, value)
     
-    def _proportional_navigation(self, target_pos):
-        # Navegação proporcional (simplificada)
-        tx, ty = target_pos
-        
-        # Calcular linha de visão
-        dx = tx - self.x
-        dy = ty - self.y
-        distance = np.sqrt(dx**2 + dy**2)
-        
-        if distance > 0:
-            # Adicionar componente proporcional à taxa de giro da linha de visão
-            # (simplificado como um pequeno ajuste angular)
-            angle_adjustment = 0.1  # Fator de ajuste
-            
-            # Calcular ângulo atual
-            current_angle = np.arctan2(dy, dx)
-            
-            # Aplicar pequeno ajuste aleatório para simular navegação proporcional
-            adjusted_angle = current_angle + random.uniform(-angle_adjustment, angle_adjustment)
-            
-            # Mover na direção ajustada
-            self.x += np.cos(adjusted_angle) * self.speed
-            self.y += np.sin(adjusted_angle) * self.speed
-    
-    def draw(self, screen):
+    def draw(self, screen, indicator=True):
         sprite = self.sprite_manager.get_sprite('pursuer')
         
         if sprite and self.config.ROTATE_SPRITES:
@@ -234,7 +323,25 @@ class Pursuer:
                              self.size, self.size))
         
         # Indicador de detecção (sobreposto à imagem)
-        if self.target_detected:
+        if indicator and self.target_detected:
             pygame.draw.circle(screen, (255, 255, 0), 
                              (int(self.x), int(self.y)), 
-                             self.size + 5, 2)
\ No newline at end of file
+                             self.size + 5, 2)
+    
+    def bounds(self):
+        """Retângulo ocupado pelo perseguidor e pelo indicador de detecção"""
+        sprite = self.sprite_manager.get_sprite('pursuer')
+        if sprite and self.config.ROTATE_SPRITES:
+            sprite = self.sprite_manager.get_rotated_sprite('pursuer', self.angle)
+        if sprite:
+            rect = sprite.get_rect(center=(int(self.x), int(self.y)))
+        else:
+            rect = pygame.Rect(int(self.x - self.size/2), int(self.y - self.size/2),
+                               self.size + 1, self.size + 1)
+        
+        if self.target_detected:
+            radius = self.size + 5
+            circle = pygame.Rect(0, 0, 2 * radius + 2, 2 * radius + 2)
+            circle.center = (int(self.x), int(self.y))
+            rect = rect.union(circle)
+        return rect
\ No newline at end of file
@@ -0,0 +1,196 @@
+# aggregates.py
+import math
+from itertools import combinations
+import numpy as np
+
+# Colunas por execução resumidas em cada estratégia
+SUMMARY_COLUMNS = [
+    'frames_to_capture', 'captured', 'detection_precision', 'detection_recall', 'detection_f1',
+    'total_detections', 'target_lost_count', 'time_to_capture'
+]
+
+
+class RunningStats:
+    """Contagem, média, variância (Welford), mínimo e máximo em memória constante.
+
+    update() recebe blocos de valores e merge() junta resultados parciais pela fórmula
+    de Chan, de modo que agregar por blocos, por processo ou tudo de uma vez dá o mesmo
+    resultado (a menos do arredondamento de ponto flutuante).
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _combine(self, count, mean, m2, low, high):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        mean = values.mean()
+        self._combine(len(values), float(mean), float(((values - mean) ** 2).sum()),
+                      float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def variance(self, ddof=1):
+        return self.m2 / (self.count - ddof) if self.count > ddof else 0.0
+
+    def std(self, ddof=1):
+        return math.sqrt(self.variance(ddof))
+
+
+class QuantileSketch:
+    """Esboço de quantis com erro relativo limitado (buckets logarítmicos, como o DDSketch).
+
+    O valor x > 0 cai no bucket ceil(log_gamma(x)), com gamma = (1 + alpha) / (1 - alpha):
+    qualquer quantil estimado fica a menos de alpha (relativo) do valor exato. Os buckets
+    são só contagens, então juntar esboços é somar contagens (merge exato), e o tamanho
+    depende da faixa de valores, não do número de execuções. Valores <= 0 contam como 0.
+    """
+
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        if len(positive):
+            keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Esboços com precisões diferentes não podem ser combinados")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Valor estimado do quantil q (0 a 1); nan sem valores"""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(0.0, self.min)
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class StrategySummary:
+    """Agregados de uma estratégia: RunningStats por coluna e esboço de frames até a captura"""
+
+    def __init__(self, alpha=0.01):
+        self.stats = {column: RunningStats() for column in SUMMARY_COLUMNS}
+        self.frames = QuantileSketch(alpha)
+
+    @property
+    def count(self):
+        return self.stats['frames_to_capture'].count
+
+    def update(self, columns):
+        """Acrescenta um bloco de execuções (colunas como em results.RESULT_DTYPES)"""
+        for column, stats in self.stats.items():
+            stats.update(columns[column])
+        self.frames.update(columns['frames_to_capture'])
+
+    def merge(self, other):
+        for column, stats in self.stats.items():
+            stats.merge(other.stats[column])
+        self.frames.merge(other.frames)
+
+
+class PairedDifferences:
+    """Diferença pareada (mesmo run_id) de frames até a captura entre cada par de estratégias.
+
+    Cada execução fica pendente só até todas as estratégias terem seu resultado para o
+    mesmo run_id; com os blocos das estratégias intercalados (make_shards) a memória
+    ocupada é de poucos blocos, não do benchmark inteiro.
+    """
+
+    def __init__(self, strategies):
+        self.strategies = list(strategies)
+        self.pending = {}  # run_id -> {estratégia: frames}
+        self.stats = {pair: RunningStats() for pair in combinations(self.strategies, 2)}
+
+    def update(self, strategy, run_ids, frames):
+        complete = []
+        for run_id, value in zip(np.asarray(run_ids).tolist(), np.asarray(frames).tolist()):
+            entry = self.pending.setdefault(run_id, {})
+            entry[strategy] = value
+            if len(entry) == len(self.strategies):
+                complete.append(self.pending.pop(run_id))
+        if complete:
+            values = {s: np.array([entry[s] for entry in complete], dtype=float) for s in self.strategies}
+            for (first, second), stats in self.stats.items():
+                stats.update(values[second] - values[first])
+
+    def difference(self, strategy, baseline):
+        """Média e meia-largura do IC 95% de (strategy - baseline)"""
+        if (baseline, strategy) in self.stats:
+            stats, sign = self.stats[(baseline, strategy)], 1
+        else:
+            stats, sign = self.stats[(strategy, baseline)], -1
+        if stats.count < 2:
+            return 0.0, 0.0
+        return sign * stats.mean, 1.96 * stats.std() / math.sqrt(stats.count)
+
+
+class BenchmarkAggregate:
+    """Agregados de todas as estratégias de um benchmark, atualizados bloco a bloco"""
+
+    def __init__(self, strategies, alpha=0.01):
+        self.alpha = alpha
+        self.summaries = {strategy: StrategySummary(alpha) for strategy in strategies}
+        self.paired = PairedDifferences(strategies)
+
+    @property
+    def total_runs(self):
+        return sum(summary.count for summary in self.summaries.values())
+
+    def add(self, strategy, columns, partial=None):
+        """Registra um bloco; partial é o StrategySummary já calculado pelo trabalhador"""
+        if partial is None:
+            partial = StrategySummary(self.alpha)
+            partial.update(columns)
+        self.summaries[strategy].merge(partial)
+        self.paired.update(strategy, columns['run_id'], columns['frames_to_capture'])
\ No newline at end of file
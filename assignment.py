@@ -0,0 +1,179 @@
+# assignment.py
+import time
+import numpy as np
+from strategies import intercept_time
+
+
+class AuctionAssigner:
+    """Atribuição perseguidor -> alvo por leilão (Bertsekas), incremental entre frames.
+
+    O custo é o tempo estimado até a interceptação. Os preços dos alvos são mantidos de
+    um frame para o outro (warm start): como as posições mudam pouco, a maior parte dos
+    perseguidores já encontra seu melhor alvo no primeiro lance e o leilão termina em
+    poucas rodadas. Todos os perseguidores sem alvo dão lances ao mesmo tempo (variante
+    de Jacobi), cada rodada é uma operação NumPy sobre a matriz de benefícios.
+
+    O orçamento de tempo do frame conta desde antes da matriz de custos. Uma rodada só
+    começa se ela (estimada pela rodada mais longa da chamada anterior) e o fechamento
+    ainda couberem no prazo; os perseguidores restantes mantêm o alvo do frame anterior
+    (quando ainda válido) ou o alvo de menor custo.
+    """
+
+    def __init__(self, config, n_targets):
+        self.config = config
+        self.epsilon = config.ASSIGNMENT_EPSILON
+        self.budget = config.ASSIGNMENT_BUDGET_MS / 1000
+        self.unreachable_factor = config.ASSIGNMENT_UNREACHABLE_FACTOR
+        self.prices = np.zeros(n_targets)
+        self.assignment = np.empty(0, dtype=np.int64)
+        self.round_seconds = 0.0   # Rodada mais longa da última chamada
+        self.finish_seconds = 0.0  # Fechamento (alvos sem dono) da última chamada
+
+        # Estatísticas
+        self.solves = 0
+        self.rounds_total = 0
+        self.over_budget = 0
+        self.solve_times = []
+
+    def reset_targets(self, targets):
+        """Zera o preço de alvos que reapareceram (a disputa anterior não vale mais)"""
+        self.prices[targets] = 0.0
+
+    def cost_matrix(self, px, py, pursuer_speed, tx, ty, tvx, tvy):
+        """Tempo até a interceptação; alvos inalcançáveis custam a perseguição direta penalizada"""
+        speed = pursuer_speed[:, None]
+        t = intercept_time(px[:, None], py[:, None], speed, tx, ty, tvx, tvy)
+        unreachable = np.isinf(t)
+        if unreachable.any():
+            # Operações no lugar: a matriz cheia é refeita em todo frame
+            direct = tx - px[:, None]
+            direct *= direct
+            dy = ty - py[:, None]
+            dy *= dy
+            direct += dy
+            np.sqrt(direct, out=direct)
+            direct *= self.unreachable_factor / speed
+            np.copyto(t, direct, where=unreachable)
+        return t
+
+    def assign(self, px, py, pursuer_speed, tx, ty, tvx, tvy, candidates):
+        """Retorna o alvo (índice global, -1 = nenhum) de cada perseguidor.
+
+        candidates: índices dos alvos disponíveis neste frame (ex.: detectados e vivos).
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget - self.finish_seconds
+        m = len(px)
+        previous = self.assignment if len(self.assignment) == m else np.full(m, -1, dtype=np.int64)
+        result = np.full(m, -1, dtype=np.int64)
+
+        if len(candidates) and m:
+            cost = self.cost_matrix(px, py, pursuer_speed, tx[candidates], ty[candidates],
+                                    tvx[candidates], tvy[candidates])
+            benefit = -cost
+
+            if len(candidates) >= m:
+                # Alvos que ninguém ganhou no frame anterior voltam ao preço mínimo, o que
+                # mantém a condição de otimalidade do leilão assimétrico (mais alvos que perseguidores)
+                prices = self.prices[candidates]
+                won = np.isin(candidates, previous)
+                prices[~won] = 0.0
+                owner, rounds, round_seconds = _auction(benefit, prices, self.epsilon, deadline, self.round_seconds)
+                self.prices[candidates] = prices
+            else:
+                # Menos alvos que perseguidores: os alvos "compram" perseguidores (sem warm start)
+                target_owner, rounds, round_seconds = _auction(benefit.T, np.zeros(m), self.epsilon, deadline,
+                                                               self.round_seconds)
+                owner = np.full(m, -1, dtype=np.int64)
+                assigned = target_owner >= 0
+                owner[target_owner[assigned]] = np.flatnonzero(assigned)
+
+            self.rounds_total += rounds
+            # Sem rodadas a estimativa cai pela metade: uma rodada atrasada (ex.: pausa do
+            # sistema) não impede os lances nos frames seguintes
+            self.round_seconds = round_seconds if rounds else self.round_seconds / 2
+            finish_start = time.perf_counter()
+            assigned = owner >= 0
+            result[assigned] = candidates[owner[assigned]]
+
+            # Sem alvo exclusivo (orçamento estourado ou excesso de perseguidores):
+            # mantém o alvo anterior se ainda disponível, senão o de menor custo
+            free = np.flatnonzero(~assigned)
+            if len(free):
+                keep = np.isin(previous[free], candidates)
+                result[free[keep]] = previous[free[keep]]
+                fallback = free[~keep]
+                result[fallback] = candidates[np.argmin(cost[fallback], axis=1)]
+            self.finish_seconds = time.perf_counter() - finish_start
+
+        self.assignment = result
+        self.solves += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > self.budget:
+            self.over_budget += 1
+        self.solve_times.append(elapsed)
+        if len(self.solve_times) > self.config.METRICS_WINDOW:
+            del self.solve_times[0]
+        return result
+
+    def get_stats(self):
+        times = np.array(self.solve_times) * 1000 if self.solve_times else np.zeros(1)
+        return {
+            'assignment_ms_mean': float(times.mean()),
+            'assignment_ms_p95': float(np.percentile(times, 95)),
+            'assignment_rounds_mean': self.rounds_total / max(1, self.solves),
+            'assignment_over_budget': self.over_budget,
+        }
+
+
+def _auction(benefit, prices, epsilon, deadline, round_estimate=0.0):
+    """Leilão direto para benefit (linhas <= colunas); atualiza prices no lugar.
+
+    Uma rodada só começa se a estimativa de duração (a maior entre round_estimate e as
+    rodadas já feitas) terminar antes de deadline. Retorna (coluna atribuída a cada
+    linha ou -1, número de rodadas, duração da rodada mais longa).
+    """
+    rows, cols = benefit.shape
+    owner = np.full(rows, -1, dtype=np.int64)
+    holder = np.full(cols, -1, dtype=np.int64)
+    rounds = 0
+    longest = 0.0
+
+    while True:
+        bidders = np.flatnonzero(owner < 0)
+        now = time.perf_counter()
+        if len(bidders) == 0 or now + max(longest, round_estimate) > deadline:
+            break
+        rounds += 1
+
+        values = benefit[bidders] - prices
+        if cols > 1:
+            top2 = np.argpartition(-values, 1, axis=1)[:, :2]
+            best = np.take_along_axis(values, top2, axis=1)
+            swap = best[:, 1] > best[:, 0]
+            choice = np.where(swap, top2[:, 1], top2[:, 0])
+            first = np.maximum(best[:, 0], best[:, 1])
+            second = np.minimum(best[:, 0], best[:, 1])
+        else:
+            choice = np.zeros(len(bidders), dtype=np.int64)
+            first = values[:, 0]
+            second = first
+        bids = prices[choice] + (first - second) + epsilon
+
+        # Para cada coluna disputada vence o maior lance
+        order = np.lexsort((-bids, choice))
+        choice_sorted = choice[order]
+        winner = np.ones(len(order), dtype=bool)
+        winner[1:] = choice_sorted[1:] != choice_sorted[:-1]
+        won_cols = choice_sorted[winner]
+        won_rows = bidders[order[winner]]
+
+        # O dono anterior da coluna volta a dar lances
+        outbid = holder[won_cols]
+        owner[outbid[outbid >= 0]] = -1
+        holder[won_cols] = won_rows
+        owner[won_rows] = won_cols
+        prices[won_cols] = bids[order[winner]]
+        longest = max(longest, time.perf_counter() - now)
+
+    return owner, rounds, longest
\ No newline at end of file
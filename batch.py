@@ -0,0 +1,305 @@
+# batch.py
+import numpy as np
+from strategies import PursuerState, TargetEstimate, pursue
+
+HISTORY_SIZE = 10  # Mesmo tamanho do histórico de Target.position_history
+SPAWN_DRAWS = 5    # Números aleatórios consumidos por episódio no surgimento
+
+# Arrays indexados por lane (compactados quando sobram poucos episódios ativos)
+LANE_ARRAYS = (
+    'tx', 'ty', 'tdx', 'tdy', 'target_speed', 'history', 'history_count',
+    'px', 'py', 'pursuer_speed', 'reaction_counter', 'target_detected',
+    'seen_x', 'seen_y', 'seen_gap', 'tvx_est', 'tvy_est', 'heading', 'los',
+    'episode_id', 'active', 'frames', 'true_positives', 'false_negatives', 'lost_count',
+)
+
+
+class BatchSimulation:
+    """Simulação vetorizada: avança N episódios independentes em um único passo NumPy.
+
+    Reproduz a lógica de Simulation.update (alvo, detecção, perseguição e captura)
+    sem renderização. Cada posição do lote ("lane") roda um episódio até a captura
+    ou até max_frames e é reiniciada automaticamente com o próximo episódio.
+    """
+
+    def __init__(self, config, n_lanes, strategy=None, seed=None, max_frames=None):
+        self.config = config
+        self.strategy = strategy or config.current_strategy
+        if self.strategy not in config.PURSUIT_STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {self.strategy}")
+        self.max_frames = max_frames if max_frames is not None else config.MAX_EPISODE_FRAMES
+
+        # Fluxos separados: o de surgimento é consumido em ordem de episódio,
+        # então o episódio k recebe as mesmas condições iniciais em qualquer estratégia
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        spawn_seq, step_seq = seed.spawn(2)
+        self.spawn_rng = np.random.default_rng(spawn_seq)
+        self.step_rng = np.random.default_rng(step_seq)
+
+        self.max_lanes = n_lanes
+        self._allocate(n_lanes)
+
+        self.next_episode = 0
+        self.n_episodes = 0
+        self._results = []
+
+    def _allocate(self, n):
+        """Aloca o estado de n lanes"""
+        self.n_lanes = n
+        self.lanes = np.arange(n)
+
+        # Estado do alvo
+        self.tx = np.zeros(n)
+        self.ty = np.zeros(n)
+        self.tdx = np.zeros(n)
+        self.tdy = np.zeros(n)
+        self.target_speed = np.zeros(n)
+        self.history = np.zeros((n, HISTORY_SIZE, 2))
+        self.history_count = np.zeros(n, dtype=np.int64)
+
+        # Estado do perseguidor
+        self.px = np.zeros(n)
+        self.py = np.zeros(n)
+        self.pursuer_speed = np.zeros(n)
+        self.reaction_counter = np.zeros(n, dtype=np.int64)
+        self.target_detected = np.zeros(n, dtype=bool)
+
+        # Última detecção e velocidade estimada do alvo (como em Pursuer.update)
+        self.seen_x = np.zeros(n)
+        self.seen_y = np.zeros(n)
+        self.seen_gap = np.full(n, -1, dtype=np.int64)  # Frames desde a última detecção (-1 = nunca)
+        self.tvx_est = np.zeros(n)
+        self.tvy_est = np.zeros(n)
+        self.heading = np.full(n, np.nan)
+        self.los = np.full(n, np.nan)
+
+        # Estado do episódio e métricas
+        self.episode_id = np.full(n, -1, dtype=np.int64)
+        self.active = np.zeros(n, dtype=bool)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.true_positives = np.zeros(n, dtype=np.int64)
+        self.false_negatives = np.zeros(n, dtype=np.int64)
+        self.lost_count = np.zeros(n, dtype=np.int64)
+
+    def _compact(self):
+        """Descarta lanes ociosas quando não há mais episódios para iniciar"""
+        keep = self.lanes[self.active]
+        for name in LANE_ARRAYS:
+            setattr(self, name, getattr(self, name)[keep])
+        self.n_lanes = len(keep)
+        self.lanes = np.arange(self.n_lanes)
+
+    def _spawn(self, lanes):
+        """Inicia novos episódios nas lanes indicadas (equivalente a Target.reset + novo Pursuer)"""
+        k = len(lanes)
+        if k == 0:
+            return
+
+        width, height = self.config.WIDTH, self.config.HEIGHT
+        draws = self.spawn_rng.random((k, SPAWN_DRAWS))
+
+        # Posição inicial em uma borda aleatória
+        side = np.minimum((draws[:, 0] * 4).astype(np.int64), 3)  # 0=top, 1=bottom, 2=left, 3=right
+        along_x = draws[:, 1] * width
+        along_y = draws[:, 1] * height
+        x = np.select([side == 2, side == 3], [0.0, float(width)], along_x)
+        y = np.select([side == 0, side == 1], [0.0, float(height)], along_y)
+
+        # Direção apontando para o centro com variação de ±45 graus
+        angle = np.arctan2(height / 2 - y, width / 2 - x)
+        angle += (draws[:, 2] * 2 - 1) * (np.pi / 4)
+        speed = self.config.TARGET_MIN_SPEED + draws[:, 3] * (self.config.TARGET_MAX_SPEED - self.config.TARGET_MIN_SPEED)
+
+        self.tx[lanes] = x
+        self.ty[lanes] = y
+        self.tdx[lanes] = np.cos(angle) * speed
+        self.tdy[lanes] = np.sin(angle) * speed
+        self.target_speed[lanes] = speed
+        self.history_count[lanes] = 0
+
+        # Perseguidor no centro com velocidade entre 6 e 12 (ou PURSUER_SPEED)
+        self.px[lanes] = width / 2
+        self.py[lanes] = height / 2
+        self.pursuer_speed[lanes] = 6 + draws[:, 4] * 6
+        if self.config.PURSUER_SPEED is not None:
+            self.pursuer_speed[lanes] = self.config.PURSUER_SPEED
+        self.reaction_counter[lanes] = 0
+        self.target_detected[lanes] = False
+        self.seen_gap[lanes] = -1
+        self.tvx_est[lanes] = 0.0
+        self.tvy_est[lanes] = 0.0
+        self.heading[lanes] = np.nan
+        self.los[lanes] = np.nan
+
+        # Atribuir ids de episódio em ordem
+        self.episode_id[lanes] = np.arange(self.next_episode, self.next_episode + k)
+        self.next_episode += k
+        self.active[lanes] = True
+        self.frames[lanes] = 0
+        self.true_positives[lanes] = 0
+        self.false_negatives[lanes] = 0
+        self.lost_count[lanes] = 0
+
+    def reset(self, n_episodes):
+        """Prepara uma nova rodada de n_episodes episódios"""
+        self._allocate(self.max_lanes)
+        self.next_episode = 0
+        self.n_episodes = n_episodes
+        self._results = []
+        self._spawn(self.lanes[:min(self.n_lanes, n_episodes)])
+
+    def step(self):
+        """Avança um frame em todas as lanes; retorna as lanes cujo episódio terminou"""
+        cfg = self.config
+
+        # Atualizar alvo e refletir nas bordas
+        self.tx += self.tdx
+        self.ty += self.tdy
+        hit_x = (self.tx <= 0) | (self.tx >= cfg.WIDTH)
+        hit_y = (self.ty <= 0) | (self.ty >= cfg.HEIGHT)
+        self.tdx = np.where(hit_x, -self.tdx, self.tdx)
+        self.tdy = np.where(hit_y, -self.tdy, self.tdy)
+        np.clip(self.tx, 0, cfg.WIDTH, out=self.tx)
+        np.clip(self.ty, 0, cfg.HEIGHT, out=self.ty)
+
+        # Histórico circular das últimas posições
+        count = self.history_count
+        slot = count % HISTORY_SIZE
+        self.history[self.lanes, slot, 0] = self.tx
+        self.history[self.lanes, slot, 1] = self.ty
+        count += 1
+
+        detected = self._detect(count)
+
+        # Métricas de detecção (a posição real é sempre conhecida)
+        self.true_positives += detected
+        self.false_negatives += ~detected
+        self.lost_count += self.target_detected & ~detected
+
+        # Velocidade do alvo entre detecções consecutivas
+        seen_before = detected & (self.seen_gap >= 0)
+        elapsed = np.maximum(self.seen_gap + 1, 1)
+        self.tvx_est = np.where(seen_before, (self.tx - self.seen_x) / elapsed, self.tvx_est)
+        self.tvy_est = np.where(seen_before, (self.ty - self.seen_y) / elapsed, self.tvy_est)
+        self.seen_x = np.where(detected, self.tx, self.seen_x)
+        self.seen_y = np.where(detected, self.ty, self.seen_y)
+        self.seen_gap = np.where(detected, 0, np.where(self.seen_gap >= 0, self.seen_gap + 1, -1))
+
+        # Atraso de reação: o perseguidor só se move após PURSUER_REACTION_TIME detecções
+        moving = detected & (self.reaction_counter >= cfg.PURSUER_REACTION_TIME)
+        self.reaction_counter = np.where(moving, 0, self.reaction_counter + (detected & ~moving))
+        self.target_detected = detected
+        self._pursue(moving)
+
+        # Verificar captura
+        distance = np.hypot(self.tx - self.px, self.ty - self.py)
+        self.frames += 1
+        captured = distance < cfg.CAPTURE_DISTANCE
+        done = self.active & (captured | (self.frames >= self.max_frames))
+
+        done_lanes = self.lanes[done]
+        if len(done_lanes):
+            self._record(done_lanes, captured[done_lanes])
+            remaining = max(0, self.n_episodes - self.next_episode)
+            self.active[done_lanes] = False
+            self._spawn(done_lanes[:remaining])
+
+            # Na cauda da rodada, evita avançar lanes que já terminaram
+            if remaining == 0 and self.active.sum() <= self.n_lanes // 2:
+                self._compact()
+        return done_lanes
+
+    def _detect(self, count):
+        """Combina as três técnicas de MotionDetector (lógica OR)"""
+        cfg = self.config
+        lanes = self.lanes
+        draws = self.step_rng.random((self.n_lanes, 2))
+
+        # Técnica 1: diferença entre a posição mais antiga e a mais recente do histórico
+        newest = self.history[lanes, (count - 1) % HISTORY_SIZE]
+        oldest = self.history[lanes, (count - np.minimum(count, HISTORY_SIZE)) % HISTORY_SIZE]
+        movement = np.hypot(newest[:, 0] - oldest[:, 0], newest[:, 1] - oldest[:, 1])
+        detection1 = (count >= 2) & (movement > cfg.MOTION_THRESHOLD)
+
+        # Técnica 2: limiarização adaptativa por velocidade e distância
+        visibility = np.minimum(1.0, self.target_speed / cfg.TARGET_MAX_SPEED)
+        distance = np.hypot(self.tx - self.px, self.ty - self.py)
+        distance_factor = np.where(
+            self.target_detected, np.maximum(0, 1 - distance / (cfg.WIDTH / 2)), 1.0
+        )
+        adaptive_threshold = cfg.DETECTION_THRESHOLD * (1 - visibility * 0.5) * distance_factor
+        detection2 = draws[:, 0] < np.minimum(0.9, adaptive_threshold / 50)
+
+        # Técnica 3: aceleração entre as três últimas posições
+        pos1 = self.history[lanes, (count - 3) % HISTORY_SIZE]
+        pos2 = self.history[lanes, (count - 2) % HISTORY_SIZE]
+        acceleration = np.linalg.norm(newest - 2 * pos2 + pos1, axis=1)
+        detection3 = (count >= 3) & (draws[:, 1] < np.minimum(0.8, acceleration / 10))
+
+        return detection1 | detection2 | detection3
+
+    def _pursue(self, moving):
+        """Aplica o kernel da estratégia (strategies.py) nas lanes que reagem neste frame"""
+        pursuers = PursuerState(self.px, self.py, self.pursuer_speed, self.heading, self.los)
+        targets = TargetEstimate(self.tx, self.ty, self.tvx_est, self.tvy_est)
+        dx, dy, heading, los = pursue(self.strategy, pursuers, targets, self.config)
+
+        self.px += np.where(moving, dx, 0.0)
+        self.py += np.where(moving, dy, 0.0)
+        self.heading = np.where(moving, heading, self.heading)
+        self.los = np.where(moving, los, self.los)
+
+    def _record(self, lanes, captured):
+        """Guarda as estatísticas dos episódios concluídos"""
+        self._results.append({
+            'episode_id': self.episode_id[lanes].copy(),
+            'captured': captured.copy(),
+            'frames_to_capture': self.frames[lanes].copy(),
+            'target_speed': self.target_speed[lanes].copy(),
+            'pursuer_speed': self.pursuer_speed[lanes].copy(),
+            'true_positives': self.true_positives[lanes].copy(),
+            'false_negatives': self.false_negatives[lanes].copy(),
+            'target_lost_count': self.lost_count[lanes].copy(),
+        })
+
+    def run(self, n_episodes):
+        """Executa n_episodes episódios e retorna as estatísticas por episódio (ordenadas por id)"""
+        self.reset(n_episodes)
+        while self.active.any():
+            self.step()
+        return self.results()
+
+    def results(self):
+        """Concatena as estatísticas registradas e calcula precisão, recall e F1 por episódio"""
+        if not self._results:
+            return {}
+
+        columns = {key: np.concatenate([chunk[key] for chunk in self._results])
+                   for key in self._results[0]}
+        order = np.argsort(columns['episode_id'])
+        columns = {key: value[order] for key, value in columns.items()}
+
+        # Mesmas fórmulas de DetectionMetrics.get_metrics (sem falsos positivos)
+        tp = columns['true_positives']
+        fn = columns['false_negatives']
+        fp = np.zeros_like(tp)
+        precision = _ratio(tp, tp + fp)
+        recall = _ratio(tp, tp + fn)
+        f1 = _ratio(2 * precision * recall, precision + recall)
+
+        columns['strategy'] = np.full(len(tp), self.strategy)
+        columns['detection_precision'] = precision
+        columns['detection_recall'] = recall
+        columns['detection_f1'] = f1
+        columns['total_detections'] = tp
+        return columns
+
+
+def _ratio(numerator, denominator):
+    """Divisão elemento a elemento que retorna 0 quando o denominador é 0"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
\ No newline at end of file
@@ -0,0 +1,484 @@
+# benchmark.py
+import os
+import csv
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from config import Config
+from rng import episode_seed
+from aggregates import BenchmarkAggregate, StrategySummary
+from results import ResultsWriter, rows_to_columns, columns_to_rows, load_results, split_by_strategy
+
+# Colunas dos arquivos <estratégia>_results.csv (os eventos de detecção por frame ficam
+# só no diretório colunar results/, como corridas de bits)
+RESULT_COLUMNS = [
+    'strategy', 'run_id', 'frames_to_capture', 'time_to_capture', 'target_speed',
+    'pursuer_speed', 'detection_precision', 'detection_recall', 'detection_f1',
+    'total_detections', 'target_lost_count'
+]
+
+# Colunas do relatorio_estatistico.csv
+STATISTICS_COLUMNS = [
+    'Estratégia', 'Capturas Realizadas', 'Tempo Médio (frames)', 'Desvio Padrão (frames)',
+    'Tempo Mínimo (frames)', 'Tempo Máximo (frames)', 'Taxa de Sucesso', 'Precisão Média',
+    'Recall Médio', 'F1-Score Médio', 'Detecções Médias por Captura', 'Alvo Perdido (média)',
+    'Tempo Mediano (frames)', 'Tempo P95 (frames)'
+]
+
+# Colunas do crowd_scaling.csv
+CROWD_SCALING_COLUMNS = [
+    'targets', 'pursuers', 'index', 'ms_per_frame', 'captures_per_frame', 'speedup'
+]
+
+# Colunas do crowd_teams.csv
+CROWD_TEAM_COLUMNS = [
+    'team', 'run_id', 'targets', 'pursuers', 'frames_to_clear', 'cleared', 'ms_per_frame',
+    'assignment_ms_mean', 'assignment_ms_p95', 'assignment_over_budget'
+]
+
+
+def run_episode(simulation, strategy, run_id, max_frames, seed=None, on_frame=None):
+    """Executa um episódio completo (até a captura ou max_frames) e retorna sua linha de resultados.
+
+    on_frame(simulation), se dado, é chamado após cada passo (ex.: gravação em recorder.py).
+    """
+    simulation.config.current_strategy = strategy
+    if seed is not None:
+        simulation.reseed(seed)
+    simulation.reset_complete()
+
+    # Detecção por frame como corridas alternadas (não detectado, detectado, ...)
+    runs = []
+    run_length = 0
+    lost_count = 0
+    was_detected = False
+    start = time.perf_counter()
+    while not simulation.captured and simulation.frame_count < max_frames:
+        simulation.update()
+        if on_frame is not None:
+            on_frame(simulation)
+        detected = simulation.pursuer.target_detected
+        if detected != was_detected:
+            runs.append(run_length)
+            run_length = 0
+            if was_detected:
+                lost_count += 1
+        run_length += 1
+        was_detected = detected
+    runs.append(run_length)
+    elapsed = time.perf_counter() - start
+
+    precision, recall, f1 = simulation.metrics.get_metrics()
+    return {
+        'strategy': strategy,
+        'run_id': run_id,
+        'frames_to_capture': simulation.frame_count,
+        'time_to_capture': elapsed,
+        'target_speed': simulation.target.speed,
+        'pursuer_speed': simulation.pursuer.speed,
+        'detection_precision': precision,
+        'detection_recall': recall,
+        'detection_f1': f1,
+        'detection_runs': np.array(runs, dtype=np.int32),
+        'total_detections': simulation.metrics.true_positives,
+        'target_lost_count': lost_count,
+        'captured': simulation.captured,
+    }
+
+
+def run_shard(shard):
+    """Executa um bloco de episódios de uma estratégia em um processo trabalhador.
+
+    Retorna (colunas como results.rows_to_columns, StrategySummary do bloco): o processo
+    principal grava as colunas e só junta os agregados parciais.
+    """
+    config, strategy, run_ids, seed_sequence, max_frames, engine = shard
+
+    if engine == "batch":
+        columns = _run_shard_batch(config, strategy, run_ids, seed_sequence, max_frames)
+    else:
+        # Cada episódio tem sua própria semente, igual em todas as estratégias
+        from simulation import Simulation
+        simulation = Simulation(config, headless=True)
+        columns = rows_to_columns([run_episode(simulation, strategy, run_id, max_frames,
+                                               episode_seed(seed_sequence, run_id))
+                                   for run_id in run_ids])
+
+    summary = StrategySummary(config.AGGREGATE_QUANTILE_ACCURACY)
+    summary.update(columns)
+    return columns, summary
+
+
+def _run_shard_batch(config, strategy, run_ids, seed_sequence, max_frames):
+    """Executa o bloco com o motor vetorizado (sem eventos de detecção por frame)"""
+    from batch import BatchSimulation
+
+    start = time.perf_counter()
+    n_lanes = min(len(run_ids), config.BATCH_LANES)
+    columns = BatchSimulation(config, n_lanes, strategy, seed_sequence, max_frames).run(len(run_ids))
+    elapsed = (time.perf_counter() - start) / len(run_ids)
+
+    columns['strategy'] = strategy
+    columns['run_id'] = np.asarray(run_ids)
+    columns['time_to_capture'] = np.full(len(run_ids), elapsed)
+    return columns
+
+
+def make_shards(config, strategies, runs, seed, chunk_size, max_frames, engine):
+    """Divide as execuções de cada estratégia em blocos com fluxos de sementes independentes.
+
+    O bloco i recebe a mesma semente em todas as estratégias, de modo que as
+    estratégias são comparadas sob números aleatórios comuns. Os blocos saem
+    intercalados (bloco i de cada estratégia, depois o i + 1), o que permite parear
+    as execuções à medida que chegam.
+    """
+    root = np.random.SeedSequence(seed)
+    run_ids = list(range(1, runs + 1))
+    shards = []
+    for shard_index, offset in enumerate(range(0, runs, chunk_size)):
+        for strategy in strategies:
+            # Uma SeedSequence por bloco: spawn() altera o objeto, que não pode ser compartilhado
+            seed_sequence = np.random.SeedSequence(root.entropy, spawn_key=(shard_index,))
+            shards.append((config, strategy, run_ids[offset:offset + chunk_size],
+                           seed_sequence, max_frames, engine))
+    return shards
+
+
+def run_benchmark(config, strategies, runs, writer=None, workers=None, seed=None, chunk_size=None,
+                  max_frames=None, engine="scalar", progress=None):
+    """Executa o benchmark em paralelo e retorna o BenchmarkAggregate das estratégias.
+
+    Cada bloco é gravado no ResultsWriter (se houver) e juntado aos agregados assim que
+    termina; nenhuma execução fica em memória depois disso. progress(aggregate, blocos
+    concluídos, total de blocos) é chamado após cada bloco.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_frames = max_frames or config.MAX_EPISODE_FRAMES
+    if chunk_size is None:
+        # Blocos pequenos o bastante para balancear a carga entre os processos
+        chunk_size = max(1, min(config.BATCH_LANES, runs * len(strategies) // (workers * 4)))
+
+    shards = make_shards(config, strategies, runs, seed, chunk_size, max_frames, engine)
+
+    if workers == 1:
+        shard_results = map(run_shard, shards)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        shard_results = executor.map(run_shard, shards)
+
+    aggregate = BenchmarkAggregate(strategies, config.AGGREGATE_QUANTILE_ACCURACY)
+    for done, (shard, (columns, summary)) in enumerate(zip(shards, shard_results), start=1):
+        if writer is not None:
+            writer.append(columns)
+        aggregate.add(shard[1], columns, summary)
+        if progress is not None:
+            progress(aggregate, done, len(shards))
+    if workers > 1:
+        executor.shutdown()
+    if writer is not None:
+        writer.close()
+    return aggregate
+
+
+def compute_statistics(aggregate):
+    """Calcula as linhas do relatório estatístico a partir dos agregados por estratégia"""
+    statistics = []
+    for strategy, summary in aggregate.summaries.items():
+        if summary.count == 0:
+            continue
+        stats = summary.stats
+        frames = stats['frames_to_capture']
+        statistics.append({
+            'Estratégia': strategy,
+            'Capturas Realizadas': frames.count,
+            'Tempo Médio (frames)': round(frames.mean, 2),
+            'Desvio Padrão (frames)': frames.std(),
+            'Tempo Mínimo (frames)': int(frames.min),
+            'Tempo Máximo (frames)': int(frames.max),
+            'Taxa de Sucesso': stats['captured'].mean,
+            'Precisão Média': stats['detection_precision'].mean,
+            'Recall Médio': stats['detection_recall'].mean,
+            'F1-Score Médio': stats['detection_f1'].mean,
+            'Detecções Médias por Captura': stats['total_detections'].mean,
+            'Alvo Perdido (média)': stats['target_lost_count'].mean,
+            'Tempo Mediano (frames)': round(summary.frames.quantile(0.5), 1),
+            'Tempo P95 (frames)': round(summary.frames.quantile(0.95), 1),
+        })
+    return statistics
+
+
+def paired_difference(aggregate, strategy, baseline):
+    """Média e meia-largura do IC 95% da diferença pareada (por run_id) de frames até a captura.
+
+    Com números aleatórios comuns a variância da diferença é bem menor que a de
+    amostras independentes, e o mesmo intervalo exige menos episódios.
+    """
+    return aggregate.paired.difference(strategy, baseline)
+
+
+def run_crowd_scaling(config, sizes, pursuers, frames, seed=None):
+    """Mede o custo por frame de CrowdSimulation com o índice em grade e com força bruta"""
+    from crowd import CrowdSimulation
+
+    rows = []
+    for n_targets in sizes:
+        timings = {}
+        for index in ('grid', 'brute'):
+            crowd = CrowdSimulation(config, n_targets, pursuers, seed=seed,
+                                    spatial_index=index == 'grid')
+            start = time.perf_counter()
+            stats = crowd.run(frames)
+            timings[index] = (time.perf_counter() - start) / frames
+            rows.append({
+                'targets': n_targets,
+                'pursuers': pursuers,
+                'index': index,
+                'ms_per_frame': timings[index] * 1000,
+                'captures_per_frame': stats['captures_per_frame'],
+            })
+        for row in rows[-2:]:
+            row['speedup'] = timings['brute'] / timings[row['index']]
+    return rows
+
+
+def run_crowd_teams(config, teams, n_targets, pursuers, runs, max_frames, seed=None):
+    """Frames até capturar todos os alvos (sem respawn) para cada estratégia de equipe.
+
+    A cena k usa a mesma semente em todas as estratégias (números aleatórios comuns).
+    """
+    from crowd import CrowdSimulation
+
+    root = np.random.SeedSequence(seed)
+    rows = []
+    for team in teams:
+        for run_id in range(runs):
+            crowd = CrowdSimulation(config, n_targets, pursuers, seed=episode_seed(root, run_id),
+                                    team=team, respawn=False)
+            start = time.perf_counter()
+            stats = crowd.run(max_frames)
+            elapsed = time.perf_counter() - start
+            rows.append({
+                'team': team,
+                'run_id': run_id,
+                'targets': n_targets,
+                'pursuers': pursuers,
+                'frames_to_clear': stats['frames'],
+                'cleared': crowd.finished,
+                'ms_per_frame': elapsed / max(1, stats['frames']) * 1000,
+                'assignment_ms_mean': stats.get('assignment_ms_mean', 0.0),
+                'assignment_ms_p95': stats.get('assignment_ms_p95', 0.0),
+                'assignment_over_budget': stats.get('assignment_over_budget', 0),
+            })
+    return rows
+
+
+def write_csv(path, rows, columns):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_xlsx(path, rows, columns):
+    """Grava a planilha XLSX se pandas/openpyxl estiverem instalados"""
+    try:
+        import pandas as pd
+        pd.DataFrame(rows, columns=columns).to_excel(path, index=False)
+    except ImportError:
+        print(f"pandas/openpyxl não disponível: {os.path.basename(path)} não gerado")
+
+
+def write_executive_summary(path, statistics, total_runs, runs_per_strategy, aggregate=None):
+    """Gera o resumo_executivo.txt a partir do relatório estatístico"""
+    by_mean = sorted(statistics, key=lambda row: row['Tempo Médio (frames)'])
+    fastest = by_mean[0]
+    slowest = by_mean[-1]
+    most_consistent = min(statistics, key=lambda row: row['Desvio Padrão (frames)'])
+    best_detection = max(statistics, key=lambda row: row['F1-Score Médio'])
+
+    slow_mean = slowest['Tempo Médio (frames)']
+    faster_pct = (slow_mean - fastest['Tempo Médio (frames)']) / slow_mean * 100 if slow_mean > 0 else 0
+
+    lines = [
+        "=== RELATÓRIO EXECUTIVO - BENCHMARK DE ESTRATÉGIAS ===",
+        "",
+        f"Data e Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+        f"Total de Execuções: {total_runs}",
+        f"Capturas por Estratégia: {runs_per_strategy}",
+        "",
+        "PRINCIPAIS DESCOBERTAS:",
+        "=" * 50,
+        f"Estratégia Mais Rápida: {fastest['Estratégia']}",
+        f"Estratégia Mais Lenta: {slowest['Estratégia']}",
+        "",
+        "INSIGHTS:",
+        "=" * 50,
+        f"• A estratégia '{fastest['Estratégia']}' foi {faster_pct:.1f}% mais rápida que a mais lenta",
+        f"• A estratégia '{most_consistent['Estratégia']}' apresentou maior consistência",
+        f"• A estratégia '{best_detection['Estratégia']}' obteve melhor desempenho em detecção",
+    ]
+    if aggregate is not None:
+        for row in statistics:
+            if row is fastest:
+                continue
+            mean, half_width = paired_difference(aggregate, row['Estratégia'], fastest['Estratégia'])
+            lines.append(f"• Diferença pareada '{row['Estratégia']}' - '{fastest['Estratégia']}': "
+                         f"{mean:+.1f} frames (IC 95%: ±{half_width:.1f})")
+    lines += [
+        "",
+        "RECOMENDAÇÕES:",
+        "=" * 50,
+        f"• Considere usar '{fastest['Estratégia']}' para máxima velocidade",
+        f"• Use '{most_consistent['Estratégia']}' para cenários que requerem previsibilidade",
+        f"• '{best_detection['Estratégia']}' é recomendada quando a detecção é crítica",
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_plots(output_dir, results):
+    """Gera os gráficos comparativos se matplotlib estiver instalado"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib não disponível: gráficos não gerados")
+        return
+
+    strategies = list(results)
+    frames = {s: results[s]['frames_to_capture'] for s in strategies}
+
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    fig.suptitle("Comparação entre Estratégias de Perseguição", fontweight='bold')
+    axes[0].boxplot([frames[s] for s in strategies], labels=strategies)
+    axes[0].set_title("Distribuição do Tempo até Captura (frames)")
+    axes[0].set_ylabel("Frames")
+    for s in strategies:
+        ordered = np.sort(frames[s])
+        axes[1].plot(ordered, np.arange(1, len(ordered) + 1) / len(ordered), label=s)
+        speeds = results[s]['target_speed']
+        axes[2].scatter(speeds, frames[s], label=s, alpha=0.6)
+    axes[1].set_title("Distribuição Acumulada do Tempo de Captura")
+    axes[1].set_xlabel("Frames até Captura")
+    axes[1].legend()
+    axes[2].set_title("Velocidade do Alvo vs Tempo de Captura")
+    axes[2].set_xlabel("Velocidade do Alvo")
+    axes[2].legend()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'comparacao_estrategias.png'), dpi=150)
+    plt.close(fig)
+
+
+def write_reports(output_dir, aggregate, results=None):
+    """Grava o mesmo conjunto de arquivos dos diretórios benchmark_results_*.
+
+    O relatório estatístico e o resumo executivo vêm só dos agregados (memória constante).
+    results ({estratégia: colunas}, como em results.split_by_strategy) é opcional e só é
+    usado para as tabelas por execução e os gráficos.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if results is not None:
+        for strategy, columns in results.items():
+            rows = list(columns_to_rows(columns, strategy))
+            write_csv(os.path.join(output_dir, f'{strategy}_results.csv'), rows, RESULT_COLUMNS)
+            write_xlsx(os.path.join(output_dir, f'{strategy}_results.xlsx'), rows, RESULT_COLUMNS)
+
+    statistics = compute_statistics(aggregate)
+    write_csv(os.path.join(output_dir, 'relatorio_estatistico.csv'), statistics, STATISTICS_COLUMNS)
+    write_xlsx(os.path.join(output_dir, 'relatorio_estatistico.xlsx'), statistics, STATISTICS_COLUMNS)
+
+    runs_per_strategy = max((summary.count for summary in aggregate.summaries.values()), default=0)
+    write_executive_summary(os.path.join(output_dir, 'resumo_executivo.txt'),
+                            statistics, aggregate.total_runs, runs_per_strategy, aggregate)
+    if results is not None:
+        write_plots(output_dir, results)
+    return statistics
+
+
+def print_progress(aggregate, done, total):
+    """Linha de acompanhamento do --live: execuções, média, p50 e p95 de cada estratégia"""
+    parts = []
+    for strategy, summary in aggregate.summaries.items():
+        if summary.count:
+            parts.append(f"{strategy}: {summary.count} exec. média {summary.stats['frames_to_capture'].mean:.1f} "
+                         f"p50 {summary.frames.quantile(0.5):.0f} p95 {summary.frames.quantile(0.95):.0f}")
+    print(f"[{done}/{total}] " + " | ".join(parts))
+
+
+def parse_args(argv=None):
+    config = Config()
+    parser = argparse.ArgumentParser(description="Benchmark paralelo das estratégias de perseguição")
+    parser.add_argument('--runs', type=int, default=100, help="Execuções por estratégia")
+    parser.add_argument('--strategies', nargs='+', default=config.PURSUIT_STRATEGIES,
+                        choices=config.PURSUIT_STRATEGIES)
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument('--seed', type=int, default=None, help="Semente raiz (padrão: aleatória)")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Execuções por bloco")
+    parser.add_argument('--max-frames', type=int, default=config.MAX_EPISODE_FRAMES)
+    parser.add_argument('--engine', choices=['scalar', 'batch'], default='scalar',
+                        help="scalar: Simulation headless; batch: BatchSimulation vetorizada")
+    parser.add_argument('--output', default=None, help="Diretório de saída")
+    parser.add_argument('--no-run-tables', action='store_true',
+                        help="Não grava <estratégia>_results.csv/xlsx nem gráficos (as execuções ficam "
+                             "só em results/ e os relatórios saem dos agregados)")
+    parser.add_argument('--live', action='store_true',
+                        help="Mostra a média e os percentis de cada estratégia a cada bloco concluído")
+    parser.add_argument('--crowd-sizes', type=int, nargs='+', default=None,
+                        help="Mede a escala de CrowdSimulation com estes números de alvos")
+    parser.add_argument('--crowd-pursuers', type=int, default=config.CROWD_PURSUERS)
+    parser.add_argument('--crowd-frames', type=int, default=100, help="Frames por medição de escala")
+    parser.add_argument('--crowd-teams', nargs='+', default=None, choices=['nearest', 'auction'],
+                        help="Compara estratégias de equipe em cenas com --crowd-targets alvos")
+    parser.add_argument('--crowd-targets', type=int, default=config.CROWD_TARGETS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = Config()
+    output_dir = args.output or f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    if args.crowd_sizes:
+        rows = run_crowd_scaling(config, args.crowd_sizes, args.crowd_pursuers,
+                                 args.crowd_frames, args.seed)
+        os.makedirs(output_dir, exist_ok=True)
+        write_csv(os.path.join(output_dir, 'crowd_scaling.csv'), rows, CROWD_SCALING_COLUMNS)
+        for row in rows:
+            print(f"{row['targets']:>7} alvos x {row['pursuers']} perseguidores [{row['index']:>5}]: "
+                  f"{row['ms_per_frame']:8.2f} ms/frame (x{row['speedup']:.1f})")
+        return
+
+    if args.crowd_teams:
+        rows = run_crowd_teams(config, args.crowd_teams, args.crowd_targets, args.crowd_pursuers,
+                               args.runs, args.max_frames, args.seed)
+        os.makedirs(output_dir, exist_ok=True)
+        write_csv(os.path.join(output_dir, 'crowd_teams.csv'), rows, CROWD_TEAM_COLUMNS)
+        for team in args.crowd_teams:
+            team_rows = [row for row in rows if row['team'] == team]
+            frames = np.array([row['frames_to_clear'] for row in team_rows], dtype=float)
+            p95 = max(row['assignment_ms_p95'] for row in team_rows)
+            print(f"{team:>8}: {frames.mean():.1f} ± {frames.std():.1f} frames para capturar todos "
+                  f"(atribuição p95 {p95:.2f} ms)")
+        return
+
+    start = time.perf_counter()
+    writer = ResultsWriter(os.path.join(output_dir, 'results'), config.RESULTS_CHUNK_ROWS)
+    aggregate = run_benchmark(config, args.strategies, args.runs, writer, args.workers, args.seed,
+                              args.chunk_size, args.max_frames, args.engine,
+                              progress=print_progress if args.live else None)
+    elapsed = time.perf_counter() - start
+
+    results = None
+    if not args.no_run_tables:
+        results = split_by_strategy(load_results(os.path.join(output_dir, 'results')))
+    write_reports(output_dir, aggregate, results)
+    print(f"{aggregate.total_runs} execuções em {elapsed:.2f}s -> {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
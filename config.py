@@ -7,16 +7,34 @@ class Config:
         # FPS
         self.FPS = 60
         
+        # Relógio de passo fixo (scheduler.py): passos de simulação desacoplados da renderização
+        self.SIM_STEP_RATE = 60  # Passos por segundo de tempo simulado na velocidade x1
+        self.SIM_SPEEDS = [1, 10, 100, None]  # Multiplicadores da tecla F (None = o mais rápido possível)
+        self.SIM_MAX_CATCH_UP = 4  # Atraso recuperável, em frames de passos; o excesso é descartado
+        self.SIM_FRAME_BUDGET = 0.75  # Fração do frame de renderização disponível para os passos
+        
+        # Renderização por retângulos sujos: atualiza só as regiões que mudaram
+        self.DIRTY_RECTS = False
+        
         # Cores
         self.BG_COLOR = (0, 0, 0)
         self.TARGET_COLOR = (0, 255, 0)  # Verde para Ligeirinho
         self.PURSUER_COLOR = (255, 0, 0)  # Vermelho para Frajola
         self.TEXT_COLOR = (255, 255, 255)
+        self.HUD_TEXT_CACHE_SIZE = 256  # Superfícies de texto mantidas em cache
+        self.HUD_FONT = None  # Arquivo .ttf do painel (None = fonte que acompanha o pygame)
+        
+        # Perfil de tempo por fase (profiler.py)
+        self.PROFILER = False
+        self.PROFILER_WINDOW = 600  # Frames usados nos percentis
+        self.PROFILER_REFRESH = 30  # Frames entre atualizações do painel
+        self.PROFILER_HEADLESS_SAMPLE = 16  # No modo headless, fases medidas em 1 a cada N frames
         
         # Agente Alvo (Ligeirinho)
         self.TARGET_SIZE = 20
         self.TARGET_MIN_SPEED = 8
         self.TARGET_MAX_SPEED = 15
+        self.TARGET_HISTORY_SIZE = 10  # Posições no buffer circular do histórico de movimento
         
         # Agente Perseguidor (Frajola)
         self.PURSUER_SIZE = 45
@@ -26,6 +44,32 @@ class Config:
         self.DETECTION_THRESHOLD = 30
         self.MOTION_THRESHOLD = 5
         
+        # Backend de detecção: "simulated" (heurísticas sobre o histórico) ou
+        # "opencv" (diferença de quadros sobre os pixels renderizados)
+        self.DETECTION_BACKEND = "simulated"
+        self.PIXEL_DIFF_THRESHOLD = 25  # Diferença mínima de intensidade (0-255)
+        self.PIXEL_MORPH_KERNEL = 3  # Lado do elemento estruturante da abertura morfológica
+        self.PIXEL_MIN_AREA = 20  # Área mínima (pixels) de uma região em movimento
+        self.PIXEL_EGO_MARGIN = 8  # Margem da máscara sobre o próprio perseguidor
+        
+        # Rastreamento preditivo da ROI (tracking.py), usado pelo backend "opencv"
+        self.DETECTION_TRACKING = True
+        self.ROI_MIN_HALF_SIZE = 40  # Meia largura mínima da janela (pixels)
+        self.ROI_GATE_SIGMAS = 3  # Desvios-padrão da inovação cobertos pela janela
+        self.ROI_MAX_MISSES = 3  # Falhas seguidas antes de voltar ao quadro inteiro
+        self.ROI_CONVERT_MARGIN = 32  # Margem extra convertida para cinza ao redor da ROI
+        self.ROI_PROCESS_NOISE = 1.0  # Variância do ruído de processo do filtro de Kalman
+        self.ROI_MEASUREMENT_NOISE = 4.0  # Variância da medição (pixels²)
+        
+        # Métricas de detecção (memória constante)
+        self.METRICS_WINDOW = 600  # Frames da janela deslizante de precisão/recall/F1
+        self.METRICS_HISTORY_CAPACITY = 4096  # Registros do histórico subamostrado
+        
+        # Detecção assíncrona (pipeline.py): a detecção por pixels roda em uma thread
+        self.DETECTION_ASYNC = False
+        self.ASYNC_QUEUE_SIZE = 2  # Quadros aguardando o detector (os mais antigos são descartados)
+        self.ASYNC_MAX_LATENCY = 10  # Frames após os quais uma detecção é considerada obsoleta
+        
         # Interceptação
         self.CAPTURE_DISTANCE = 20
         
@@ -53,15 +97,21 @@ class Config:
         
         # Rotação dos sprites
         self.ROTATE_SPRITES = True
+        self.ROTATION_STEP = 2  # Graus entre ângulos pré-rotacionados (0 = rotação exata a cada frame)
+        self.ROTATION_CACHE_SIZE = 512  # Máximo de sprites rotacionados mantidos em memória (LRU)
+        self.ROTATION_PREBUILD = False  # Montar o atlas completo de ângulos ao carregar os sprites
+        self.ROTATION_CACHE_DIR = 'assets/.rotation_cache'  # Atlas persistido em disco (None desativa)
+        self.SPRITE_CACHE_DIR = 'assets/.sprite_cache'  # Sprites já redimensionados (None desativa)
         
         # Agente Alvo (Ligeirinho)
         self.TARGET_SIZE = 20
         self.TARGET_MIN_SPEED = 8
         self.TARGET_MAX_SPEED = 15
+        self.TARGET_HISTORY_SIZE = 10  # Posições no buffer circular do histórico de movimento
         
         # Agente Perseguidor (Frajola)
         self.PURSUER_SIZE = 45
-        self.PURSUER_SPEED = 10
+        self.PURSUER_SPEED = None  # None = sorteada entre 6 e 12 px/frame; um número fixa a velocidade
         self.PURSUER_REACTION_TIME = 5  # Frames até reagir
         
         # Detecção
@@ -77,4 +127,38 @@ class Config:
             "intercept",   # Interceptação preditiva
             "proportional" # Navegação proporcional
         ]
-        self.current_strategy = "direct"
\ No newline at end of file
+        self.current_strategy = "direct"
+        self.PN_GAIN = 3  # Constante da navegação proporcional (giro do rumo / giro da linha de visada)
+        
+        # Execução em lote (batch.py)
+        self.MAX_EPISODE_FRAMES = 5000  # Limite de frames por episódio sem captura
+        self.BATCH_LANES = 4096  # Episódios avançados simultaneamente
+        self.RESULTS_CHUNK_ROWS = 65536  # Execuções por parte .npz dos resultados colunares
+        self.AGGREGATE_QUANTILE_ACCURACY = 0.01  # Erro relativo máximo dos percentis agregados
+        
+        # Cenas com muitos agentes (crowd.py)
+        self.CROWD_TARGETS = 500  # Ligeirinhos na cena
+        self.CROWD_PURSUERS = 20  # Frajolas na cena
+        self.CROWD_GRID_CELL = None  # Lado da célula do índice espacial (None = CAPTURE_DISTANCE)
+        self.CROWD_TEAM_STRATEGY = "nearest"  # "nearest" ou "auction" (atribuição por leilão)
+        self.CROWD_RESPAWN = True  # Alvos capturados ressurgem; False termina a cena ao capturar todos
+        
+        # Atribuição perseguidor -> alvo por leilão (assignment.py)
+        self.ASSIGNMENT_BUDGET_MS = 4.0  # Tempo máximo da atribuição por frame (1/4 de um frame a 60 FPS)
+        self.ASSIGNMENT_EPSILON = 0.1  # Incremento mínimo de lance (frames de interceptação)
+        self.ASSIGNMENT_UNREACHABLE_FACTOR = 2  # Penalidade sobre a perseguição direta sem interceptação
+        
+        # Varreduras de parâmetros (sweep.py)
+        self.SWEEP_BLOCK_RUNS = 100  # Execuções por célula do cache (mudar invalida as células)
+        self.SWEEP_CACHE_DIR = '.sweep_cache'  # Células concluídas, endereçadas pelo hash do conteúdo
+        
+        # Gravação de frames (recorder.py)
+        self.RECORD_QUEUE_SIZE = 32  # Frames aguardando o escritor (além disso são descartados)
+        self.RECORD_CODEC = 'mp4v'  # FourCC do cv2.VideoWriter
+        self.RECORD_FPS = None  # Taxa do vídeo gravado (None = FPS)
+        
+        # Snapshots e reprodução determinística (snapshot.py)
+        self.SNAPSHOT_INTERVAL = 600  # Passos entre snapshots gravados no log de replay
+        
+        # Geração de conjuntos de dados rotulados (dataset.py)
+        self.DATASET_SHARD_FRAMES = 4096  # Frames por arquivo .npy mapeado em memória
\ No newline at end of file
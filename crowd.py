@@ -0,0 +1,252 @@
+# crowd.py
+import numpy as np
+from batch import HISTORY_SIZE
+from spatial import UniformGrid
+from assignment import AuctionAssigner
+from strategies import PursuerState, TargetEstimate, pursue
+
+
+class CrowdSimulation:
+    """Cena com muitos Ligeirinhos e muitos Frajolas no mesmo canvas.
+
+    O estado dos agentes fica em arrays NumPy (um elemento por agente), como em
+    BatchSimulation. A cada frame um índice espacial em grade (células do tamanho de
+    CAPTURE_DISTANCE) responde às duas consultas entre agentes: o alvo detectado mais
+    próximo de cada perseguidor e as capturas. Com spatial_index=False as mesmas
+    consultas são feitas por força bruta (matriz de distâncias), para comparação.
+
+    Estratégias de equipe: "nearest" (cada perseguidor vai atrás do detectado mais
+    próximo, mesmo que outros já o persigam) ou "auction" (AuctionAssigner distribui os
+    alvos pelo tempo estimado de interceptação). Com respawn, alvos capturados ressurgem
+    em uma borda e a densidade se mantém; sem respawn a cena termina quando todos forem
+    capturados.
+    """
+
+    def __init__(self, config, n_targets=None, n_pursuers=None, strategy=None, seed=None,
+                 spatial_index=True, team=None, respawn=None):
+        self.config = config
+        self.n_targets = n_targets if n_targets is not None else config.CROWD_TARGETS
+        self.n_pursuers = n_pursuers if n_pursuers is not None else config.CROWD_PURSUERS
+        self.strategy = strategy or config.current_strategy
+        if self.strategy not in config.PURSUIT_STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {self.strategy}")
+        self.spatial_index = spatial_index
+        self.team = team or config.CROWD_TEAM_STRATEGY
+        if self.team not in ("nearest", "auction"):
+            raise ValueError(f"Estratégia de equipe desconhecida: {self.team}")
+        self.respawn = config.CROWD_RESPAWN if respawn is None else respawn
+
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        spawn_seq, step_seq = seed.spawn(2)
+        self.spawn_rng = np.random.default_rng(spawn_seq)
+        self.step_rng = np.random.default_rng(step_seq)
+
+        cell_size = config.CROWD_GRID_CELL or config.CAPTURE_DISTANCE
+        self.capture_grid = UniformGrid(config.WIDTH, config.HEIGHT, cell_size)
+        self.detected_grid = UniformGrid(config.WIDTH, config.HEIGHT, cell_size)
+
+        self.reset()
+
+    def reset(self):
+        n, m = self.n_targets, self.n_pursuers
+        width, height = self.config.WIDTH, self.config.HEIGHT
+
+        # Estado dos alvos
+        self.tx = np.zeros(n)
+        self.ty = np.zeros(n)
+        self.tdx = np.zeros(n)
+        self.tdy = np.zeros(n)
+        self.target_speed = np.zeros(n)
+        self.target_age = np.zeros(n, dtype=np.int64)
+        self.detected = np.zeros(n, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        self._spawn_targets(np.arange(n))
+
+        # Perseguidores espalhados pelo canvas, velocidade entre 6 e 12 (ou PURSUER_SPEED)
+        self.px = self.spawn_rng.uniform(0, width, m)
+        self.py = self.spawn_rng.uniform(0, height, m)
+        self.pursuer_speed = self.spawn_rng.uniform(6, 12, m)
+        if self.config.PURSUER_SPEED is not None:
+            self.pursuer_speed[:] = self.config.PURSUER_SPEED
+        self.reaction_counter = np.zeros(m, dtype=np.int64)
+        self.chasing = np.full(m, -1, dtype=np.int64)  # Alvo perseguido (-1 = nenhum)
+        self.heading = np.full(m, np.nan)
+        self.los = np.full(m, np.nan)
+        self.assigner = AuctionAssigner(self.config, n) if self.team == "auction" else None
+
+        # Estatísticas
+        self.frame_count = 0
+        self.capture_count = 0
+        self.captures_per_pursuer = np.zeros(m, dtype=np.int64)
+
+    def _spawn_targets(self, targets):
+        """Posiciona alvos em uma borda aleatória apontando para o centro (como Target.reset)"""
+        k = len(targets)
+        if k == 0:
+            return
+        cfg = self.config
+        width, height = cfg.WIDTH, cfg.HEIGHT
+        draws = self.spawn_rng.random((k, 4))
+
+        side = np.minimum((draws[:, 0] * 4).astype(np.int64), 3)  # 0=top, 1=bottom, 2=left, 3=right
+        x = np.select([side == 2, side == 3], [0.0, float(width)], draws[:, 1] * width)
+        y = np.select([side == 0, side == 1], [0.0, float(height)], draws[:, 1] * height)
+
+        angle = np.arctan2(height / 2 - y, width / 2 - x)
+        angle += (draws[:, 2] * 2 - 1) * (np.pi / 4)
+        speed = cfg.TARGET_MIN_SPEED + draws[:, 3] * (cfg.TARGET_MAX_SPEED - cfg.TARGET_MIN_SPEED)
+
+        self.tx[targets] = x
+        self.ty[targets] = y
+        self.tdx[targets] = np.cos(angle) * speed
+        self.tdy[targets] = np.sin(angle) * speed
+        self.target_speed[targets] = speed
+        self.target_age[targets] = 0
+
+    def step(self):
+        """Avança um frame da cena; retorna o número de capturas no frame"""
+        cfg = self.config
+        self.frame_count += 1
+
+        # Atualizar alvos e refletir nas bordas
+        self.tx += self.tdx
+        self.ty += self.tdy
+        hit_x = (self.tx <= 0) | (self.tx >= cfg.WIDTH)
+        hit_y = (self.ty <= 0) | (self.ty >= cfg.HEIGHT)
+        self.tdx = np.where(hit_x, -self.tdx, self.tdx)
+        self.tdy = np.where(hit_y, -self.tdy, self.tdy)
+        np.clip(self.tx, 0, cfg.WIDTH, out=self.tx)
+        np.clip(self.ty, 0, cfg.HEIGHT, out=self.ty)
+        self.target_age += 1
+
+        self.detected = self._detect()
+
+        # Estágio de equipe: escolhe o alvo de cada perseguidor; ao trocar de alvo a
+        # linha de visada anterior deixa de valer
+        chasing = self._choose_targets()
+        self.los[chasing != self.chasing] = np.nan
+        self.chasing = chasing
+        has_target = self.chasing >= 0
+        moving = has_target & (self.reaction_counter >= cfg.PURSUER_REACTION_TIME)
+        self.reaction_counter = np.where(moving, 0, self.reaction_counter + (has_target & ~moving))
+        self._pursue(moving)
+
+        return self._capture()
+
+    def _detect(self):
+        """Técnicas 1 e 2 de MotionDetector aplicadas a todos os alvos de uma vez.
+
+        A técnica 1 usa o deslocamento acumulado na janela do histórico (velocidade vezes
+        o número de frames na janela); a técnica 2, o limiar adaptativo pela velocidade.
+        """
+        cfg = self.config
+        span = np.minimum(self.target_age, HISTORY_SIZE) - 1
+        detection1 = (self.target_age >= 2) & (self.target_speed * span > cfg.MOTION_THRESHOLD)
+
+        visibility = np.minimum(1.0, self.target_speed / cfg.TARGET_MAX_SPEED)
+        adaptive_threshold = cfg.DETECTION_THRESHOLD * (1 - visibility * 0.5)
+        detection2 = self.step_rng.random(self.n_targets) < np.minimum(0.9, adaptive_threshold / 50)
+        return (detection1 | detection2) & self.alive
+
+    def _choose_targets(self):
+        """Alvo de cada perseguidor segundo a estratégia de equipe (-1 = nenhum)"""
+        if self.assigner is not None:
+            return self.assigner.assign(self.px, self.py, self.pursuer_speed,
+                                        self.tx, self.ty, self.tdx, self.tdy,
+                                        np.flatnonzero(self.detected))
+        chasing, _ = self._nearest_detected()
+        return chasing
+
+    def _nearest_detected(self):
+        """Índice e distância do alvo detectado mais próximo de cada perseguidor"""
+        if self.spatial_index:
+            self.detected_grid.build(self.tx, self.ty, self.detected)
+            return self.detected_grid.nearest(self.px, self.py)
+
+        if self.n_targets == 0:
+            return np.full(self.n_pursuers, -1, dtype=np.int64), np.full(self.n_pursuers, np.inf)
+
+        # Força bruta: matriz perseguidores x alvos, O(N·M)
+        distance = np.hypot(self.tx[None, :] - self.px[:, None], self.ty[None, :] - self.py[:, None])
+        distance[:, ~self.detected] = np.inf
+        nearest = np.argmin(distance, axis=1)
+        best = distance[np.arange(self.n_pursuers), nearest]
+        return np.where(np.isfinite(best), nearest, -1), best
+
+    def _pursue(self, moving):
+        """Move os perseguidores que reagem neste frame com o kernel da estratégia.
+
+        Os alvos da cena não têm histórico: a estimativa usa a velocidade real do alvo.
+        """
+        target = np.maximum(self.chasing, 0)
+        pursuers = PursuerState(self.px, self.py, self.pursuer_speed, self.heading, self.los)
+        targets = TargetEstimate(self.tx[target], self.ty[target], self.tdx[target], self.tdy[target])
+        dx, dy, heading, los = pursue(self.strategy, pursuers, targets, self.config)
+
+        self.px += np.where(moving, dx, 0.0)
+        self.py += np.where(moving, dy, 0.0)
+        self.heading = np.where(moving, heading, self.heading)
+        self.los = np.where(moving, los, self.los)
+        # Mantém os perseguidores no canvas (as células da grade cobrem só o canvas)
+        np.clip(self.px, 0, self.config.WIDTH, out=self.px)
+        np.clip(self.py, 0, self.config.HEIGHT, out=self.py)
+
+    def _capture(self):
+        """Alvos a menos de CAPTURE_DISTANCE de algum perseguidor são capturados"""
+        radius = self.config.CAPTURE_DISTANCE
+        if self.spatial_index:
+            self.capture_grid.build(self.tx, self.ty, self.alive)
+            pursuer, target, _ = self.capture_grid.query_radius(self.px, self.py, radius)
+        else:
+            distance = np.hypot(self.tx[None, :] - self.px[:, None], self.ty[None, :] - self.py[:, None])
+            distance[:, ~self.alive] = np.inf
+            pursuer, target = np.nonzero(distance < radius)
+
+        if len(target) == 0:
+            return 0
+
+        # Cada alvo conta uma vez, creditado ao perseguidor de menor índice
+        order = np.lexsort((pursuer, target))
+        target = target[order]
+        first = np.ones(len(target), dtype=bool)
+        first[1:] = target[1:] != target[:-1]
+        captured = target[first]
+        np.add.at(self.captures_per_pursuer, pursuer[order][first], 1)
+
+        self.capture_count += len(captured)
+        if self.respawn:
+            self._spawn_targets(captured)
+            if self.assigner is not None:
+                self.assigner.reset_targets(captured)
+        else:
+            self.alive[captured] = False
+        return len(captured)
+
+    @property
+    def finished(self):
+        """Sem respawn, a cena termina quando todos os alvos foram capturados"""
+        return not self.respawn and not self.alive.any()
+
+    def run(self, frames):
+        """Executa até `frames` frames (ou até a cena terminar) e retorna as estatísticas"""
+        for _ in range(frames):
+            if self.finished:
+                break
+            self.step()
+        return self.get_stats()
+
+    def get_stats(self):
+        frames = max(1, self.frame_count)
+        stats = {
+            'frames': self.frame_count,
+            'targets': self.n_targets,
+            'pursuers': self.n_pursuers,
+            'captures': self.capture_count,
+            'captures_per_frame': self.capture_count / frames,
+            'detected_fraction': float(self.detected.mean()) if self.n_targets else 0.0,
+            'alive': int(self.alive.sum()),
+        }
+        if self.assigner is not None:
+            stats.update(self.assigner.get_stats())
+        return stats
\ No newline at end of file
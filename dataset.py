@@ -0,0 +1,236 @@
+# dataset.py
+import os
+import copy
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pygame
+from config import Config
+
+# Uma linha por frame gravado: caixas (x0, y0, x1, y1) em pixels, posições em float
+LABEL_DTYPE = np.dtype([
+    ('shard', np.uint16),
+    ('index', np.uint32),          # Posição do frame no shard
+    ('episode', np.uint32),        # Episódio dentro do shard
+    ('step', np.uint32),           # Passo da simulação dentro do shard
+    ('strategy', np.uint8),        # Índice em meta['strategies']
+    ('target_box', np.int16, 4),
+    ('pursuer_box', np.int16, 4),
+    ('target_pos', np.float32, 2),
+    ('pursuer_pos', np.float32, 2),
+    ('target_visible', np.bool_),  # Caixa do alvo com área dentro da tela
+    ('detected', np.bool_),        # Saída do detector da simulação neste frame
+])
+
+CHANNELS = {'rgb': 3, 'gray': 1}
+
+
+def agent_box(agent, sprite_type, width, height):
+    """Caixa justa dos pixels opacos do sprite desenhado (ou da forma geométrica), recortada à tela"""
+    manager = agent.sprite_manager
+    sprite = manager.get_sprite(sprite_type)
+    if sprite and agent.config.ROTATE_SPRITES:
+        sprite = manager.get_rotated_sprite(sprite_type, agent.angle) or sprite
+    center = (int(agent.x), int(agent.y))
+    if sprite:
+        rect = sprite.get_bounding_rect().move(sprite.get_rect(center=center).topleft)
+    else:
+        rect = pygame.Rect(int(agent.x - agent.size / 2), int(agent.y - agent.size / 2),
+                           agent.size + 1, agent.size + 1)
+    return rect.clip(pygame.Rect(0, 0, width, height))
+
+
+def shard_paths(output_dir, shard):
+    return (os.path.join(output_dir, f"frames_{shard:05d}.npy"),
+            os.path.join(output_dir, f"labels_{shard:05d}.npy"))
+
+
+def generate_shard(job):
+    """Renderiza `frames` quadros da câmera (só a cena, sem HUD) direto em um .npy mapeado em memória.
+
+    Os pixels são lidos do buffer da superfície e convertidos pelo OpenCV já no destino
+    do mapeamento: não há cópia intermediária nem display. Episódios terminam na captura
+    ou após MAX_EPISODE_FRAMES passos, trocando de estratégia. Retorna (shard, frames, segundos).
+    """
+    import cv2
+    from simulation import Simulation
+
+    config, shard, frames, seed_sequence, output_dir, channels, every, strategies = job
+    start = time.perf_counter()
+
+    config = copy.copy(config)  # A estratégia muda a cada episódio
+    config.current_strategy = strategies[0]
+    simulation = Simulation(config, headless=True, seed=seed_sequence)
+    renderer = simulation.offscreen_renderer()
+    width, height = config.WIDTH, config.HEIGHT
+
+    frames_path, labels_path = shard_paths(output_dir, shard)
+    shape = (frames, height, width) if channels == 'gray' else (frames, height, width, 3)
+    images = np.lib.format.open_memmap(frames_path, mode='w+', dtype=np.uint8, shape=shape)
+    labels = np.zeros(frames, dtype=LABEL_DTYPE)
+    code = None
+
+    episode = 0
+    captures = 0
+    step = 0
+    index = 0
+    while index < frames:
+        if not simulation.captured and simulation.frame_count - simulation.current_capture_start >= config.MAX_EPISODE_FRAMES:
+            # Sem captura em MAX_EPISODE_FRAMES: encerra o episódio como benchmark.run_episode
+            simulation.reset()
+            episode += 1
+            config.current_strategy = strategies[episode % len(strategies)]
+        simulation.update()
+        step += 1
+        if simulation.capture_count != captures:
+            # Nova captura: o próximo episódio usa a próxima estratégia da lista
+            captures = simulation.capture_count
+            episode += 1
+            config.current_strategy = strategies[episode % len(strategies)]
+        # Frames da mensagem de captura são estáticos: só entram os passos com perseguição
+        if simulation.captured or step % every:
+            continue
+
+        camera = renderer.render_camera(simulation)
+        if code is None:
+            bgra = camera.get_masks()[0] == 0xFF0000
+            if channels == 'gray':
+                code = cv2.COLOR_BGRA2GRAY if bgra else cv2.COLOR_RGBA2GRAY
+            else:
+                code = cv2.COLOR_BGRA2RGB if bgra else cv2.COLOR_RGBA2RGB
+        pixels = np.frombuffer(camera.get_buffer(), dtype=np.uint8)
+        pixels = pixels.reshape(height, camera.get_pitch() // 4, 4)[:, :width]
+        cv2.cvtColor(pixels, code, dst=images[index])
+        del pixels  # Libera o bloqueio da superfície
+
+        target, pursuer = simulation.target, simulation.pursuer
+        target_box = agent_box(target, 'target', width, height)
+        pursuer_box = agent_box(pursuer, 'pursuer', width, height)
+        label = labels[index]
+        label['shard'] = shard
+        label['index'] = index
+        label['episode'] = episode
+        label['step'] = step
+        label['strategy'] = strategies.index(config.current_strategy)
+        label['target_box'] = (target_box.left, target_box.top, target_box.right, target_box.bottom)
+        label['pursuer_box'] = (pursuer_box.left, pursuer_box.top, pursuer_box.right, pursuer_box.bottom)
+        label['target_pos'] = (target.x, target.y)
+        label['pursuer_pos'] = (pursuer.x, pursuer.y)
+        label['target_visible'] = target_box.width > 0 and target_box.height > 0
+        label['detected'] = pursuer.target_detected
+        index += 1
+
+    images.flush()
+    del images
+    np.save(labels_path, labels)
+    simulation.close()
+    return shard, frames, time.perf_counter() - start
+
+
+def generate_dataset(config, output_dir, frames, workers=None, shard_frames=None, seed=None,
+                     channels='rgb', every=1, strategies=None):
+    """Divide `frames` em shards gerados em processos separados e grava labels.npy e dataset.json.
+
+    Cada shard tem sua própria semente (filha de `seed`), então o conjunto é reproduzível
+    independentemente do número de processos.
+    """
+    if channels not in CHANNELS:
+        raise ValueError(f"Canais desconhecidos: {channels} (use {', '.join(CHANNELS)})")
+    shard_frames = shard_frames or config.DATASET_SHARD_FRAMES
+    strategies = list(strategies or config.PURSUIT_STRATEGIES)
+    os.makedirs(output_dir, exist_ok=True)
+
+    sizes = [min(shard_frames, frames - first) for first in range(0, frames, shard_frames)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(config, shard, size, seeds[shard], output_dir, channels, every, strategies)
+            for shard, size in enumerate(sizes)]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    frame_bytes = config.WIDTH * config.HEIGHT * CHANNELS[channels]
+    start = time.perf_counter()
+    done = 0
+    if workers == 1:
+        shard_results = map(generate_shard, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        shard_results = executor.map(generate_shard, jobs)
+    for shard, count, elapsed in shard_results:
+        done += count
+        total = time.perf_counter() - start
+        print(f"[{shard + 1}/{len(jobs)}] {count} frames em {elapsed:.1f}s "
+              f"({count / elapsed:.0f} frames/s no shard; total {done / total:.0f} frames/s, "
+              f"{done * frame_bytes / total / 1e6:.0f} MB/s)")
+    if workers > 1:
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    # Índice único: os rótulos de todos os shards, na ordem global dos frames
+    labels = np.concatenate([np.load(shard_paths(output_dir, shard)[1]) for shard in range(len(sizes))])
+    np.save(os.path.join(output_dir, 'labels.npy'), labels)
+    for shard in range(len(sizes)):
+        os.remove(shard_paths(output_dir, shard)[1])
+
+    meta = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'frames': frames,
+        'shards': sizes,
+        'width': config.WIDTH,
+        'height': config.HEIGHT,
+        'channels': channels,
+        'every': every,
+        'seed': seed,
+        'strategies': strategies,
+        'label_fields': list(LABEL_DTYPE.names),
+        'seconds': elapsed,
+    }
+    with open(os.path.join(output_dir, 'dataset.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_dataset(path):
+    """(rótulos, lista de shards como np.memmap, metadados); frame i = shards[l['shard']][l['index']]"""
+    with open(os.path.join(path, 'dataset.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    labels = np.load(os.path.join(path, 'labels.npy'))
+    shards = [np.load(shard_paths(path, shard)[0], mmap_mode='r') for shard in range(len(meta['shards']))]
+    return labels, shards, meta
+
+
+def parse_args(argv=None):
+    config = Config()
+    parser = argparse.ArgumentParser(description="Gera frames rotulados (caixas e posições) para treinar e avaliar detectores")
+    parser.add_argument('--frames', type=int, default=100000, help="Total de frames")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument('--shard-frames', type=int, default=config.DATASET_SHARD_FRAMES,
+                        help="Frames por arquivo frames_NNNNN.npy")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--channels', choices=list(CHANNELS), default='rgb')
+    parser.add_argument('--every', type=int, default=1, help="Grava um frame a cada k passos da simulação")
+    parser.add_argument('--size', type=int, nargs=2, default=None, metavar=('LARGURA', 'ALTURA'),
+                        help="Tamanho do canvas (padrão: WIDTH x HEIGHT da configuração)")
+    parser.add_argument('--strategies', nargs='+', default=config.PURSUIT_STRATEGIES,
+                        choices=config.PURSUIT_STRATEGIES, help="Alternadas a cada episódio")
+    parser.add_argument('--output', default=None, help="Diretório de saída")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = Config()
+    if args.size:
+        config.WIDTH, config.HEIGHT = args.size
+
+    output_dir = args.output or f"dataset_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    meta = generate_dataset(config, output_dir, args.frames, args.workers, args.shard_frames, args.seed,
+                            args.channels, args.every, args.strategies)
+    print(f"{meta['frames']} frames em {len(meta['shards'])} shards, {meta['seconds']:.1f}s "
+          f"({meta['frames'] / meta['seconds']:.0f} frames/s) -> {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
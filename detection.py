@@ -1,16 +1,45 @@
+import math
 import numpy as np
-import cv2
+import pygame
 from collections import deque
+from tracking import ROITracker
+
+cv2 = None  # OpenCV é importado sob demanda: só o backend por pixels o utiliza
+
+def _import_cv2():
+    global cv2
+    if cv2 is None:
+        import cv2 as module
+        cv2 = module
+    return cv2
 
 class MotionDetector:
-    def __init__(self, config):
+    def __init__(self, config, rng=None):
         self.config = config
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.frame_buffer = deque(maxlen=3)  # Buffer para diferença de quadros
         self.detection_threshold = config.DETECTION_THRESHOLD
         self.motion_threshold = config.MOTION_THRESHOLD
         
+        # Backend por pixels: precisa receber os quadros renderizados via observe_frame
+        self.uses_frames = config.DETECTION_BACKEND == "opencv"
+        self.kernel = None
+        if self.uses_frames:
+            _import_cv2()
+            kernel_size = config.PIXEL_MORPH_KERNEL
+            self.kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_size, kernel_size))
+        self._diff_a = None
+        self._diff_b = None
+        
+        # Rastreamento preditivo: processa só a ROI ao redor da posição prevista
+        self.tracker = ROITracker(config) if self.uses_frames and config.DETECTION_TRACKING else None
+        self.frame_regions = deque(maxlen=3)  # Região convertida de cada quadro do frame_buffer
+        self._roi = None
+        
     def detect_target(self, target, pursuer, frame_count):
         """Detecta o alvo usando múltiplas técnicas"""
+        if self.uses_frames:
+            return self._pixel_detection(pursuer)
         
         # Técnica 1: Detecção por diferença de quadros
         detection1 = self._frame_difference_detection(target)
@@ -29,15 +58,13 @@ class MotionDetector:
     
     def _frame_difference_detection(self, target):
         """Detecção por diferença entre quadros consecutivos"""
-        if len(target.position_history) < 2:
+        history = target.position_history
+        if len(history) < 2:
             return False
         
-        # Calcular movimento baseado no histórico de posições
-        current_pos = target.position_history[-1]
-        prev_pos = target.position_history[0] if len(target.position_history) > 1 else current_pos
-        
-        movement = np.sqrt((current_pos[0] - prev_pos[0])**2 + 
-                          (current_pos[1] - prev_pos[1])**2)
+        # Movimento entre a posição mais antiga e a mais recente do histórico
+        dx, dy = history.displacement()
+        movement = math.sqrt(dx * dx + dy * dy)
         
         return movement > self.motion_threshold
     
@@ -61,54 +88,313 @@ class MotionDetector:
         
         # Detecção aleatória baseada no limiar adaptativo
         detection_prob = min(0.9, adaptive_threshold / 50)
-        return np.random.random() < detection_prob
+        return self.rng.random() < detection_prob
     
     def _centroid_detection(self, target):
         """Detecção baseada em centroides (simulada)"""
         # Em uma implementação real, calcularíamos centroides de regiões em movimento
         # Aqui usamos uma abordagem probabilística baseada no movimento
         
-        if len(target.position_history) < 3:
+        # Sorteio feito sempre, para que cada frame consuma o mesmo número de valores
+        draw = self.rng.random()
+        history = target.position_history
+        if len(history) < 3:
             return False
         
-        # Calcular aceleração (mudança na velocidade)
-        pos1 = target.position_history[-3]
-        pos2 = target.position_history[-2]
-        pos3 = target.position_history[-1]
-        
-        v1 = np.array([pos2[0] - pos1[0], pos2[1] - pos1[1]])
-        v2 = np.array([pos3[0] - pos2[0], pos3[1] - pos2[1]])
-        
-        acceleration = np.linalg.norm(v2 - v1)
+        # Calcular aceleração (mudança na velocidade) sem criar arrays
+        ax, ay = history.acceleration()
+        acceleration = math.sqrt(ax * ax + ay * ay)
         
         # Maior aceleração = mais fácil de detectar
         detection_prob = min(0.8, acceleration / 10)
-        return np.random.random() < detection_prob
+        return draw < detection_prob
+
+    def observe_frame(self, surface):
+        """Converte o quadro renderizado para tons de cinza e guarda no frame_buffer.
+
+        Os pixels são lidos diretamente do buffer da superfície (sem cópia); a única
+        escrita é a conversão para cinza, feita em um buffer reaproveitado. Com o
+        rastreamento ativo, só a ROI prevista (mais uma margem) é convertida.
+        """
+        width, height = surface.get_size()
+        if len(self.frame_buffer) == self.frame_buffer.maxlen:
+            gray = self.frame_buffer[0]  # Reaproveita o quadro mais antigo, que será descartado
+        else:
+            gray = np.empty((height, width), dtype=np.uint8)
+        
+        if self.tracker is not None:
+            self._roi = self.tracker.predict()
+            # Margem para que a ROI dos próximos quadros caia dentro da região convertida
+            region = _inflate(self._roi, self.config.ROI_CONVERT_MARGIN, width, height)
+        else:
+            self._roi = region = (0, 0, width, height)
+        
+        surface_to_gray(surface, gray, region)
+        self.frame_buffer.append(gray)
+        self.frame_regions.append(region)
+    
+    def push_frame(self, gray, dt=1):
+        """Recebe um quadro já convertido para cinza (inteiro), como no estágio assíncrono.
+
+        dt é o número de frames da simulação desde o quadro anterior (quadros descartados).
+        """
+        height, width = gray.shape
+        region = (0, 0, width, height)
+        self._roi = self.tracker.predict(dt) if self.tracker is not None else region
+        self.frame_buffer.append(gray)
+        self.frame_regions.append(region)
+    
+    def detect_in_frame(self, gray, pursuer, dt=1):
+        """push_frame() seguido da detecção por pixels: entrada do estágio assíncrono (pipeline.py).
+
+        pursuer só precisa de x, y e size; retorna o centroide do alvo ou None.
+        """
+        self.push_frame(gray, dt)
+        return self._pixel_detection(pursuer)
+    
+    def reset(self):
+        """Chamado quando o alvo reaparece: quadros anteriores e a estimativa do rastreador deixam de valer"""
+        self.frame_buffer.clear()
+        self.frame_regions.clear()
+        if self.tracker is not None:
+            self.tracker.reset()
+    
+    def _pixel_detection(self, pursuer):
+        """Diferença de três quadros, limiarização e morfologia; retorna o centroide do alvo.
+
+        pursuer só precisa de x, y e size (posição do próprio perseguidor a ignorar).
+        """
+        position = self._pixel_detection_in_roi(pursuer)
+        if self.tracker is not None:
+            if position is None:
+                self.tracker.miss()
+            else:
+                self.tracker.update(position)
+        return position
+    
+    def _pixel_detection_in_roi(self, pursuer):
+        if len(self.frame_buffer) < 3:
+            return None
+        
+        oldest, previous, current = self.frame_buffer
+        if self._diff_a is None or self._diff_a.shape != current.shape:
+            self._diff_a = np.empty_like(current)
+            self._diff_b = np.empty_like(current)
+        
+        # Só é válida a parte da ROI convertida nos três quadros
+        x0, y0, x1, y1 = self._roi
+        for rx0, ry0, rx1, ry1 in self.frame_regions:
+            x0, y0, x1, y1 = max(x0, rx0), max(y0, ry0), min(x1, rx1), min(y1, ry1)
+        if x1 - x0 < 3 or y1 - y0 < 3:
+            return None
+        
+        window = (slice(y0, y1), slice(x0, x1))
+        oldest, previous, current = oldest[window], previous[window], current[window]
+        diff_a, diff_b = self._diff_a[window], self._diff_b[window]
+        
+        # Pixels que diferem dos dois quadros anteriores: posição atual do objeto
+        cv2.absdiff(current, previous, dst=diff_a)
+        cv2.absdiff(current, oldest, dst=diff_b)
+        cv2.min(diff_a, diff_b, dst=diff_a)
+        cv2.threshold(diff_a, self.config.PIXEL_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=diff_a)
+        cv2.morphologyEx(diff_a, cv2.MORPH_OPEN, self.kernel, dst=diff_b)
+        
+        # Ignorar o movimento do próprio perseguidor
+        ego_radius = int(pursuer.size * 0.75) + self.config.PIXEL_EGO_MARGIN
+        cv2.circle(diff_b, (int(pursuer.x) - x0, int(pursuer.y) - y0), ego_radius, 0, -1)
+        
+        return self._largest_blob_centroid(diff_b, (x0, y0))
+    
+    def _largest_blob_centroid(self, mask, offset=(0, 0)):
+        """Centroide da maior região conectada acima da área mínima"""
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if count <= 1:
+            return None
+        
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        best = int(np.argmax(areas))
+        if areas[best] < self.config.PIXEL_MIN_AREA:
+            return None
+        
+        cx, cy = centroids[best + 1]
+        return (float(cx) + offset[0], float(cy) + offset[1])
+    
+    def get_state(self):
+        """Quadros e regiões da diferença de três quadros e o rastreador (snapshot.py).
+
+        O backend simulado não guarda estado além do gerador, salvo pela simulação.
+        """
+        if not self.uses_frames:
+            return {}
+        return {
+            'frames': [frame.copy() for frame in self.frame_buffer],
+            'regions': [list(region) for region in self.frame_regions],
+            'roi': list(self._roi) if self._roi is not None else None,
+            'tracker': self.tracker.get_state() if self.tracker is not None else None,
+        }
+    
+    def set_state(self, state):
+        if not self.uses_frames:
+            return
+        self.frame_buffer.clear()
+        self.frame_buffer.extend(frame.copy() for frame in state['frames'])
+        self.frame_regions.clear()
+        self.frame_regions.extend(tuple(region) for region in state['regions'])
+        self._roi = tuple(state['roi']) if state['roi'] is not None else None
+        if self.tracker is not None and state['tracker'] is not None:
+            self.tracker.set_state(state['tracker'])
+    
+    def get_tracking_stats(self):
+        """Tamanho médio da ROI e taxa de acerto do rastreamento (vazio sem rastreamento)"""
+        return self.tracker.get_stats() if self.tracker is not None else {}
+
+def surface_to_gray(surface, gray, region=None):
+    """Converte (a região de) uma superfície pygame para cinza em gray, lendo os pixels sem cópia"""
+    _import_cv2()
+    width, height = surface.get_size()
+    x0, y0, x1, y1 = region if region is not None else (0, 0, width, height)
+    
+    if surface.get_bytesize() == 4:
+        pixels = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+        pixels = pixels.reshape(height, surface.get_pitch() // 4, 4)[:, :width]
+        # Ordem dos canais na memória (little-endian): vermelho no terceiro byte = BGRA
+        code = cv2.COLOR_BGRA2GRAY if surface.get_masks()[0] == 0xFF0000 else cv2.COLOR_RGBA2GRAY
+        cv2.cvtColor(pixels[y0:y1, x0:x1], code, dst=gray[y0:y1, x0:x1])
+        del pixels  # Libera o bloqueio da superfície
+    else:
+        # Superfícies de 8/16/24 bits não têm layout de 4 bytes: copia via surfarray
+        rgb = pygame.surfarray.array3d(surface).swapaxes(0, 1)
+        cv2.cvtColor(np.ascontiguousarray(rgb[y0:y1, x0:x1]), cv2.COLOR_RGB2GRAY, dst=gray[y0:y1, x0:x1])
+    return gray
+
+def _inflate(region, margin, width, height):
+    x0, y0, x1, y1 = region
+    return (max(0, x0 - margin), max(0, y0 - margin), min(width, x1 + margin), min(height, y1 + margin))
+
+# Classificação de cada frame nos buffers de métricas
+TRUE_NEGATIVE, TRUE_POSITIVE, FALSE_POSITIVE, FALSE_NEGATIVE = 0, 1, 2, 3
 
 class DetectionMetrics:
-    def __init__(self):
-        self.detection_history = []
+    """Métricas de detecção com memória constante.
+
+    Contadores acumulados O(1), janela deslizante dos últimos `window` frames em um
+    buffer circular NumPy e um histórico subamostrado de tamanho fixo: quando enche,
+    descarta um a cada dois registros e passa a guardar com o dobro do passo.
+    """
+    
+    def __init__(self, window=600, history_capacity=4096):
         self.true_positives = 0
         self.false_positives = 0
         self.false_negatives = 0
+        self.frames = 0
         
-    def update(self, detected, actual_position):
-        self.detection_history.append((detected, actual_position))
+        # Janela deslizante: classificação por frame e contagens por classe
+        self.window = window
+        self.window_outcomes = np.zeros(window, dtype=np.int8)
+        self.window_counts = np.zeros(4, dtype=np.int64)
+        
+        # Histórico subamostrado: frame, detectado, posição real
+        self.history_capacity = history_capacity
+        self.history_stride = 1
+        self.history_size = 0
+        self.history_frames = np.zeros(history_capacity, dtype=np.int64)
+        self.history_detected = np.zeros(history_capacity, dtype=bool)
+        self.history_positions = np.full((history_capacity, 2), np.nan)
         
+    def update(self, detected, actual_position):
         if detected and actual_position is not None:
             self.true_positives += 1
+            outcome = TRUE_POSITIVE
         elif detected and actual_position is None:
             self.false_positives += 1
+            outcome = FALSE_POSITIVE
         elif not detected and actual_position is not None:
             self.false_negatives += 1
-    
-    def get_metrics(self):
-        total = self.true_positives + self.false_positives + self.false_negatives
-        if total == 0:
-            return 0, 0, 0
+            outcome = FALSE_NEGATIVE
+        else:
+            outcome = TRUE_NEGATIVE
         
-        precision = self.true_positives / (self.true_positives + self.false_positives) if (self.true_positives + self.false_positives) > 0 else 0
-        recall = self.true_positives / (self.true_positives + self.false_negatives) if (self.true_positives + self.false_negatives) > 0 else 0
-        f1_score = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+        # Atualização O(1) da janela: sai o frame mais antigo, entra o atual
+        slot = self.frames % self.window
+        if self.frames >= self.window:
+            self.window_counts[self.window_outcomes[slot]] -= 1
+        self.window_outcomes[slot] = outcome
+        self.window_counts[outcome] += 1
         
-        return precision, recall, f1_score
\ No newline at end of file
+        if self.frames % self.history_stride == 0:
+            self._record_history(detected, actual_position)
+        self.frames += 1
+    
+    def _record_history(self, detected, actual_position):
+        if self.history_size == self.history_capacity:
+            # Buffer cheio: mantém um a cada dois registros e dobra o passo
+            half = self.history_capacity // 2
+            self.history_frames[:half] = self.history_frames[0::2]
+            self.history_detected[:half] = self.history_detected[0::2]
+            self.history_positions[:half] = self.history_positions[0::2]
+            self.history_size = half
+            self.history_stride *= 2
+            if self.frames % self.history_stride != 0:
+                return
+        
+        i = self.history_size
+        self.history_frames[i] = self.frames
+        self.history_detected[i] = detected
+        self.history_positions[i] = actual_position if actual_position is not None else (np.nan, np.nan)
+        self.history_size += 1
+    
+    def get_metrics(self):
+        return _precision_recall_f1(self.true_positives, self.false_positives, self.false_negatives)
+    
+    def get_state(self):
+        """Contadores, janela e a parte ocupada do histórico (snapshot.py)"""
+        n = self.history_size
+        return {
+            'true_positives': self.true_positives,
+            'false_positives': self.false_positives,
+            'false_negatives': self.false_negatives,
+            'frames': self.frames,
+            'window_outcomes': self.window_outcomes.copy(),
+            'window_counts': self.window_counts.copy(),
+            'history_stride': self.history_stride,
+            'history_frames': self.history_frames[:n].copy(),
+            'history_detected': self.history_detected[:n].copy(),
+            'history_positions': self.history_positions[:n].copy(),
+        }
+    
+    def set_state(self, state):
+        for name in ('true_positives', 'false_positives', 'false_negatives', 'frames', 'history_stride'):
+            setattr(self, name, state[name])
+        self.window_outcomes[:] = state['window_outcomes']
+        self.window_counts[:] = state['window_counts']
+        n = self.history_size = len(state['history_frames'])
+        self.history_frames[:n] = state['history_frames']
+        self.history_detected[:n] = state['history_detected']
+        self.history_positions[:n] = state['history_positions']
+        self.history_positions[n:] = np.nan
+    
+    def get_window_metrics(self):
+        """Precisão, recall e F1 dos últimos `window` frames"""
+        counts = self.window_counts
+        return _precision_recall_f1(counts[TRUE_POSITIVE], counts[FALSE_POSITIVE], counts[FALSE_NEGATIVE])
+    
+    def export_history(self):
+        """Histórico subamostrado (cópias) a cada `history_stride` frames"""
+        n = self.history_size
+        return {
+            'frame': self.history_frames[:n].copy(),
+            'detected': self.history_detected[:n].copy(),
+            'position': self.history_positions[:n].copy(),
+            'stride': self.history_stride,
+        }
+
+def _precision_recall_f1(true_positives, false_positives, false_negatives):
+    total = true_positives + false_positives + false_negatives
+    if total == 0:
+        return 0, 0, 0
+    
+    precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0
+    recall = true_positives / (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 0
+    f1_score = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+    
+    return precision, recall, f1_score
\ No newline at end of file
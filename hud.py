@@ -0,0 +1,140 @@
+# hud.py
+import os
+import pygame
+from collections import OrderedDict
+
+
+def load_font(path, size):
+    """Carrega o .ttf direto do arquivo (None = freesansbold.ttf, que acompanha o pygame).
+
+    Evita pygame.font.SysFont, que na primeira chamada varre as fontes do sistema.
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+    try:
+        return pygame.font.Font(path, size)
+    except (OSError, pygame.error) as e:
+        print(f"Erro ao carregar fonte {path}: {e}")
+        return pygame.font.Font(None, size)
+
+
+class TextCache:
+    """Cache LRU de superfícies de texto renderizadas, por (texto, fonte, cor)"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, font_key, text, color):
+        key = (text, font_key, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class HUD:
+    """Painel de informações e mensagem de captura com fontes e superfícies de vida longa"""
+
+    CONTROL_LINES = [
+        "",
+        "Controles:",
+        "R - Reiniciar (Reset completo)",
+        "ESPAÇO - Pausar",
+        "1 - Perseguição Direta",
+        "2 - Interceptação Preditiva",
+        "3 - Navegação Proporcional",
+        "T - Alternar rotação de sprites",
+        "P - Perfil de tempo por fase",
+        "F - Velocidade (x1/x10/x100/máx)",
+        "K/L - Salvar/restaurar snapshot"
+    ]
+
+    def __init__(self, config):
+        self.config = config
+        self.text_cache = TextCache(config.HUD_TEXT_CACHE_SIZE)
+
+        # Fontes criadas uma única vez, a partir de um arquivo fixo
+        self.fonts = {
+            'info': load_font(config.HUD_FONT, 16),
+            'capture': load_font(config.HUD_FONT, 48),
+            'restart': load_font(config.HUD_FONT, 24),
+        }
+
+        # Fundo semitransparente da mensagem de captura
+        self.overlay = pygame.Surface((config.WIDTH, 100), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 128))  # Preto semitransparente
+
+        # Mensagem de captura é fixa: renderizada uma vez
+        self.capture_text = self.fonts['capture'].render("CAPTURADO!", True, (255, 255, 0))
+        self.restart_text = self.fonts['restart'].render("Reiniciando automaticamente...", True, (200, 200, 200))
+
+    def text(self, text, color, font_key='info'):
+        return self.text_cache.render(self.fonts[font_key], font_key, text, color)
+
+    def info_lines(self, simulation):
+        """Linhas do painel; apenas as que contêm valores mudam de um frame para outro"""
+        precision, recall, f1 = simulation.metrics.get_metrics()
+        avg_capture_time = simulation.total_capture_time / simulation.capture_count if simulation.capture_count > 0 else 0
+
+        return [
+            f"Frames: {simulation.frame_count}",
+            f"Capturas: {simulation.capture_count}",
+            f"Tempo médio de captura: {avg_capture_time:.1f} frames",
+            f"Detecção - Precisão: {precision:.2f}, Recall: {recall:.2f}, F1: {f1:.2f}",
+            f"Alvo detectado: {'SIM' if simulation.pursuer.target_detected else 'NÃO'}",
+            f"Velocidade alvo: {simulation.target.speed:.1f}",
+            f"Velocidade perseguidor: {simulation.pursuer.speed:.1f}",
+            self.scheduler_line(simulation.scheduler),
+        ] + self.CONTROL_LINES
+
+    def scheduler_line(self, scheduler):
+        return (f"Simulação: {scheduler.label} ({scheduler.last_steps} passos/frame, "
+                f"recuperados: {scheduler.catch_up_steps}, descartados: {scheduler.dropped_steps})")
+
+    def layout(self, simulation):
+        """Lista de (texto, cor, posição) de cada linha do painel"""
+        # Display da estratégia atual com destaque
+        strategy_display = f"ESTRATÉGIA: {self.config.current_strategy.upper()}"
+        lines = [(strategy_display, (255, 255, 0), (10, 10))]  # Amarelo para destaque
+
+        for i, line in enumerate(self.info_lines(simulation)):
+            lines.append((line, self.config.TEXT_COLOR, (10, 30 + i * 20)))
+        return lines
+
+    def draw_info(self, screen, simulation):
+        for text, color, position in self.layout(simulation):
+            screen.blit(self.text(text, color), position)
+
+    def draw_profiler(self, screen, lines):
+        """Painel de perfil no canto superior direito, sobre um fundo opaco.
+
+        Retorna o retângulo ocupado (para a atualização por retângulos sujos).
+        """
+        surfaces = [self.text(line, (0, 255, 255)) for line in lines]
+        width = max((surface.get_width() for surface in surfaces), default=0) + 10
+        rect = pygame.Rect(self.config.WIDTH - width - 10, 10, width, len(surfaces) * 18 + 10)
+        screen.fill((0, 0, 0), rect)
+        for i, surface in enumerate(surfaces):
+            screen.blit(surface, (rect.x + 5, rect.y + 5 + i * 18))
+        return rect
+
+    def draw_capture_message(self, screen):
+        width, height = self.config.WIDTH, self.config.HEIGHT
+        screen.blit(self.overlay, (0, (height - 100) // 2))
+
+        text_rect = self.capture_text.get_rect(center=(width/2, height/2 - 20))
+        screen.blit(self.capture_text, text_rect)
+
+        restart_rect = self.restart_text.get_rect(center=(width/2, height/2 + 30))
+        screen.blit(self.restart_text, restart_rect)
\ No newline at end of file
@@ -1,15 +1,135 @@
 import pygame
 import sys
+import time
+import argparse
 import numpy as np
+from datetime import datetime
 from simulation import Simulation
+from profiler import FrameProfiler
+from recorder import FrameRecorder
+from snapshot import ReplayLog, apply_event, encode_state, decode_state, save_snapshot
 from config import Config
-from utils import change_strategy  # Adicionar esta importação
+from utils import change_strategy, calculate_performance_metrics  # Adicionar esta importação
 
-def main():
-    pygame.init()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação Ligeirinho x Frajola")
+    parser.add_argument('--headless', action='store_true',
+                        help="Executa sem janela, sem limite de FPS e sem renderização")
+    parser.add_argument('--frames', type=int, default=100000,
+                        help="Número de frames no modo headless")
+    parser.add_argument('--render-every', type=int, default=0,
+                        help="No modo headless, renderiza em memória a cada k frames (0 = nunca)")
+    parser.add_argument('--strategy', choices=Config().PURSUIT_STRATEGIES,
+                        help="Estratégia de perseguição inicial")
+    parser.add_argument('--detector', choices=['simulated', 'opencv'],
+                        help="Backend de detecção (padrão: Config.DETECTION_BACKEND)")
+    parser.add_argument('--async-detection', action='store_true',
+                        help="Roda a detecção por pixels em uma thread, desacoplada da renderização")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="Atualiza apenas as regiões da tela que mudaram")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Semente dos fluxos aleatórios (execuções reproduzíveis)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Mede o tempo de cada fase do frame (tecla P mostra o painel)")
+    parser.add_argument('--profile-output', default=None,
+                        help="Prefixo dos arquivos .csv/.json do perfil gravados ao sair")
+    parser.add_argument('--speed', choices=['1', '10', '100', 'max'], default='1',
+                        help="Velocidade inicial da simulação com janela (tecla F alterna)")
+    parser.add_argument('--record', default=None, metavar='ARQUIVO',
+                        help="Grava os frames renderizados em vídeo (.mp4/.avi) ou frames crus (.raw) "
+                             "sem travar o loop; no modo headless grava a cada --render-every frames")
+    parser.add_argument('--replay-log', default=None, metavar='ARQUIVO',
+                        help="Grava as entradas e snapshots periódicos para reprodução determinística "
+                             "(python snapshot.py seek/check)")
+    return parser.parse_args(argv)
+
+def export_profile(profiler, prefix=None):
+    """Grava o perfil de tempo por fase ao sair"""
+    prefix = prefix or f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    csv_path, json_path = profiler.export(prefix)
+    print(f"Perfil gravado em {csv_path} e {json_path}")
+
+def report_recording(recorder):
+    """Fecha a gravação e mostra quantos frames foram gravados e descartados"""
+    meta = recorder.close()
+    if meta is not None:
+        print(f"Gravação: {meta['written']} frames em {recorder.path} ({meta['dropped']} descartados, "
+              f"cópia média {meta['mean_capture_ms']:.2f} ms)")
+
+def apply_input(simulation, log, kind, value=None):
+    """Aplica uma entrada do teclado, registrando-a no log de replay quando ativo"""
+    if log is not None:
+        log.record(simulation, kind, value)
+    else:
+        apply_event(simulation, kind, value)
+
+def save_replay_log(log, path):
+    log.save(path)
+    print(f"Log de replay gravado em {path} ({log.last_step} passos, {len(log.events)} eventos, "
+          f"{len(log.keyframes)} snapshots)")
+
+def run_headless(config, frames, render_every=0, seed=None, profile_output=None, record=None,
+                 replay_log=None):
+    """Executa a simulação sem display, o mais rápido possível"""
+    simulation = Simulation(config, headless=True, seed=seed)
+    profiler = simulation.profiler
+    log = ReplayLog(simulation) if replay_log else None
+    recorder = None
+    if record:
+        recorder = FrameRecorder(config, record)
+        render_every = render_every or 1
+    
+    start = time.perf_counter()
+    for frame in range(1, frames + 1):
+        if profiler is not None:
+            profiler.begin_frame()
+        simulation.update()
+        if log is not None:
+            log.observe(simulation)
+        if render_every and frame % render_every == 0:
+            simulation.render()
+            if recorder is not None:
+                # Sem prazo de tempo real: espera o escritor em vez de descartar frames
+                recorder.capture(simulation.screen, frame, block=True)
+        if profiler is not None:
+            profiler.end_frame()
+    elapsed = time.perf_counter() - start
+    simulation.close()
+    if recorder is not None:
+        report_recording(recorder)
+    if log is not None:
+        save_replay_log(log, replay_log)
+    if profiler is not None:
+        export_profile(profiler, profile_output)
+    
+    results = calculate_performance_metrics(simulation)
+    print(f"Frames: {frames} em {elapsed:.2f}s ({frames / elapsed:.0f} passos/s)")
+    for key, value in results.items():
+        print(f"{key}: {value}")
+    return results
+
+def main(argv=None):
+    args = parse_args(argv)
     
     # Configurações
     config = Config()
+    if args.strategy:
+        config.current_strategy = args.strategy
+    if args.detector:
+        config.DETECTION_BACKEND = args.detector
+    if args.async_detection:
+        config.DETECTION_ASYNC = True
+    if args.dirty_rects:
+        config.DIRTY_RECTS = True
+    if args.profile:
+        config.PROFILER = True
+    
+    if args.headless:
+        run_headless(config, args.frames, args.render_every, args.seed, args.profile_output, args.record,
+                     args.replay_log)
+        return
+    
+    pygame.init()
     
     # Verificar se assets directory existe
     import os
@@ -19,13 +139,22 @@ def main():
         print("Por favor, adicione as imagens 'ligeirinho.png' e 'frajola.png' na pasta 'assets'")
     
     # Inicializar simulação
-    simulation = Simulation(config)
+    simulation = Simulation(config, seed=args.seed)
+    simulation.scheduler.set_speed(None if args.speed == 'max' else int(args.speed))
+    recorder = FrameRecorder(config, args.record) if args.record else None
+    log = ReplayLog(simulation) if args.replay_log else None
+    last_snapshot = None
     
     # Loop principal
     running = True
     clock = pygame.time.Clock()
+    profiler = simulation.profiler
+    show_profile = False
     
     while running:
+        if profiler is not None:
+            profiler.begin_frame()
+        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -34,26 +163,81 @@ def main():
                     running = False
                 elif event.key == pygame.K_r:
                     # Reinício completo - resetar todas as estatísticas
-                    simulation.reset_complete()
+                    apply_input(simulation, log, 'reset_complete')
                 elif event.key == pygame.K_SPACE:
                     simulation.paused = not simulation.paused
                 elif event.key == pygame.K_1:
-                    config.current_strategy = "direct"
+                    apply_input(simulation, log, 'strategy', "direct")
                 elif event.key == pygame.K_2:
-                    config.current_strategy = "intercept"
+                    apply_input(simulation, log, 'strategy', "intercept")
                 elif event.key == pygame.K_3:
-                    config.current_strategy = "proportional"
+                    apply_input(simulation, log, 'strategy', "proportional")
                 elif event.key == pygame.K_t:
-                    # Alternar rotação de sprites
-                    config.ROTATE_SPRITES = not config.ROTATE_SPRITES
+                    # Alternar rotação de sprites (muda os quadros vistos pela detecção por pixels)
+                    apply_input(simulation, log, 'config', ('ROTATE_SPRITES', not config.ROTATE_SPRITES))
+                elif event.key == pygame.K_k:
+                    # Snapshot do estado completo: em memória (tecla L) e em disco
+                    if simulation.async_detector is not None:
+                        print("Snapshot indisponível com a detecção assíncrona")
+                        continue
+                    last_snapshot = encode_state(simulation.get_state())
+                    path = f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.snap"
+                    size = save_snapshot(simulation, path)
+                    print(f"Snapshot do passo {simulation.step_count} gravado em {path} ({size} bytes)")
+                elif event.key == pygame.K_l:
+                    if log is not None:
+                        print("Restaurar snapshot interromperia o log de replay em gravação")
+                    elif last_snapshot is not None:
+                        simulation.set_state(decode_state(last_snapshot)[0])
+                elif event.key == pygame.K_p:
+                    # Painel de perfil; sem --profile, a medição começa aqui
+                    if profiler is None:
+                        profiler = simulation.profiler = FrameProfiler(config)
+                        profiler.begin_frame()
+                    show_profile = not show_profile
+                    simulation.renderer.invalidate()
+                elif event.key == pygame.K_f:
+                    # Avanço rápido: passos de simulação por frame renderizado
+                    simulation.scheduler.cycle_speed()
+        if profiler is not None:
+            profiler.mark('events')
+        
+        # Passo fixo: x1 segue o relógio real, acelerações rodam vários passos por frame
+        # e só o estado mais recente é desenhado
+        simulation.advance(log.observe if log is not None else None)
+        
+        dirty_rects = simulation.render()
+        if show_profile:
+            overlay = simulation.renderer.hud.draw_profiler(simulation.screen, profiler.overlay_lines())
+            if dirty_rects is not None:
+                dirty_rects.append(overlay)
+            profiler.mark('overlay')
+        
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        if profiler is not None:
+            profiler.mark('flip')
         
-        if not simulation.paused:
-            simulation.update()
+        # Cópia da tela para a thread de gravação (descarta o frame se ela estiver atrasada)
+        if recorder is not None:
+            recorder.capture(simulation.screen, simulation.frame_count)
+            if profiler is not None:
+                profiler.mark('record')
         
-        simulation.render()
-        pygame.display.flip()
         clock.tick(config.FPS)
+        if profiler is not None:
+            profiler.mark('idle')
+            profiler.end_frame()
     
+    simulation.close()
+    if recorder is not None:
+        report_recording(recorder)
+    if log is not None:
+        save_replay_log(log, args.replay_log)
+    if profiler is not None:
+        export_profile(profiler, args.profile_output)
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,403 @@
+# microbench.py
+import os
+import sys
+import json
+import time
+import timeit
+import shutil
+import tempfile
+import subprocess
+import platform
+import argparse
+import itertools
+from datetime import datetime
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Tudo roda em superfícies em memória
+
+import numpy as np
+import pygame
+from config import Config
+
+SEED = 12345
+CANVAS_SIZES = [(800, 600), (1280, 720), (1920, 1080)]
+AGENT_COUNTS = [100, 1000, 10000]
+
+CASES = []
+
+
+def case(function):
+    """Registra um gerador de casos: produz (nome, parâmetros, preparo) para cada variação.
+
+    preparo(quick) monta o estado com sementes fixas e retorna (operação, unidades),
+    onde unidades é quantas operações do item medido cada chamada executa, ou
+    (operação, unidades, avanço): avanço() roda antes de cada chamada, fora da medição.
+    """
+    CASES.append(function)
+    return function
+
+
+def make_config(width=800, height=600, **overrides):
+    config = Config()
+    config.WIDTH = width
+    config.HEIGHT = height
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+def headless_simulation(config, warmup=10):
+    from simulation import Simulation
+    simulation = Simulation(config, headless=True, seed=SEED)
+    for _ in range(warmup):
+        simulation.update()
+    return simulation
+
+
+@case
+def target_update(quick):
+    def setup():
+        from agents import Target
+        target = Target(make_config(), None, rng=np.random.default_rng(SEED))
+        return target.update, 1
+    yield 'target_update', {}, setup
+
+
+@case
+def detect_target(quick):
+    def setup():
+        simulation = headless_simulation(make_config())
+        detector, target, pursuer = simulation.detector, simulation.target, simulation.pursuer
+        return (lambda: detector.detect_target(target, pursuer, simulation.frame_count)), 1
+    yield 'detect_target[simulated]', {'backend': 'simulated'}, setup
+
+    sizes = CANVAS_SIZES[:1] if quick else CANVAS_SIZES
+    for (width, height), tracking in itertools.product(sizes, (False, True)):
+        def setup(width=width, height=height, tracking=tracking):
+            # A detecção por pixels depende do quadro da câmera: mede o passo completo
+            simulation = headless_simulation(make_config(width, height, DETECTION_BACKEND='opencv',
+                                                         DETECTION_TRACKING=tracking))
+            return simulation.update, 1
+        label = 'roi' if tracking else 'full'
+        yield (f'step_opencv[{label},{width}x{height}]',
+               {'width': width, 'height': height, 'tracking': tracking}, setup)
+
+
+@case
+def pursuer_update(quick):
+    config = make_config()
+    for strategy in config.PURSUIT_STRATEGIES:
+        def setup(strategy=strategy):
+            from agents import Pursuer
+            # Sem atraso de reação: toda chamada executa a estratégia
+            pursuer = Pursuer(make_config(PURSUER_REACTION_TIME=0), None, rng=np.random.default_rng(SEED))
+            rng = np.random.default_rng(SEED)
+            positions = itertools.cycle([tuple(p) for p in rng.uniform((0, 0), (800, 600), (256, 2))])
+            return (lambda: pursuer.update(next(positions), strategy)), 1
+        yield f'pursuer_update[{strategy}]', {'strategy': strategy}, setup
+
+
+@case
+def strategy_kernels(quick):
+    from strategies import PursuerState, TargetEstimate, pursue
+    config = make_config()
+    counts = AGENT_COUNTS[:1] if quick else AGENT_COUNTS
+    for strategy, n in itertools.product(config.PURSUIT_STRATEGIES, counts):
+        def setup(strategy=strategy, n=n):
+            rng = np.random.default_rng(SEED)
+            pursuers = PursuerState(rng.uniform(0, 800, n), rng.uniform(0, 600, n), rng.uniform(6, 12, n),
+                                    rng.uniform(-np.pi, np.pi, n), rng.uniform(-np.pi, np.pi, n))
+            targets = TargetEstimate(rng.uniform(0, 800, n), rng.uniform(0, 600, n),
+                                     rng.uniform(-15, 15, n), rng.uniform(-15, 15, n))
+            return (lambda: pursue(strategy, pursuers, targets, config)), n
+        yield f'strategy_kernel[{strategy},{n}]', {'strategy': strategy, 'agents': n}, setup
+
+
+@case
+def rotated_sprite(quick):
+    for cached in (True, False):
+        def setup(cached=cached):
+            # ROTATION_STEP = 0 desativa a quantização: cada ângulo é uma rotação nova
+            config = make_config(ROTATION_STEP=2 if cached else 0)
+            simulation = headless_simulation(config, warmup=0)
+            simulation.render()
+            sprites = simulation.sprite_manager
+            angles = itertools.cycle(np.random.default_rng(SEED).uniform(0, 360, 1024).tolist())
+            return (lambda: sprites.get_rotated_sprite('target', next(angles))), 1
+        label = 'cache' if cached else 'exact'
+        yield f'get_rotated_sprite[{label}]', {'cached': cached}, setup
+
+
+@case
+def render(quick):
+    sizes = CANVAS_SIZES[:1] if quick else CANVAS_SIZES
+    for (width, height), dirty in itertools.product(sizes, (False, True)):
+        def setup(width=width, height=height, dirty=dirty):
+            simulation = headless_simulation(make_config(width, height, DIRTY_RECTS=dirty))
+            simulation.render()
+
+            # Só o render() é medido: o passo da simulação fica fora do tempo
+            return simulation.render, 1, simulation.update
+        label = 'dirty' if dirty else 'full'
+        yield (f'render[{label},{width}x{height}]',
+               {'width': width, 'height': height, 'dirty_rects': dirty}, setup)
+
+
+@case
+def crowd_step(quick):
+    counts = AGENT_COUNTS[:1] if quick else AGENT_COUNTS
+    for n in counts:
+        def setup(n=n):
+            from crowd import CrowdSimulation
+            crowd = CrowdSimulation(make_config(), n, max(1, n // 20), seed=SEED)
+            return crowd.step, 1
+        yield f'crowd_step[{n}]', {'targets': n, 'pursuers': max(1, n // 20)}, setup
+
+
+@case
+def episodes(quick):
+    episodes_scalar = 5 if quick else 20
+
+    def setup():
+        from benchmark import run_episode
+        from rng import episode_seed
+        simulation = headless_simulation(make_config(), warmup=0)
+        root = np.random.SeedSequence(SEED)
+
+        def run():
+            for k in range(episodes_scalar):
+                run_episode(simulation, 'direct', k, 5000, episode_seed(root, k))
+        return run, episodes_scalar
+    yield 'episode[scalar]', {'episodes': episodes_scalar}, setup
+
+    episodes_batch = 500 if quick else 4000
+
+    def setup():
+        from batch import BatchSimulation
+        config = make_config()
+        return (lambda: BatchSimulation(config, 1024, 'direct', seed=SEED).run(episodes_batch)), episodes_batch
+    yield 'episode[batch]', {'episodes': episodes_batch}, setup
+
+
+class _ManualTimer:
+    """autorange()/repeat() como os do timeit.Timer, com a medição feita por timed(number)"""
+
+    def __init__(self, timed):
+        self.timed = timed
+
+    def autorange(self):
+        number = 1
+        while True:
+            elapsed = self.timed(number)
+            if elapsed >= 0.2:
+                return number, elapsed
+            number *= 2
+
+    def repeat(self, repeat, number):
+        return [self.timed(number) for _ in range(repeat)]
+
+
+def measure(operation, units, repeat, advance=None):
+    """Melhor e mediana (ns por unidade) de `repeat` repetições calibradas pelo timeit.
+
+    Com advance, cada chamada é precedida de advance() e só a operação é cronometrada.
+    """
+    if advance is None:
+        timer = timeit.Timer(operation)
+    else:
+        def timed(number):
+            elapsed = 0.0
+            for _ in range(number):
+                advance()
+                start = time.perf_counter()
+                operation()
+                elapsed += time.perf_counter() - start
+            return elapsed
+        timer = _ManualTimer(timed)
+    number, _ = timer.autorange()
+    times = np.array(timer.repeat(repeat, number)) / (number * units) * 1e9
+    return {'ns_per_op': float(times.min()), 'median_ns': float(np.median(times)),
+            'number': number, 'units': units}
+
+
+def run_suite(repeat=5, quick=False, only=None):
+    results = {}
+    for generator in CASES:
+        for name, params, setup in generator(quick):
+            if only and not any(pattern in name for pattern in only):
+                continue
+            operation, units, *advance = setup()
+            results[name] = dict(measure(operation, units, repeat, *advance), params=params)
+            print(f"{name:<40} {results[name]['ns_per_op'] / 1000:12.3f} µs")
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'seed': SEED,
+            'quick': quick,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+
+# Executado em um processo novo: fases da inicialização até o primeiro frame na tela
+STARTUP_PROBE = r'''
+import sys, time, json
+start = time.perf_counter()
+import pygame
+from config import Config
+from simulation import Simulation
+imported = time.perf_counter()
+pygame.init()
+config = Config()
+config.SPRITE_CACHE_DIR = sys.argv[1]
+config.ROTATION_CACHE_DIR = sys.argv[2]
+simulation = Simulation(config, seed=0)
+created = time.perf_counter()
+simulation.advance()
+simulation.render()
+pygame.display.flip()
+first_frame = time.perf_counter()
+simulation.close()
+print(json.dumps({'imports_ms': (imported - start) * 1000, 'simulation_ms': (created - imported) * 1000,
+                  'first_frame_ms': (first_frame - created) * 1000, 'cv2_loaded': 'cv2' in sys.modules}))
+'''
+
+
+def startup_probe(sprite_cache, rotation_cache):
+    """Inicia um interpretador novo e retorna os tempos do probe mais o tempo total do processo"""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', STARTUP_PROBE, sprite_cache, rotation_cache],
+                            capture_output=True, text=True, check=True).stdout
+    total = (time.perf_counter() - start) * 1000
+    return dict(json.loads(output.strip().splitlines()[-1]), process_ms=total)
+
+
+def avoided_costs(config):
+    """Custos que a inicialização deixou de pagar, medidos isoladamente em processos novos"""
+    init = "import pygame; pygame.init(); pygame.display.set_mode((1, 1))"
+    scale = "; ".join(f"pygame.transform.smoothscale(pygame.image.load({path!r}).convert_alpha(), ({size}, {size}))"
+                      for path, size in ((config.IMAGE_PATHS['target'], config.TARGET_SIZE),
+                                         (config.IMAGE_PATHS['pursuer'], config.PURSUER_SIZE)))
+    snippets = {  # nome -> (preparação fora da medição, trecho medido)
+        'import cv2': ("pass", "import cv2"),
+        "SysFont('Arial')": (init, "pygame.font.SysFont('Arial', 16)"),
+        'escala dos sprites': (init, scale),
+    }
+    costs = {}
+    for name, (setup, snippet) in snippets.items():
+        code = f"import time; {setup}; start = time.perf_counter(); {snippet}; print((time.perf_counter() - start) * 1000)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        lines = result.stdout.strip().splitlines()
+        costs[name] = float(lines[-1]) if result.returncode == 0 and lines else None
+    return costs
+
+
+def run_startup(repeat=5):
+    """Tempo de inicialização com os caches de sprites vazios (frio) e já preenchidos (quente)"""
+    phases = ['imports_ms', 'simulation_ms', 'first_frame_ms', 'process_ms']
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='startup_')
+    try:
+        sprite_cache = os.path.join(workdir, 'sprites')
+        rotation_cache = os.path.join(workdir, 'rotations')
+        for mode in ('frio', 'quente'):
+            runs = []
+            for _ in range(repeat):
+                if mode == 'frio':
+                    shutil.rmtree(sprite_cache, ignore_errors=True)
+                    shutil.rmtree(rotation_cache, ignore_errors=True)
+                runs.append(startup_probe(sprite_cache, rotation_cache))
+            results[mode] = {phase: float(np.median([run[phase] for run in runs])) for phase in phases}
+            results[mode]['cv2_loaded'] = any(run['cv2_loaded'] for run in runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    results['evitados_ms'] = avoided_costs(Config())
+    return results
+
+
+def compare(baseline, current, threshold):
+    """Lista (nome, base, atual, razão, situação); situação é 'regressão' acima do limiar"""
+    rows = []
+    for name in baseline['results']:
+        if name not in current['results']:
+            continue
+        before = baseline['results'][name]['ns_per_op']
+        after = current['results'][name]['ns_per_op']
+        ratio = after / before if before > 0 else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regressão'
+        elif ratio < 1 / (1 + threshold):
+            status = 'melhoria'
+        else:
+            status = ''
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks dos caminhos críticos da simulação")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Executa a suíte e grava os tempos em JSON")
+    run.add_argument('--output', default=None, help="Arquivo JSON (padrão: microbench_<data>_<hora>.json)")
+    run.add_argument('--repeat', type=int, default=5, help="Repetições por caso (vale o melhor tempo)")
+    run.add_argument('--quick', action='store_true', help="Só o menor canvas e a menor contagem de agentes")
+    run.add_argument('--only', nargs='+', default=None, help="Executa só casos cujo nome contém estes textos")
+
+    startup = commands.add_parser('startup', help="Mede a inicialização até o primeiro frame em processos novos")
+    startup.add_argument('--repeat', type=int, default=5, help="Processos por modo (vale a mediana)")
+    startup.add_argument('--output', default=None, help="Grava o relatório em JSON")
+
+    cmp = commands.add_parser('compare', help="Compara dois resultados e aponta regressões")
+    cmp.add_argument('baseline', help="JSON de referência")
+    cmp.add_argument('current', help="JSON a avaliar")
+    cmp.add_argument('--threshold', type=float, default=0.10,
+                     help="Aumento relativo de tempo considerado regressão (padrão: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'run':
+        data = run_suite(args.repeat, args.quick, args.only)
+        output = args.output or f"microbench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"{len(data['results'])} casos -> {output}")
+        return 0
+
+    if args.command == 'startup':
+        report = run_startup(args.repeat)
+        for mode in ('frio', 'quente'):
+            times = report[mode]
+            print(f"{mode:<7} imports {times['imports_ms']:7.1f} ms  Simulation() {times['simulation_ms']:7.1f} ms  "
+                  f"primeiro frame {times['first_frame_ms']:6.1f} ms  processo {times['process_ms']:7.1f} ms  "
+                  f"cv2 {'carregado' if times['cv2_loaded'] else 'não carregado'}")
+        for name, cost in report['evitados_ms'].items():
+            print(f"evitado: {name:<20} {'indisponível' if cost is None else f'{cost:.1f} ms'}")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    for name, before, after, ratio, status in rows:
+        print(f"{name:<40} {before / 1000:10.3f} -> {after / 1000:10.3f} µs  x{ratio:5.2f}  {status}")
+    regressions = [row for row in rows if row[4] == 'regressão']
+    print(f"{len(regressions)} regressões acima de {args.threshold:.0%} em {len(rows)} casos")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,154 @@
+# pipeline.py
+import time
+import queue
+import threading
+from collections import namedtuple
+
+import numpy as np
+from detection import MotionDetector, surface_to_gray
+
+# Posição e tamanho do perseguidor no quadro enviado (para a máscara de ego-movimento)
+EgoState = namedtuple('EgoState', ['x', 'y', 'size'])
+
+# Resultado de uma detecção concluída pelo trabalhador
+DetectionResult = namedtuple('DetectionResult', ['frame_id', 'position', 'submitted_at', 'completed_at'])
+
+
+class AsyncDetector:
+    """Estágio de detecção assíncrono, desacoplado do loop de renderização.
+
+    O loop principal só copia os pixels do quadro da câmera e o envia por uma fila
+    limitada a uma thread trabalhadora, que faz a conversão para cinza e a detecção (o
+    OpenCV libera o GIL). Com a fila cheia o quadro mais antigo é descartado, então o
+    detector sempre trabalha no quadro mais recente. O perseguidor usa cada detecção
+    concluída uma única vez, com sua latência em frames.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.detector = MotionDetector(config)  # Estado acessado apenas pela thread trabalhadora
+        self.queue = queue.Queue(maxsize=config.ASYNC_QUEUE_SIZE)
+        self.lock = threading.Lock()
+
+        self._latest = None
+        self._last_frame_id = None
+        self._reset_pending = False
+
+        # Estatísticas
+        self.submitted = 0
+        self.dropped = 0
+        self.processed = 0
+        self.max_queue_depth = 0
+        self.latency_frames_total = 0
+        self.latency_samples = 0  # Chamadas de record_latency()
+        self.latency_seconds_total = 0.0
+        self.max_latency_seconds = 0.0
+
+        self.worker = threading.Thread(target=self._run, name="async-detector", daemon=True)
+        self.worker.start()
+
+    def submit(self, frame_id, surface, pursuer):
+        """Envia o quadro atual; descarta o mais antigo da fila se ela estiver cheia"""
+        width, height = surface.get_size()
+        if surface.get_bytesize() == 4:
+            # Só uma cópia dos pixels de 32 bits aqui; a conversão para cinza fica na thread
+            pixels = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+            frame = pixels.reshape(height, surface.get_pitch() // 4, 4)[:, :width].copy()
+            del pixels  # Libera o bloqueio da superfície
+            bgra = surface.get_masks()[0] == 0xFF0000
+        else:
+            frame = surface_to_gray(surface, np.empty((height, width), dtype=np.uint8))
+            bgra = None
+        job = (frame_id, frame, bgra, EgoState(pursuer.x, pursuer.y, pursuer.size), time.perf_counter())
+
+        self.submitted += 1
+        while True:
+            try:
+                self.queue.put_nowait(job)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def latest(self, frame_id):
+        """Última detecção concluída e sua latência em frames (None se ainda não há nenhuma)"""
+        with self.lock:
+            result = self._latest
+        if result is None:
+            return None, None
+        return result.position, frame_id - result.frame_id
+
+    def reset(self):
+        """Descarta detecções anteriores (ex.: o alvo reapareceu em outra borda)"""
+        with self.lock:
+            self._latest = None
+            self._reset_pending = True
+
+    def _run(self):
+        import cv2
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+
+            frame_id, frame, bgra, ego, submitted_at = job
+            if frame.ndim == 3:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY if bgra else cv2.COLOR_RGBA2GRAY)
+            else:
+                gray = frame
+            dt = frame_id - self._last_frame_id if self._last_frame_id is not None else 1
+            self._last_frame_id = frame_id
+
+            with self.lock:
+                reset, self._reset_pending = self._reset_pending, False
+            if reset:
+                self.detector.reset()
+
+            position = self.detector.detect_in_frame(gray, ego, dt)
+            completed_at = time.perf_counter()
+
+            with self.lock:
+                if not self._reset_pending:
+                    self._latest = DetectionResult(frame_id, position, submitted_at, completed_at)
+                self.processed += 1
+                latency = completed_at - submitted_at
+                self.latency_seconds_total += latency
+                self.max_latency_seconds = max(self.max_latency_seconds, latency)
+
+    def record_latency(self, latency_frames):
+        """Acumula a latência (em frames) da detecção usada pelo perseguidor"""
+        self.latency_frames_total += latency_frames
+        self.latency_samples += 1
+
+    def close(self):
+        """Encerra a thread trabalhadora"""
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+        self.worker.join(timeout=1.0)
+
+    def get_stats(self):
+        with self.lock:
+            processed = self.processed
+            latency_total = self.latency_seconds_total
+            max_latency = self.max_latency_seconds
+        return {
+            'submitted': self.submitted,
+            'processed': processed,
+            'dropped': self.dropped,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'mean_latency_ms': latency_total / processed * 1000 if processed else 0.0,
+            'max_latency_ms': max_latency * 1000,
+            'mean_latency_frames': self.latency_frames_total / self.latency_samples if self.latency_samples else 0.0,
+        }
\ No newline at end of file
@@ -0,0 +1,137 @@
+# profiler.py
+import csv
+import json
+import time
+import numpy as np
+
+
+class FrameProfiler:
+    """Tempo gasto em cada fase do frame, com percentis em janela deslizante.
+
+    Cada chamada mark(fase) atribui à fase o tempo decorrido desde a marca anterior
+    (uma leitura de relógio por fase). end_frame() grava o frame em buffers circulares
+    de PROFILER_WINDOW frames, de onde saem p50/p95/p99 e o FPS. Desativado, o perfil
+    simplesmente não existe (Simulation.profiler é None) e não há custo algum.
+
+    Com sample_every > 1 (modo headless, onde um passo custa poucos microssegundos) só
+    um frame a cada sample_every é medido: nos demais `detailed` é False, mark() não faz
+    nada (Simulation.update nem chega a chamá-lo) e begin_frame()/end_frame() só contam
+    o frame, sem ler o relógio.
+    """
+
+    def __init__(self, config, sample_every=1):
+        self.window = config.PROFILER_WINDOW
+        self.refresh = config.PROFILER_REFRESH
+        self.sample_every = sample_every
+        self.detailed = True  # Frame atual dividido em fases
+        self.phases = []  # Nomes na ordem em que aparecem pela primeira vez
+        self._index = {}
+        self._current = []  # Tempo acumulado por fase no frame atual
+        self.samples = []   # Buffer circular por fase (segundos; listas são mais baratas de escrever)
+        self.first_sample = []  # Amostra em que cada fase apareceu (antes disso não há medida)
+        self.totals = []    # Tempo total por fase nos frames amostrados
+        self.sample_frames = [0] * self.window  # Frame e tempo total de cada amostra
+        self.sample_times = [0.0] * self.window
+        self.frames = 0
+        self.sampled = 0
+        self._frame_start = self._last = time.perf_counter()
+        self._lines = []
+
+    def _add_phase(self, phase):
+        self._index[phase] = len(self.phases)
+        self.phases.append(phase)
+        self._current.append(0.0)
+        self.samples.append([0.0] * self.window)
+        self.first_sample.append(self.sampled)
+        self.totals.append(0.0)
+        return self._index[phase]
+
+    def begin_frame(self):
+        self.detailed = self.frames % self.sample_every == 0
+        if self.detailed:
+            self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Atribui a `phase` o tempo desde a marca anterior (ignorado em frames não amostrados)"""
+        if not self.detailed:
+            return
+        now = time.perf_counter()
+        index = self._index.get(phase)
+        if index is None:
+            index = self._add_phase(phase)
+        self._current[index] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self.detailed:
+            self.frames += 1
+            return
+        now = time.perf_counter()
+        slot = self.sampled % self.window
+        self.sample_frames[slot] = self.frames
+        self.sample_times[slot] = now - self._frame_start
+        current = self._current
+        totals = self.totals
+        for index, samples in enumerate(self.samples):
+            value = current[index]
+            samples[slot] = value
+            totals[index] += value
+            current[index] = 0.0
+        self.sampled += 1
+        self.frames += 1
+        self._last = now
+
+    def _recent_slots(self, count):
+        """Posições nos buffers por fase das últimas `count` amostras, da mais antiga à mais recente"""
+        return [sample % self.window for sample in range(self.sampled - count, self.sampled)]
+
+    def summary(self):
+        """Média e percentis (ms) de cada fase na janela, mais o FPS medido.
+
+        Os percentis de uma fase usam só as amostras gravadas depois que ela apareceu.
+        """
+        count = min(self.sampled, self.window)
+        if count == 0:
+            return {'fps': 0.0, 'phases': {}}
+
+        phases = {}
+        for phase, samples, first in zip(self.phases, self.samples, self.first_sample):
+            valid = min(self.sampled - first, self.window)
+            if valid <= 0:
+                continue
+            values = np.array([samples[slot] for slot in self._recent_slots(valid)]) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            phases[phase] = {'mean': float(values.mean()), 'p50': float(p50),
+                             'p95': float(p95), 'p99': float(p99)}
+        frame_mean = np.mean(self.sample_times[:count])
+        return {'fps': float(1 / frame_mean) if frame_mean > 0 else 0.0, 'phases': phases}
+
+    def overlay_lines(self):
+        """Linhas do painel de perfil, recalculadas a cada PROFILER_REFRESH frames"""
+        if not self._lines or self.frames % self.refresh == 0:
+            summary = self.summary()
+            self._lines = [f"FPS: {summary['fps']:.1f}   (ms)  p50    p95    p99"]
+            for phase, stats in summary['phases'].items():
+                self._lines.append(f"{phase:<14}{stats['p50']:7.3f}{stats['p95']:7.3f}{stats['p99']:7.3f}")
+        return self._lines
+
+    def export(self, prefix):
+        """Grava <prefix>.csv (frames amostrados da janela, em ms) e <prefix>.json (resumo e totais)"""
+        count = min(self.sampled, self.window)
+        with open(f"{prefix}.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + self.phases + ['frame_total'])
+            for sample, slot in zip(range(self.sampled - count, self.sampled), self._recent_slots(count)):
+                # Fases que ainda não tinham aparecido ficam vazias
+                values = [f"{samples[slot] * 1000:.4f}" if sample >= first else ''
+                          for samples, first in zip(self.samples, self.first_sample)]
+                writer.writerow([self.sample_frames[slot]] + values + [f"{self.sample_times[slot] * 1000:.4f}"])
+
+        summary = self.summary()
+        summary['frames'] = self.frames
+        summary['sampled_frames'] = self.sampled
+        summary['sample_every'] = self.sample_every
+        summary['total_seconds'] = dict(zip(self.phases, self.totals))
+        with open(f"{prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        return f"{prefix}.csv", f"{prefix}.json"
\ No newline at end of file
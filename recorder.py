@@ -0,0 +1,254 @@
+# recorder.py
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+
+import numpy as np
+import pygame
+
+
+def _byte_index(mask):
+    """Posição, dentro do pixel de 32 bits na memória, do byte selecionado pela máscara"""
+    index = (mask.bit_length() - 8) // 8
+    return index if sys.byteorder == 'little' else 3 - index
+
+
+class FrameRecorder:
+    """Gravação de frames sem travar o loop de renderização.
+
+    capture() copia os pixels da superfície (uma cópia de 32 bits, sem conversão) para
+    um buffer de um conjunto pré-alocado e o entrega a uma thread escritora. Sem buffer
+    livre (escritor atrasado), o frame é descartado e contado em vez de bloquear.
+    Destinos: vídeo pelo cv2.VideoWriter (convertido para BGR na thread) ou, com a
+    extensão .raw, os pixels de 32 bits crus, lidos depois por load_recording() como np.memmap.
+    """
+
+    def __init__(self, config, path, fps=None):
+        self.config = config
+        self.path = path
+        self.fps = fps or config.RECORD_FPS or config.FPS
+        self.raw = path.endswith('.raw')
+
+        self.pool = queue.Queue()  # Buffers livres (criados no primeiro frame)
+        self.queue = queue.Queue()  # Frames a escrever; limitada pelo tamanho do conjunto
+        self.size = None
+        self.channels = None
+        self.staging = None
+        self.frame_ids = []
+        self.error = None
+
+        # Estatísticas
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.max_queue_depth = 0
+        self.capture_seconds_total = 0.0
+        self.write_seconds_total = 0.0
+
+        self.worker = None
+
+    def capture(self, surface, frame_id=None, block=False):
+        """Enfileira uma cópia da superfície; retorna False se o frame foi descartado.
+
+        Com block=True (gravação offline) espera um buffer livre em vez de descartar.
+        """
+        if self.size is None:
+            self._start(surface)
+        if surface.get_size() != self.size:
+            raise ValueError(f"Tamanho do frame mudou durante a gravação: {surface.get_size()} != {self.size}")
+
+        self.submitted += 1
+        try:
+            buffer = self.pool.get(block=block)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        start = time.perf_counter()
+        if surface.get_bitsize() != 32:
+            self.staging.blit(surface, (0, 0))
+            surface = self.staging
+        pixels = pygame.surfarray.pixels2d(surface)  # Vista (largura, altura); trava a superfície
+        np.copyto(buffer, pixels.T)
+        del pixels
+
+        self.queue.put((frame_id if frame_id is not None else self.submitted, buffer))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        self.capture_seconds_total += time.perf_counter() - start
+        return True
+
+    def _start(self, surface):
+        """Prepara buffers, ordem dos canais e a thread escritora com o tamanho do primeiro frame"""
+        width, height = self.size = surface.get_size()
+        if surface.get_bitsize() != 32:
+            self.staging = pygame.Surface(self.size, 0, 32)
+            surface = self.staging
+        red, green, blue, _ = surface.get_masks()
+        self.channels = [_byte_index(blue), _byte_index(green), _byte_index(red)]
+        for _ in range(self.config.RECORD_QUEUE_SIZE):
+            self.pool.put(np.empty((height, width), dtype=np.uint32))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.raw:
+            sink = open(self.path, 'wb')
+            convert = None
+        else:
+            import cv2
+            if self.channels == [0, 1, 2]:
+                convert = lambda pixels: cv2.cvtColor(pixels, cv2.COLOR_BGRA2BGR)
+            else:
+                convert = lambda pixels: np.ascontiguousarray(pixels[:, :, self.channels])
+            sink = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.config.RECORD_CODEC),
+                                   self.fps, self.size)
+            if not sink.isOpened():
+                raise RuntimeError(f"Não foi possível abrir o vídeo {self.path} com o codec {self.config.RECORD_CODEC}")
+
+        self.worker = threading.Thread(target=self._run, args=(sink, convert), name="frame-recorder", daemon=True)
+        self.worker.start()
+
+    def _run(self, sink, convert):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            frame_id, buffer = job
+            start = time.perf_counter()
+            try:
+                if self.error is None:
+                    if convert is None:
+                        sink.write(buffer.data)
+                    else:
+                        height, width = buffer.shape
+                        sink.write(convert(buffer.view(np.uint8).reshape(height, width, 4)))
+                    self.frame_ids.append(frame_id)
+                    self.written += 1
+            except (OSError, ValueError) as e:
+                self.error = e
+                print(f"Erro ao gravar frame: {e}")
+            finally:
+                self.write_seconds_total += time.perf_counter() - start
+                self.pool.put(buffer)
+        if self.raw:
+            sink.close()
+        else:
+            sink.release()
+
+    def close(self):
+        """Escreve os frames pendentes, fecha o arquivo e grava <arquivo>.json com os metadados"""
+        if self.worker is None:
+            return None
+        self.queue.put(None)
+        self.worker.join()
+        self.worker = None
+
+        meta = {
+            'path': os.path.basename(self.path),
+            'format': 'raw' if self.raw else self.config.RECORD_CODEC,
+            'width': self.size[0],
+            'height': self.size[1],
+            'channels': self.channels,  # Bytes de azul, verde e vermelho em cada pixel .raw
+            'fps': self.fps,
+            'frame_ids': self.frame_ids,
+        }
+        meta.update(self.get_stats())
+        with open(f"{self.path}.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        return meta
+
+    def get_stats(self):
+        return {
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'mean_capture_ms': self.capture_seconds_total / max(1, self.submitted - self.dropped) * 1000,
+            'mean_write_ms': self.write_seconds_total / max(1, self.written) * 1000,
+        }
+
+
+def load_recording(path):
+    """Frames de uma gravação .raw como (frames, altura, largura, 3) em BGR e os metadados.
+
+    No formato usual (BGRA na memória) o resultado é uma vista do np.memmap: os frames
+    só são lidos do disco quando acessados.
+    """
+    with open(f"{path}.json", encoding='utf-8') as f:
+        meta = json.load(f)
+    shape = (meta['written'], meta['height'], meta['width'], 4)
+    if meta['written'] == 0:
+        return np.empty(shape[:3] + (3,), dtype=np.uint8), meta
+    pixels = np.memmap(path, dtype=np.uint8, mode='r', shape=shape)
+    if meta['channels'] == [0, 1, 2]:
+        return pixels[..., :3], meta
+    return pixels[..., meta['channels']], meta
+
+
+def record_episode(config, strategy, seed, run_id, path, max_frames=None, every=1):
+    """Regrava um episódio do benchmark (motor escalar) a partir da semente raiz e do run_id.
+
+    A semente do episódio não depende da divisão em blocos, então qualquer execução de
+    um benchmark ou varredura pode ser renderizada depois, sem custo para a execução original.
+    """
+    from rng import episode_seed
+    from simulation import Simulation
+    from benchmark import run_episode
+
+    pygame.font.init()
+    recorder = FrameRecorder(config, path)
+    simulation = Simulation(config, headless=True)
+
+    def on_frame(simulation):
+        if simulation.frame_count % every == 0 or simulation.captured:
+            simulation.render()
+            recorder.capture(simulation.screen, simulation.frame_count, block=True)
+
+    row = run_episode(simulation, strategy, run_id, max_frames or config.MAX_EPISODE_FRAMES,
+                      episode_seed(seed, run_id), on_frame=on_frame)
+    simulation.close()
+    recorder.close()
+    return row, recorder.get_stats()
+
+
+def parse_args(argv=None):
+    from config import Config
+    config = Config()
+    parser = argparse.ArgumentParser(description="Renderiza e grava episódios do benchmark ou de uma varredura")
+    parser.add_argument('--strategy', choices=config.PURSUIT_STRATEGIES, default=config.current_strategy)
+    parser.add_argument('--seed', type=int, required=True, help="Semente raiz usada no benchmark/varredura")
+    parser.add_argument('--runs', type=int, nargs='+', required=True, help="run_id dos episódios a gravar")
+    parser.add_argument('--set', nargs='+', default=[], metavar='CAMPO=VALOR',
+                        help="Campos do ponto da varredura (ex.: PURSUER_REACTION_TIME=5)")
+    parser.add_argument('--max-frames', type=int, default=config.MAX_EPISODE_FRAMES)
+    parser.add_argument('--every', type=int, default=1, help="Grava um frame a cada k passos")
+    parser.add_argument('--output', default='gravacoes', help="Diretório de saída")
+    parser.add_argument('--format', choices=['mp4', 'avi', 'raw'], default='mp4')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from config import Config
+    from sweep import parse_param, point_config
+
+    args = parse_args(argv)
+    point = {}
+    for spec in args.set:
+        name, values = parse_param(spec)
+        point[name] = values[0]
+    config = point_config(Config(), point)
+
+    for run_id in args.runs:
+        path = os.path.join(args.output, f"{args.strategy}_seed{args.seed}_run{run_id}.{args.format}")
+        row, stats = record_episode(config, args.strategy, args.seed, run_id, path, args.max_frames, args.every)
+        print(f"run {run_id}: {row['frames_to_capture']} frames, capturado={row['captured']}, "
+              f"{stats['written']} gravados, {stats['dropped']} descartados -> {path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
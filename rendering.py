@@ -0,0 +1,143 @@
+# rendering.py
+import pygame
+from sprites import SpriteManager
+from hud import HUD
+
+
+class Renderer:
+    """Camada de apresentação: desenha o estado de uma Simulation em uma superfície"""
+
+    def __init__(self, config, offscreen=False):
+        self.config = config
+        self.offscreen = offscreen
+
+        if offscreen:
+            # Superfície em memória: não exige display (servidores sem vídeo)
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.screen = pygame.Surface((config.WIDTH, config.HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+            pygame.display.set_caption("O Rato mais rápido de todo o México")
+
+        # Inicializar gerenciador de sprites
+        self.sprite_manager = SpriteManager(config)
+
+        # Painel de informações com cache de texto
+        self.hud = HUD(config)
+
+        # Estado do frame anterior para a renderização por retângulos sujos
+        self._dirty_state = None
+
+        # Quadro da "câmera" usado pela detecção por pixels (só a cena, sem HUD)
+        self.camera = None
+
+    def render(self, simulation):
+        """Desenha o frame; retorna os retângulos alterados ou None se a tela inteira mudou"""
+        if self.config.DIRTY_RECTS:
+            return self._render_dirty(simulation)
+
+        self._render_full(simulation)
+        self._dirty_state = None
+        return None
+
+    def render_camera(self, simulation):
+        """Desenha apenas a cena (fundo e agentes) na superfície de 32 bits da câmera"""
+        if self.camera is None:
+            self.camera = pygame.Surface((self.config.WIDTH, self.config.HEIGHT), 0, 32)
+        self.camera.fill(self.config.BG_COLOR)
+        simulation.target.draw(self.camera)
+        simulation.pursuer.draw(self.camera, indicator=False)
+        return self.camera
+
+    def invalidate(self):
+        """Força o próximo frame a redesenhar a tela inteira (ex.: sobreposição removida)"""
+        self._dirty_state = None
+
+    def _render_full(self, simulation):
+        profiler = simulation.profiler
+
+        # Fundo
+        self.screen.fill(self.config.BG_COLOR)
+
+        # Desenhar agentes
+        simulation.target.draw(self.screen)
+        simulation.pursuer.draw(self.screen)
+        if profiler is not None:
+            profiler.mark('render_agents')
+
+        # Informações de debug
+        self.hud.draw_info(self.screen, simulation)
+
+        # Mensagem de captura
+        if simulation.captured:
+            self.hud.draw_capture_message(self.screen)
+        if profiler is not None:
+            profiler.mark('render_hud')
+
+    def _render_dirty(self, simulation):
+        """Restaura o fundo e redesenha apenas onde agentes ou linhas do painel mudaram"""
+        agent_rects = [simulation.target.bounds(), simulation.pursuer.bounds()]
+        hud_lines = []
+        for text, color, position in self.hud.layout(simulation):
+            surface = self.hud.text(text, color)
+            hud_lines.append((text, color, surface, surface.get_rect(topleft=position)))
+
+        previous = self._dirty_state
+        self._dirty_state = (agent_rects, hud_lines, simulation.captured)
+
+        # Primeiro frame e mensagem de captura (sobreposta à tela toda): redesenho completo
+        if previous is None or simulation.captured or previous[2]:
+            self._render_full(simulation)
+            return [self.screen.get_rect()]
+
+        previous_agents, previous_lines, _ = previous
+        dirty = previous_agents + agent_rects
+        for i in range(max(len(hud_lines), len(previous_lines))):
+            current = hud_lines[i] if i < len(hud_lines) else None
+            old = previous_lines[i] if i < len(previous_lines) else None
+            if current is not None and old is not None and current[:2] == old[:2]:
+                continue
+            if old is not None:
+                dirty.append(old[3])
+            if current is not None:
+                dirty.append(current[3])
+
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in _merge_rects(dirty)]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+
+        for rect in dirty:
+            self.screen.fill(self.config.BG_COLOR, rect)
+
+        # Os agentes ficam inteiramente dentro das regiões sujas
+        simulation.target.draw(self.screen)
+        simulation.pursuer.draw(self.screen)
+
+        # Texto com alfa não pode ser reaplicado sobre si mesmo: recorta em cada região limpa
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            for _, _, surface, line_rect in hud_lines:
+                if line_rect.colliderect(rect):
+                    self.screen.blit(surface, line_rect)
+        self.screen.set_clip(None)
+
+        if simulation.profiler is not None:
+            simulation.profiler.mark('render_dirty')
+        return dirty
+
+
+def _merge_rects(rects):
+    """Une retângulos sobrepostos para que cada pixel pertença a uma única região"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
\ No newline at end of file
@@ -0,0 +1,211 @@
+# results.py
+import os
+import glob
+import json
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Colunas escalares por execução e seus tipos no formato colunar
+RESULT_DTYPES = {
+    'run_id': np.int64,
+    'frames_to_capture': np.int32,
+    'time_to_capture': np.float64,
+    'target_speed': np.float64,
+    'pursuer_speed': np.float64,
+    'detection_precision': np.float64,
+    'detection_recall': np.float64,
+    'detection_f1': np.float64,
+    'total_detections': np.int32,
+    'target_lost_count': np.int32,
+    'captured': np.bool_,
+}
+
+
+def encode_runs(bits):
+    """Codifica uma sequência de bits em comprimentos de corrida alternados.
+
+    A primeira corrida é sempre de zeros (pode ter comprimento 0), então o valor de
+    cada corrida fica implícito na posição: pares = não detectado, ímpares = detectado.
+    """
+    bits = np.asarray(bits, dtype=bool)
+    if len(bits) == 0:
+        return np.empty(0, dtype=np.int32)
+    edges = np.flatnonzero(bits[1:] != bits[:-1]) + 1
+    bounds = np.concatenate(([0], edges, [len(bits)]))
+    runs = np.diff(bounds)
+    if bits[0]:
+        runs = np.concatenate(([0], runs))
+    return runs.astype(np.int32)
+
+
+def decode_runs(runs):
+    """Inverso de encode_runs: bit de detecção de cada frame (índice 0 = frame 1)"""
+    runs = np.asarray(runs, dtype=np.int64)
+    return np.repeat(np.arange(len(runs)) % 2 == 1, runs)
+
+
+def detection_events(runs):
+    """Lista de eventos no formato antigo ({'frame', 'type'}) a partir das corridas"""
+    bits = decode_runs(runs)
+    events = []
+    was_detected = False
+    for frame, detected in enumerate(bits.tolist(), start=1):
+        if detected:
+            events.append({'frame': frame, 'type': 'detected'})
+        elif was_detected:
+            events.append({'frame': frame, 'type': 'lost'})
+        was_detected = detected
+    return events
+
+
+def rows_to_columns(rows):
+    """Converte linhas (dicts de run_episode) em colunas tipadas"""
+    columns = {name: np.array([row[name] for row in rows], dtype=dtype)
+               for name, dtype in RESULT_DTYPES.items()}
+    columns['strategy'] = np.array([row['strategy'] for row in rows])
+    columns['detection_runs'] = [row['detection_runs'] for row in rows]
+    return columns
+
+
+def columns_to_rows(columns, strategy=None):
+    """Gera uma linha (dict) por execução, para CSV e planilhas"""
+    names = [name for name in RESULT_DTYPES if name in columns]
+    for i, values in enumerate(zip(*(columns[name].tolist() for name in names))):
+        row = dict(zip(names, values))
+        row['strategy'] = strategy if strategy is not None else columns['strategy'][i]
+        yield row
+
+
+class ResultsWriter:
+    """Grava resultados por execução em um diretório de partes .npz colunares.
+
+    append() acumula blocos de colunas e, a cada RESULTS_CHUNK_ROWS execuções, grava
+    uma parte e libera a memória: o escritor nunca mantém todas as execuções. Cada
+    coluna escalar tem tipo fixo, a estratégia é codificada como índice em um
+    dicionário de nomes e as detecções por frame ficam como corridas de bits
+    (detection_runs concatenadas, detection_counts corridas por execução).
+    """
+
+    def __init__(self, path, chunk_rows=65536):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.strategies = []  # Dicionário de nomes (código = posição)
+        self.rows = 0
+        self.parts = 0
+        self._chunks = []
+        self._buffered = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _code(self, strategy):
+        if strategy not in self.strategies:
+            self.strategies.append(strategy)
+        return self.strategies.index(strategy)
+
+    def append(self, columns):
+        """Acrescenta um bloco de execuções (colunas de mesmo comprimento).
+
+        strategy pode ser um nome único para o bloco ou um array de nomes; sem
+        detection_runs, as execuções ficam sem eventos (ex.: motor vetorizado).
+        """
+        n = len(columns['run_id'])
+        if n == 0:
+            return
+        chunk = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in RESULT_DTYPES.items()}
+
+        names, inverse = np.unique(np.broadcast_to(np.asarray(columns['strategy']), (n,)),
+                                   return_inverse=True)
+        codes = np.array([self._code(str(name)) for name in names], dtype=np.int16)
+        chunk['strategy'] = codes[inverse]
+
+        runs = columns.get('detection_runs')
+        if runs is None:
+            chunk['detection_counts'] = np.zeros(n, dtype=np.int32)
+            chunk['detection_runs'] = np.empty(0, dtype=np.int32)
+        else:
+            chunk['detection_counts'] = np.array([len(r) for r in runs], dtype=np.int32)
+            chunk['detection_runs'] = (np.concatenate(runs).astype(np.int32) if len(runs)
+                                       else np.empty(0, dtype=np.int32))
+
+        self._chunks.append(chunk)
+        self._buffered += n
+        self.rows += n
+        if self._buffered >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Grava as execuções acumuladas como uma nova parte"""
+        if not self._chunks:
+            return
+        part = {name: np.concatenate([chunk[name] for chunk in self._chunks]) for name in self._chunks[0]}
+        np.savez_compressed(os.path.join(self.path, f"part-{self.parts:05d}.npz"), **part)
+        self.parts += 1
+        self._chunks = []
+        self._buffered = 0
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {'format_version': FORMAT_VERSION, 'rows': self.rows, 'parts': self.parts,
+                'strategies': self.strategies, 'columns': list(RESULT_DTYPES)}
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    def close(self):
+        self.flush()
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_parts(path, columns=None):
+    """Percorre as partes do diretório, uma de cada vez (colunas como gravadas)"""
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    for part_path in sorted(glob.glob(os.path.join(path, 'part-*.npz'))):
+        with np.load(part_path) as part:
+            names = columns or part.files
+            yield meta, {name: part[name] for name in names}
+
+
+def load_results(path, columns=None, events=False):
+    """Carrega o diretório inteiro em colunas; strategy volta como array de nomes.
+
+    Com events=True inclui detection_runs (concatenadas) e detection_offsets, onde as
+    corridas da execução i são detection_runs[detection_offsets[i]:detection_offsets[i + 1]].
+    """
+    names = list(columns or RESULT_DTYPES)
+    if 'strategy' not in names:
+        names.append('strategy')
+    if events:
+        names += ['detection_counts', 'detection_runs']
+
+    meta = None
+    chunks = {name: [] for name in names}
+    for meta, part in iter_parts(path, names):
+        for name in names:
+            chunks[name].append(part[name])
+    if meta is None:
+        return {}
+
+    data = {name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0) for name in names}
+    data['strategy'] = np.array(meta['strategies'])[data['strategy']]
+    if events:
+        counts = data.pop('detection_counts')
+        data['detection_offsets'] = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+    return data
+
+
+def split_by_strategy(data):
+    """{estratégia: colunas ordenadas por run_id}, na ordem de primeira aparição"""
+    strategies, first = np.unique(data['strategy'], return_index=True)
+    results = {}
+    for strategy in strategies[np.argsort(first)]:
+        selected = np.flatnonzero(data['strategy'] == strategy)
+        selected = selected[np.argsort(data['run_id'][selected], kind='stable')]
+        results[str(strategy)] = {name: values[selected] for name, values in data.items()
+                                  if name in RESULT_DTYPES}
+    return results
\ No newline at end of file
@@ -0,0 +1,27 @@
+# rng.py
+import numpy as np
+
+
+class RandomStreams:
+    """Geradores independentes por subsistema: surgimento e detecção.
+
+    Com a mesma semente, a trajetória do alvo e os sorteios de detecção se repetem
+    em qualquer estratégia (números aleatórios comuns), pois cada subsistema
+    consome apenas o seu próprio fluxo.
+    """
+
+    def __init__(self, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+
+        spawn_seq, detection_seq = seed.spawn(2)
+        self.spawn = np.random.default_rng(spawn_seq)          # Surgimento do alvo e do perseguidor
+        self.detection = np.random.default_rng(detection_seq)  # Sorteios do MotionDetector
+
+
+def episode_seed(root_seed, episode):
+    """Semente do episódio: a mesma para todas as estratégias (números aleatórios comuns)"""
+    if isinstance(root_seed, np.random.SeedSequence):
+        root_seed = root_seed.entropy
+    return np.random.SeedSequence(root_seed, spawn_key=(episode,))
\ No newline at end of file
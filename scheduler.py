@@ -0,0 +1,105 @@
+# scheduler.py
+import math
+import time
+
+
+class FixedStepScheduler:
+    """Relógio de passo fixo: a simulação avança em passos de 1/SIM_STEP_RATE s de tempo
+    simulado, independentemente da taxa de renderização.
+
+    A cada frame renderizado, run() converte o tempo real decorrido (vezes o multiplicador
+    de velocidade) em passos devidos e guarda a fração restante para o próximo frame; só o
+    estado final é desenhado. Se a simulação ficar para trás (frame lento, passos caros),
+    recupera até SIM_MAX_CATCH_UP frames de passos e descarta o excesso em vez de travar a
+    tela. Na velocidade máxima (None) roda passos até esgotar o orçamento do frame.
+    """
+
+    def __init__(self, config):
+        self.step_time = 1 / config.SIM_STEP_RATE
+        self.frame_time = 1 / config.FPS
+        self.frame_budget = config.SIM_FRAME_BUDGET * self.frame_time
+        self.max_catch_up = config.SIM_MAX_CATCH_UP
+        self.speeds = list(config.SIM_SPEEDS)
+        self.speed_index = 0
+        self.accumulator = 0.0  # Passos devidos ainda não executados (com fração)
+        self.last_time = None
+
+        # Contabilidade
+        self.frames = 0
+        self.steps = 0
+        self.last_steps = 0
+        self.catch_up_steps = 0  # Passos além da cota nominal do frame (recuperando atraso)
+        self.dropped_steps = 0   # Passos devidos descartados por excederem o atraso máximo
+        self.late_frames = 0     # Frames em que o orçamento acabou antes dos passos devidos
+
+    @property
+    def speed(self):
+        return self.speeds[self.speed_index]
+
+    @property
+    def label(self):
+        return "máx" if self.speed is None else f"x{self.speed}"
+
+    def set_speed(self, speed):
+        if speed not in self.speeds:
+            raise ValueError(f"Velocidade não configurada em SIM_SPEEDS: {speed}")
+        self.speed_index = self.speeds.index(speed)
+        self.accumulator = 0.0
+
+    def cycle_speed(self):
+        """Próxima velocidade de SIM_SPEEDS (tecla F)"""
+        self.speed_index = (self.speed_index + 1) % len(self.speeds)
+        self.accumulator = 0.0
+        return self.speed
+
+    def run(self, step, paused=False, now=None):
+        """Executa os passos devidos desde o último frame e retorna quantos rodaram"""
+        now = time.perf_counter() if now is None else now
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+        self.frames += 1
+
+        if paused:
+            self.accumulator = 0.0
+            self.last_steps = 0
+            return 0
+
+        deadline = time.perf_counter() + self.frame_budget
+        executed = 0
+        if self.speed is None:
+            while True:
+                step()
+                executed += 1
+                if time.perf_counter() >= deadline:
+                    break
+        else:
+            nominal = self.speed * self.frame_time / self.step_time
+            self.accumulator += elapsed * self.speed / self.step_time
+            limit = math.ceil(nominal * self.max_catch_up)
+            if self.accumulator > limit:
+                self.dropped_steps += int(self.accumulator - limit)
+                self.accumulator -= int(self.accumulator - limit)
+
+            due = int(self.accumulator + 1e-9)  # Tolera o arredondamento de frames exatos
+            while executed < due:
+                step()
+                executed += 1
+                if executed < due and time.perf_counter() >= deadline:
+                    self.late_frames += 1  # O restante fica devido para o próximo frame
+                    break
+            self.accumulator -= executed
+            self.catch_up_steps += max(0, executed - math.ceil(nominal))
+
+        self.steps += executed
+        self.last_steps = executed
+        return executed
+
+    def get_stats(self):
+        return {
+            'sim_speed': self.label,
+            'sim_steps': self.steps,
+            'sim_steps_per_frame': self.steps / max(1, self.frames),
+            'sim_catch_up_steps': self.catch_up_steps,
+            'sim_dropped_steps': self.dropped_steps,
+            'sim_late_frames': self.late_frames,
+        }
\ No newline at end of file
@@ -3,26 +3,53 @@ import pygame
 import numpy as np
 from agents import Target, Pursuer
 from detection import MotionDetector, DetectionMetrics
-from sprites import SpriteManager  # IMPORTANTE: Adicionar esta linha
+from rendering import Renderer
+from rng import RandomStreams
+from pipeline import AsyncDetector
+from profiler import FrameProfiler
+from scheduler import FixedStepScheduler
 
 class Simulation:
-    def __init__(self, config):
+    def __init__(self, config, headless=False, seed=None):
         self.config = config
-        self.screen = pygame.display.set_mode((config.WIDTH, config.HEIGHT))
-        pygame.display.set_caption("O Rato mais rápido de todo o México")
+        self.headless = headless
         
-        # Inicializar gerenciador de sprites
-        self.sprite_manager = SpriteManager(config)
+        # Fluxos aleatórios próprios (surgimento, detecção e perseguição)
+        self.streams = RandomStreams(seed)
+        
+        # Apresentação separada do estado: no modo headless não há display,
+        # fontes nem sprites até que render() seja chamado
+        self.renderer = None
+        self.screen = None
+        self.sprite_manager = None
+        if not headless:
+            self._attach_renderer(offscreen=False)
         
         # Inicializar agentes com gerenciador de sprites
-        self.target = Target(config, self.sprite_manager)
-        self.pursuer = Pursuer(config, self.sprite_manager)
+        self.target = Target(config, self.sprite_manager, rng=self.streams.spawn)
+        self.pursuer = self._new_pursuer()
         
         # Sistema de detecção
-        self.detector = MotionDetector(config)
-        self.metrics = DetectionMetrics()
+        self.detector = MotionDetector(config, rng=self.streams.detection)
+        self.metrics = DetectionMetrics(config.METRICS_WINDOW, config.METRICS_HISTORY_CAPACITY)
+        
+        # Detecção por pixels em uma thread separada, lida com latência de alguns frames
+        self.async_detector = None
+        if config.DETECTION_ASYNC and self.detector.uses_frames:
+            self.async_detector = AsyncDetector(config)
+        self.detection_latency = 0
+        self.used_detection_frame = None  # Frame da última detecção assíncrona entregue ao perseguidor
+        
+        # Tempo por fase do frame (None quando desativado: nenhum custo)
+        self.profiler = None
+        if config.PROFILER:
+            self.profiler = FrameProfiler(config, config.PROFILER_HEADLESS_SAMPLE if headless else 1)
+        
+        # Passos de simulação por frame renderizado (usado só pelo loop com janela)
+        self.scheduler = FixedStepScheduler(config)
         
         # Estatísticas
+        self.step_count = 0  # Chamadas de update(), inclusive na exibição da captura (linha do tempo do replay)
         self.frame_count = 0
         self.capture_count = 0
         self.total_capture_time = 0
@@ -34,11 +61,35 @@ class Simulation:
         self.capture_display_time = 0
         self.capture_display_duration = 60  # Mostrar mensagem por 60 frames (1 segundo a 60 FPS)
         
-        # Fontes para texto
-        self.font = pygame.font.SysFont('Arial', 16)
-        self.large_font = pygame.font.SysFont('Arial', 32)
-        
+    def _attach_renderer(self, offscreen):
+        """Cria a camada de apresentação e entrega os sprites aos agentes"""
+        self.renderer = Renderer(self.config, offscreen=offscreen)
+        self.screen = self.renderer.screen
+        self.sprite_manager = self.renderer.sprite_manager
+        if hasattr(self, 'target'):
+            self.target.sprite_manager = self.sprite_manager
+            self.pursuer.sprite_manager = self.sprite_manager
+    
+    def offscreen_renderer(self):
+        """Renderer em memória (criado na primeira chamada), para quem lê a câmera direto (ex.: dataset.py)"""
+        if self.renderer is None:
+            self._attach_renderer(offscreen=True)
+        return self.renderer
+    
+    def _new_pursuer(self):
+        return Pursuer(self.config, self.sprite_manager, rng=self.streams.spawn)
+    
+    def reseed(self, seed):
+        """Troca os fluxos aleatórios (ex.: semente por episódio para números aleatórios comuns).
+
+        Deve ser seguido de reset_complete(), que recria o alvo e o perseguidor com os novos fluxos.
+        """
+        self.streams = RandomStreams(seed)
+        self.target.rng = self.streams.spawn
+        self.detector.rng = self.streams.detection
+    
     def update(self):
+        self.step_count += 1
         if self.captured:
             self.capture_display_time += 1
             # Reiniciar automaticamente após mostrar a mensagem de captura
@@ -47,20 +98,43 @@ class Simulation:
             return
             
         self.frame_count += 1
+        profiler = self.profiler
+        if profiler is not None and not profiler.detailed:
+            profiler = None  # Frame não amostrado: só o tempo total é medido
         
         # Atualizar alvo
         self.target.update()
+        if profiler is not None:
+            profiler.mark('target')
+        
+        # Detecção por pixels: a câmera enxerga a cena já com o alvo na nova posição
+        if self.detector.uses_frames:
+            camera = self.offscreen_renderer().render_camera(self)
+            if self.async_detector is not None:
+                self.async_detector.submit(self.frame_count, camera, self.pursuer)
+            else:
+                self.detector.observe_frame(camera)
+            if profiler is not None:
+                profiler.mark('camera')
         
         # Detectar alvo
-        detected_position = self.detector.detect_target(
-            self.target, self.pursuer, self.frame_count
-        )
+        if self.async_detector is not None:
+            detected_position, fresh = self._latest_async_detection()
+        else:
+            detected_position = self.detector.detect_target(
+                self.target, self.pursuer, self.frame_count
+            )
+            fresh = True
         
         # Atualizar métricas de detecção
         self.metrics.update(detected_position is not None, (self.target.x, self.target.y))
+        if profiler is not None:
+            profiler.mark('detection')
         
-        # Atualizar perseguidor
-        self.pursuer.update(detected_position, self.config.current_strategy)
+        # Atualizar perseguidor (uma detecção assíncrona repetida não é uma nova observação)
+        self.pursuer.update(detected_position if fresh else None, self.config.current_strategy)
+        if profiler is not None:
+            profiler.mark('pursuer')
         
         # Verificar captura
         distance = np.sqrt((self.target.x - self.pursuer.x)**2 + 
@@ -73,6 +147,85 @@ class Simulation:
             self.total_capture_time += capture_time
             self.capture_display_time = 0
     
+    def get_state(self):
+        """Estado completo da simulação em um dicionário de escalares e arrays (snapshot.py).
+
+        Inclui os geradores aleatórios: restaurado, o estado produz os mesmos passos
+        seguintes. A detecção assíncrona depende do tempo da thread e não é suportada.
+        """
+        if self.async_detector is not None:
+            raise ValueError("Snapshot indisponível com a detecção assíncrona (resultado depende do tempo da thread)")
+        return {
+            'step_count': self.step_count,
+            'frame_count': self.frame_count,
+            'capture_count': self.capture_count,
+            'total_capture_time': self.total_capture_time,
+            'current_capture_start': self.current_capture_start,
+            'paused': self.paused,
+            'captured': self.captured,
+            'capture_display_time': self.capture_display_time,
+            'detection_latency': self.detection_latency,
+            'strategy': self.config.current_strategy,
+            'rng': {
+                'spawn': self.streams.spawn.bit_generator.state,
+                'detection': self.streams.detection.bit_generator.state,
+            },
+            'target': self.target.get_state(),
+            'pursuer': self.pursuer.get_state(),
+            'detector': self.detector.get_state(),
+            'metrics': self.metrics.get_state(),
+        }
+    
+    def set_state(self, state):
+        """Restaura um estado de get_state() (mesma configuração e backend de detecção)"""
+        if self.async_detector is not None:
+            raise ValueError("Snapshot indisponível com a detecção assíncrona (resultado depende do tempo da thread)")
+        for name in ('step_count', 'frame_count', 'capture_count', 'total_capture_time', 'current_capture_start',
+                     'paused', 'captured', 'capture_display_time', 'detection_latency'):
+            setattr(self, name, state[name])
+        self.config.current_strategy = state['strategy']
+        self.streams.spawn.bit_generator.state = state['rng']['spawn']
+        self.streams.detection.bit_generator.state = state['rng']['detection']
+        self.target.set_state(state['target'])
+        self.pursuer.set_state(state['pursuer'])
+        self.detector.set_state(state['detector'])
+        self.metrics.set_state(state['metrics'])
+        if self.renderer is not None:
+            self.renderer.invalidate()
+    
+    def advance(self, on_step=None):
+        """Executa os passos devidos pelo relógio de passo fixo; retorna quantos rodaram.
+
+        on_step(simulation), se dado, é chamado após cada passo (ex.: log de replay).
+        """
+        def step_and_observe():
+            self.update()
+            on_step(self)
+        step = self.update if on_step is None else step_and_observe
+        return self.scheduler.run(step, paused=self.paused)
+    
+    def _latest_async_detection(self):
+        """Última detecção concluída pelo estágio assíncrono, se ainda não estiver obsoleta.
+
+        Retorna (posição, nova): a mesma detecção continua valendo nos frames seguintes,
+        mas só a primeira vez em que aparece é nova (e entra na latência registrada).
+        """
+        position, latency = self.async_detector.latest(self.frame_count)
+        if position is None or latency > self.config.ASYNC_MAX_LATENCY:
+            return None, False
+        detection_frame = self.frame_count - latency
+        if detection_frame == self.used_detection_frame:
+            return position, False
+        self.used_detection_frame = detection_frame
+        self.detection_latency = latency
+        self.async_detector.record_latency(latency)
+        return position, True
+    
+    def close(self):
+        """Libera recursos em segundo plano (thread de detecção assíncrona)"""
+        if self.async_detector is not None:
+            self.async_detector.close()
+    
     def handle_event(self, event):
         if event.type == pygame.USEREVENT and self.captured:
             self.reset()
@@ -80,84 +233,32 @@ class Simulation:
     
     def reset(self):
         self.target.reset()
-        self.pursuer = Pursuer(self.config, self.sprite_manager)
+        self.detector.reset()
+        if self.async_detector is not None:
+            self.async_detector.reset()
+            self.used_detection_frame = None
+        self.pursuer = self._new_pursuer()
         self.captured = False
         self.capture_display_time = 0
         self.current_capture_start = self.frame_count
     
     def render(self):
-        # Fundo
-        self.screen.fill(self.config.BG_COLOR)
-        
-        # Desenhar agentes
-        self.target.draw(self.screen)
-        self.pursuer.draw(self.screen)
-        
-        # Informações de debug
-        self._draw_info()
-        
-        # Mensagem de captura
-        if self.captured:
-            self._draw_capture_message()
-    
-    def _draw_info(self):
-        # Estatísticas
-        precision, recall, f1 = self.metrics.get_metrics()
-        avg_capture_time = self.total_capture_time / self.capture_count if self.capture_count > 0 else 0
-        
-        # Display da estratégia atual com destaque
-        strategy_display = f"ESTRATÉGIA: {self.config.current_strategy.upper()}"
-        strategy_text = self.font.render(strategy_display, True, (255, 255, 0))  # Amarelo para destaque
-        self.screen.blit(strategy_text, (10, 10))
-        
-        info_lines = [
-            f"Frames: {self.frame_count}",
-            f"Capturas: {self.capture_count}",
-            f"Tempo médio de captura: {avg_capture_time:.1f} frames",
-            f"Detecção - Precisão: {precision:.2f}, Recall: {recall:.2f}, F1: {f1:.2f}",
-            f"Alvo detectado: {'SIM' if self.pursuer.target_detected else 'NÃO'}",
-            f"Velocidade alvo: {self.target.speed:.1f}",
-            f"Velocidade perseguidor: {self.pursuer.speed:.1f}",
-            "",
-            "Controles:",
-            "R - Reiniciar (Reset completo)",
-            "ESPAÇO - Pausar",
-            "1 - Perseguição Direta",
-            "2 - Interceptação Preditiva", 
-            "3 - Navegação Proporcional",
-            "T - Alternar rotação de sprites"
-        ]
-        
-        for i, line in enumerate(info_lines):
-            text = self.font.render(line, True, self.config.TEXT_COLOR)
-            self.screen.blit(text, (10, 30 + i * 20))
-    
-    def _draw_capture_message(self):
-        # Fundo semitransparente para a mensagem
-        s = pygame.Surface((self.config.WIDTH, 100), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 128))  # Preto semitransparente
-        self.screen.blit(s, (0, (self.config.HEIGHT - 100) // 2))
-        
-        # Mensagem de captura
-        font = pygame.font.SysFont('Arial', 48)
-        text = font.render("CAPTURADO!", True, (255, 255, 0))
-        text_rect = text.get_rect(center=(self.config.WIDTH/2, self.config.HEIGHT/2 - 20))
-        self.screen.blit(text, text_rect)
-        
-        # Mensagem de reinício automático
-        small_font = pygame.font.SysFont('Arial', 24)
-        restart_text = small_font.render("Reiniciando automaticamente...", True, (200, 200, 200))
-        restart_rect = restart_text.get_rect(center=(self.config.WIDTH/2, self.config.HEIGHT/2 + 30))
-        self.screen.blit(restart_text, restart_rect)
+        """Desenha o frame; retorna os retângulos alterados (modo DIRTY_RECTS) ou None"""
+        # No modo headless a renderização é opcional e feita em memória
+        return self.offscreen_renderer().render(self)
     
     def reset_complete(self):
         """Reinicia completamente a simulação, incluindo estatísticas"""
         self.target.reset()
-        self.pursuer = Pursuer(self.config, self.sprite_manager)
+        self.detector.reset()
+        if self.async_detector is not None:
+            self.async_detector.reset()
+            self.used_detection_frame = None
+        self.pursuer = self._new_pursuer()
         self.captured = False
         self.capture_display_time = 0
         self.frame_count = 0
         self.capture_count = 0
         self.total_capture_time = 0
         self.current_capture_start = 0
-        self.metrics = DetectionMetrics()
\ No newline at end of file
+        self.metrics = DetectionMetrics(self.config.METRICS_WINDOW, self.config.METRICS_HISTORY_CAPACITY)
\ No newline at end of file
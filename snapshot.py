@@ -0,0 +1,283 @@
+# snapshot.py
+import io
+import sys
+import json
+import hashlib
+import argparse
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+# Campos de Config que não entram no snapshot (caminhos de cache e apresentação)
+_UNSAVED = {'ROTATION_CACHE_DIR', 'SPRITE_CACHE_DIR', 'SWEEP_CACHE_DIR', 'HUD_FONT'}
+
+
+def _split_arrays(value, arrays):
+    """Troca cada array do estado por uma referência {'__array__': nome} e guarda o array à parte"""
+    if isinstance(value, np.ndarray):
+        name = f"a{len(arrays)}"
+        arrays[name] = value
+        return {'__array__': name}
+    if isinstance(value, dict):
+        return {key: _split_arrays(item, arrays) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_split_arrays(item, arrays) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _join_arrays(value, arrays):
+    if isinstance(value, dict):
+        if set(value) == {'__array__'}:
+            return arrays[value['__array__']]
+        return {key: _join_arrays(item, arrays) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_join_arrays(item, arrays) for item in value]
+    return value
+
+
+def encode_state(state, config=None):
+    """Estado de Simulation.get_state() em bytes: .npz comprimido com os arrays e o resto em JSON.
+
+    Com config, grava também os campos da configuração para reconstruir a simulação.
+    """
+    arrays = {}
+    meta = {'version': SNAPSHOT_VERSION, 'state': _split_arrays(state, arrays)}
+    if config is not None:
+        meta['config'] = config_fields(config)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, __meta__=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+                        **arrays)
+    return buffer.getvalue()
+
+
+def decode_state(data):
+    """Inverso de encode_state(): retorna (estado, campos da configuração ou None)"""
+    with np.load(io.BytesIO(data)) as archive:
+        meta = json.loads(archive['__meta__'].tobytes().decode('utf-8'))
+        if meta['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f"Versão de snapshot não suportada: {meta['version']}")
+        arrays = {name: archive[name] for name in archive.files if name != '__meta__'}
+    return _join_arrays(meta['state'], arrays), meta.get('config')
+
+
+def state_digest(state):
+    """Hash do estado (escalares e bytes dos arrays) para comparar execuções"""
+    arrays = {}
+    tree = _split_arrays(state, arrays)
+    digest = hashlib.sha1(json.dumps(tree, sort_keys=True).encode('utf-8'))
+    for name in sorted(arrays, key=lambda name: int(name[1:])):
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()
+
+
+def config_fields(config):
+    return {name: value for name, value in vars(config).items() if name not in _UNSAVED}
+
+
+def make_simulation(fields=None, headless=True):
+    """Simulação com a configuração gravada em um snapshot ou log (campos ausentes ficam no padrão)"""
+    from config import Config
+    from simulation import Simulation
+    config = Config()
+    for name, value in (fields or {}).items():
+        if hasattr(config, name):
+            setattr(config, name, value)
+    config.DETECTION_ASYNC = False
+    return Simulation(config, headless=headless)
+
+
+def save_snapshot(simulation, path):
+    data = encode_state(simulation.get_state(), simulation.config)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def load_snapshot(path):
+    with open(path, 'rb') as f:
+        return decode_state(f.read())
+
+
+def apply_event(simulation, kind, value=None):
+    """Entradas que alteram a simulação (e não só a apresentação)"""
+    if kind == 'strategy':
+        simulation.config.current_strategy = value
+    elif kind == 'reset_complete':
+        simulation.reset_complete()
+    elif kind == 'config':
+        name, field_value = value
+        setattr(simulation.config, name, field_value)
+    else:
+        raise ValueError(f"Evento desconhecido: {kind}")
+
+
+class ReplayLog:
+    """Log de entradas por passo para reprodução determinística.
+
+    Guarda o estado inicial, os eventos (passo, tipo, valor) aplicados antes do update()
+    daquele passo e snapshots a cada SNAPSHOT_INTERVAL passos. Como os geradores
+    aleatórios fazem parte do estado, reproduzir a partir de qualquer snapshot segue
+    exatamente a execução original: não é preciso voltar ao passo 0 para chegar a um
+    momento do log nem para localizar onde uma versão nova do código diverge.
+    """
+
+    def __init__(self, simulation=None, interval=None):
+        self.events = []
+        self.keyframes = {}  # passo -> bytes de encode_state
+        self.config = None
+        self.last_step = 0
+        self.interval = interval
+        if simulation is not None:
+            self.interval = interval or simulation.config.SNAPSHOT_INTERVAL
+            self.config = config_fields(simulation.config)
+            self.keyframes[simulation.step_count] = encode_state(simulation.get_state())
+            self.last_step = simulation.step_count
+
+    def record(self, simulation, kind, value=None):
+        """Aplica o evento à simulação e o registra no passo atual"""
+        apply_event(simulation, kind, value)
+        self.events.append((simulation.step_count, kind, value))
+
+    def observe(self, simulation):
+        """Chamado após cada passo: grava um snapshot a cada `interval` passos"""
+        self.last_step = simulation.step_count
+        if self.interval and simulation.step_count % self.interval == 0 and simulation.step_count not in self.keyframes:
+            self.keyframes[simulation.step_count] = encode_state(simulation.get_state())
+
+    def start_step(self):
+        return min(self.keyframes)
+
+    def keyframe_before(self, step):
+        return max(key for key in self.keyframes if key <= step)
+
+    def save(self, path):
+        steps = sorted(self.keyframes)
+        meta = {
+            'version': SNAPSHOT_VERSION,
+            'config': self.config,
+            'interval': self.interval,
+            'last_step': self.last_step,
+            'events': self.events,
+            'keyframes': steps,
+        }
+        # Cada snapshot já é um .npz comprimido: guardados como bytes sem recompressão
+        arrays = {f"k{step}": np.frombuffer(self.keyframes[step], dtype=np.uint8) for step in steps}
+        with open(path, 'wb') as f:
+            np.savez(f, __meta__=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        log = cls()
+        with np.load(path) as archive:
+            meta = json.loads(archive['__meta__'].tobytes().decode('utf-8'))
+            log.keyframes = {step: archive[f"k{step}"].tobytes() for step in meta['keyframes']}
+        log.config = meta['config']
+        log.interval = meta['interval']
+        log.last_step = meta['last_step']
+        log.events = [(step, kind, value) for step, kind, value in meta['events']]
+        return log
+
+
+def replay(simulation, log, step, start=None, on_step=None):
+    """Leva a simulação ao passo `step`: restaura o snapshot anterior mais próximo e reaplica os eventos"""
+    start = log.keyframe_before(step) if start is None else start
+    # Campos de Config alterados antes do snapshot não fazem parte do estado salvo
+    for event_step, kind, value in log.events:
+        if kind == 'config' and event_step < start:
+            apply_event(simulation, kind, value)
+    simulation.set_state(decode_state(log.keyframes[start])[0])
+    events = [event for event in log.events if start <= event[0] < step]
+    index = 0
+    while simulation.step_count < step:
+        while index < len(events) and events[index][0] <= simulation.step_count:
+            apply_event(simulation, events[index][1], events[index][2])
+            index += 1
+        simulation.update()
+        if on_step is not None:
+            on_step(simulation)
+    return simulation
+
+
+def find_divergence(log, simulation=None):
+    """Primeiro intervalo entre snapshots em que o código atual não reproduz o log.
+
+    Cada intervalo parte do snapshot gravado, então o custo é o de um intervalo por
+    snapshot (paralelizável), não o da execução inteira. Retorna (passo inicial, passo
+    final) do primeiro intervalo divergente ou None se tudo coincide.
+    """
+    simulation = simulation or make_simulation(log.config)
+    steps = sorted(log.keyframes)
+    for start, end in zip(steps, steps[1:]):
+        replay(simulation, log, end, start=start)
+        if state_digest(simulation.get_state()) != state_digest(decode_state(log.keyframes[end])[0]):
+            return start, end
+    return None
+
+
+def branch_strategies(data, strategies, max_frames):
+    """Roda o episódio em curso até a captura a partir do mesmo snapshot, com cada estratégia.
+
+    Retorna {estratégia: frames até a captura (ou None sem captura em max_frames)}.
+    """
+    state, fields = decode_state(data)
+    results = {}
+    for strategy in strategies:
+        simulation = make_simulation(fields)
+        simulation.set_state(state)
+        simulation.config.current_strategy = strategy
+        start = simulation.frame_count
+        while not simulation.captured and simulation.frame_count - start < max_frames:
+            simulation.update()
+        results[strategy] = simulation.frame_count - simulation.current_capture_start if simulation.captured else None
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshots da simulação e reprodução determinística de logs")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seek = commands.add_parser('seek', help="Reproduz um log até o passo pedido e grava o snapshot")
+    seek.add_argument('log', help="Log gravado com main.py --replay-log")
+    seek.add_argument('--step', type=int, required=True)
+    seek.add_argument('--output', required=True, help="Arquivo do snapshot")
+
+    check = commands.add_parser('check', help="Procura o primeiro intervalo em que o código atual diverge do log")
+    check.add_argument('log')
+
+    branch = commands.add_parser('branch', help="Termina o episódio do snapshot com cada estratégia")
+    branch.add_argument('snapshot')
+    branch.add_argument('--strategies', nargs='+', default=None)
+    branch.add_argument('--max-frames', type=int, default=5000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'seek':
+        log = ReplayLog.load(args.log)
+        simulation = replay(make_simulation(log.config), log, args.step)
+        size = save_snapshot(simulation, args.output)
+        print(f"Passo {simulation.step_count} (frame {simulation.frame_count}) -> {args.output} ({size} bytes)")
+    elif args.command == 'check':
+        log = ReplayLog.load(args.log)
+        interval = find_divergence(log)
+        if interval is None:
+            print(f"Reprodução idêntica nos {len(log.keyframes)} snapshots do log")
+            return 0
+        print(f"Divergência entre os passos {interval[0]} e {interval[1]}")
+        return 1
+    else:
+        with open(args.snapshot, 'rb') as f:
+            data = f.read()
+        strategies = args.strategies or decode_state(data)[1]['PURSUIT_STRATEGIES']
+        for strategy, frames in branch_strategies(data, strategies, args.max_frames).items():
+            print(f"{strategy:<14} {'sem captura' if frames is None else f'{frames} frames até a captura'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,125 @@
+# spatial.py
+import numpy as np
+
+
+class UniformGrid:
+    """Índice espacial em grade uniforme para consultas de vizinhança entre agentes.
+
+    build() ordena os itens por célula (counting sort via bincount + argsort), e as
+    consultas visitam só as células próximas de cada ponto, em anéis de distância
+    de Chebyshev crescente. Com células do tamanho de CAPTURE_DISTANCE, a verificação
+    de captura examina no máximo 3x3 células por perseguidor em vez de todos os alvos.
+    """
+
+    def __init__(self, width, height, cell_size):
+        self.cell_size = float(cell_size)
+        self.cols = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+        self.n_cells = self.cols * self.rows
+        self.cell_start = np.zeros(self.n_cells + 1, dtype=np.int64)
+        self.order = np.empty(0, dtype=np.int64)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self._rings = {}
+
+    def _cells(self, x, y):
+        """Coordenadas (coluna, linha) das células que contêm os pontos"""
+        cx = np.clip((x // self.cell_size).astype(np.int64), 0, self.cols - 1)
+        cy = np.clip((y // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return cx, cy
+
+    def build(self, x, y, mask=None):
+        """Indexa os pontos (x, y); com mask, só os itens selecionados entram no índice"""
+        self.x = x
+        self.y = y
+        items = np.flatnonzero(mask) if mask is not None else np.arange(len(x))
+        cx, cy = self._cells(x[items], y[items])
+        cells = cy * self.cols + cx
+        self.order = items[np.argsort(cells, kind='stable')]
+        np.cumsum(np.bincount(cells, minlength=self.n_cells), out=self.cell_start[1:])
+
+    def __len__(self):
+        return len(self.order)
+
+    def _ring_offsets(self, ring):
+        """Deslocamentos (dx, dy) das células a exatamente `ring` células de distância"""
+        offsets = self._rings.get(ring)
+        if offsets is None:
+            span = np.arange(-ring, ring + 1)
+            dx, dy = np.meshgrid(span, span)
+            on_ring = np.maximum(np.abs(dx), np.abs(dy)) == ring
+            offsets = (dx[on_ring], dy[on_ring])
+            self._rings[ring] = offsets
+        return offsets
+
+    def _candidates(self, qx, qy, ring):
+        """Pares (consulta, item) para todos os itens nas células do anel `ring` de cada consulta"""
+        dx, dy = self._ring_offsets(ring)
+        cx, cy = self._cells(qx, qy)
+        ncx = cx[:, None] + dx
+        ncy = cy[:, None] + dy
+        valid = (ncx >= 0) & (ncx < self.cols) & (ncy >= 0) & (ncy < self.rows)
+
+        owner = np.broadcast_to(np.arange(len(qx))[:, None], ncx.shape)[valid]
+        cells = (ncy * self.cols + ncx)[valid]
+        starts = self.cell_start[cells]
+        counts = self.cell_start[cells + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Concatena os intervalos [start, start + count) de cada célula sem laço Python
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        items = self.order[shift + np.arange(total)]
+        return np.repeat(owner, counts), items
+
+    def query_radius(self, qx, qy, radius):
+        """Retorna (consulta, item, distância) para todos os itens a menos de `radius` de cada ponto"""
+        owners, items = [], []
+        for ring in range(int(np.ceil(radius / self.cell_size)) + 1):
+            owner, item = self._candidates(qx, qy, ring)
+            owners.append(owner)
+            items.append(item)
+        owner = np.concatenate(owners)
+        item = np.concatenate(items)
+
+        distance = np.hypot(self.x[item] - qx[owner], self.y[item] - qy[owner])
+        close = distance < radius
+        return owner[close], item[close], distance[close]
+
+    def nearest(self, qx, qy):
+        """Item indexado mais próximo de cada ponto; (-1, inf) quando o índice está vazio.
+
+        Expande anéis de células até que nenhum item ainda não visitado possa estar mais
+        perto que o melhor encontrado: itens além do anel r estão a pelo menos r células.
+        """
+        n = len(qx)
+        best_item = np.full(n, -1, dtype=np.int64)
+        best_distance = np.full(n, np.inf)
+        if len(self.order) == 0:
+            return best_item, best_distance
+
+        pending = np.arange(n)
+        for ring in range(max(self.cols, self.rows)):
+            owner, item = self._candidates(qx[pending], qy[pending], ring)
+            if len(item):
+                query = pending[owner]
+                distance = np.hypot(self.x[item] - qx[query], self.y[item] - qy[query])
+
+                # Menor distância por consulta: ordena por (consulta, distância) e pega o primeiro
+                order = np.lexsort((distance, query))
+                query = query[order]
+                first = np.ones(len(query), dtype=bool)
+                first[1:] = query[1:] != query[:-1]
+                query = query[first]
+                distance = distance[order][first]
+                item = item[order][first]
+
+                better = distance < best_distance[query]
+                best_distance[query[better]] = distance[better]
+                best_item[query[better]] = item[better]
+
+            pending = pending[best_distance[pending] > ring * self.cell_size]
+            if len(pending) == 0:
+                break
+        return best_item, best_distance
\ No newline at end of file
@@ -1,27 +1,36 @@
 # sprites.py
 import pygame
 import os
+import hashlib
+from collections import OrderedDict
 
 class SpriteManager:
     def __init__(self, config):
         self.config = config
         self.sprites = {}
+        
+        # Cache de rotação: ângulos quantizados em passos de ROTATION_STEP graus
+        self.rotation_cache = OrderedDict()  # (tipo, índice do ângulo) -> superfície (LRU)
+        self.atlases = {}  # tipo -> lista completa de superfícies, uma por ângulo
+        self._digests = {}  # tipo -> SHA-1 do arquivo de origem
+        
         self.load_sprites()
+        
+        if config.ROTATION_PREBUILD and config.ROTATION_STEP:
+            for sprite_type in ('target', 'pursuer'):
+                if self.sprites.get(sprite_type) is not None:
+                    self.atlases[sprite_type] = self._load_or_build_atlas(sprite_type)
     
     def load_sprites(self):
         """Carrega e prepara todos os sprites"""
         try:
-            # Carregar imagem do alvo (Ligeirinho)
-            target_img = pygame.image.load(self.config.IMAGE_PATHS['target']).convert_alpha()
-            # Redimensionar para o tamanho do agente
+            # Carregar imagem do alvo (Ligeirinho) já no tamanho do agente
             target_size = (self.config.TARGET_SIZE, self.config.TARGET_SIZE)
-            self.sprites['target'] = pygame.transform.smoothscale(target_img, target_size)
+            self.sprites['target'] = self._load_scaled('target', target_size)
             
-            # Carregar imagem do perseguidor (Frajola)
-            pursuer_img = pygame.image.load(self.config.IMAGE_PATHS['pursuer']).convert_alpha()
-            # Redimensionar para o tamanho do agente
+            # Carregar imagem do perseguidor (Frajola) já no tamanho do agente
             pursuer_size = (self.config.PURSUER_SIZE, self.config.PURSUER_SIZE)
-            self.sprites['pursuer'] = pygame.transform.smoothscale(pursuer_img, pursuer_size)
+            self.sprites['pursuer'] = self._load_scaled('pursuer', pursuer_size)
             
             print("Sprites carregados com sucesso!")
             
@@ -31,12 +40,124 @@ class SpriteManager:
             self.sprites['target'] = None
             self.sprites['pursuer'] = None
     
+    def _load_image(self, path):
+        """Carrega uma imagem; convert_alpha só é possível com um display ativo"""
+        image = pygame.image.load(path)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return image.convert_alpha()
+        
+        # Sem display: copiar para uma superfície de 32 bits com alfa (exigida pelo smoothscale)
+        converted = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        converted.blit(image, (0, 0))
+        return converted
+    
+    def _source_digest(self, sprite_type):
+        """SHA-1 do arquivo de origem do sprite (lido uma vez por execução)"""
+        digest = self._digests.get(sprite_type)
+        if digest is None:
+            with open(self.config.IMAGE_PATHS[sprite_type], 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            self._digests[sprite_type] = digest
+        return digest
+    
+    def _load_scaled(self, sprite_type, size):
+        """Sprite redimensionado, lido do cache em disco (chave: hash da origem e tamanho).
+
+        Sem cache, decodifica a imagem original e aplica o smoothscale, gravando o resultado
+        para as próximas execuções: a imagem em tamanho cheio só é decodificada uma vez.
+        """
+        cache_dir = self.config.SPRITE_CACHE_DIR
+        path = None
+        if cache_dir:
+            name = f"{sprite_type}_{self._source_digest(sprite_type)[:16]}_{size[0]}x{size[1]}.png"
+            path = os.path.join(cache_dir, name)
+            if os.path.exists(path):
+                try:
+                    return self._load_image(path)
+                except pygame.error as e:
+                    print(f"Erro ao carregar sprite do cache: {e}")
+        
+        sprite = pygame.transform.smoothscale(self._load_image(self.config.IMAGE_PATHS[sprite_type]), size)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                pygame.image.save(sprite, path)
+            except (pygame.error, OSError) as e:
+                print(f"Erro ao salvar sprite no cache: {e}")
+        return sprite
+    
     def get_rotated_sprite(self, sprite_type, angle):
-        """Retorna um sprite rotacionado"""
+        """Retorna um sprite rotacionado (do cache, com o ângulo quantizado)"""
         if self.sprites.get(sprite_type) is None:
             return None
         
-        return pygame.transform.rotate(self.sprites[sprite_type], angle)
+        step = self.config.ROTATION_STEP
+        if not step:
+            return pygame.transform.rotate(self.sprites[sprite_type], angle)
+        
+        index = int(round(angle / step)) % self._angle_count()
+        
+        atlas = self.atlases.get(sprite_type)
+        if atlas is not None:
+            return atlas[index]
+        
+        key = (sprite_type, index)
+        rotated = self.rotation_cache.get(key)
+        if rotated is not None:
+            self.rotation_cache.move_to_end(key)
+            return rotated
+        
+        rotated = pygame.transform.rotate(self.sprites[sprite_type], index * step)
+        self.rotation_cache[key] = rotated
+        if len(self.rotation_cache) > self.config.ROTATION_CACHE_SIZE:
+            self.rotation_cache.popitem(last=False)  # Descartar o menos usado recentemente
+        return rotated
+    
+    def _angle_count(self):
+        return max(1, int(round(360 / self.config.ROTATION_STEP)))
+    
+    def _atlas_path(self, sprite_type):
+        """Caminho do atlas em disco, identificado pelo conteúdo da imagem, tamanho e passo"""
+        cache_dir = self.config.ROTATION_CACHE_DIR
+        if not cache_dir:
+            return None
+        
+        width, height = self.sprites[sprite_type].get_size()
+        name = f"{sprite_type}_{self._source_digest(sprite_type)[:16]}_{width}x{height}_step{self.config.ROTATION_STEP}.png"
+        return os.path.join(cache_dir, name)
+    
+    def _load_or_build_atlas(self, sprite_type):
+        """Carrega o atlas de rotações do disco ou o monta e grava para as próximas execuções"""
+        count = self._angle_count()
+        path = self._atlas_path(sprite_type)
+        
+        if path and os.path.exists(path):
+            try:
+                strip = self._load_image(path)
+                cell = strip.get_height()
+                if strip.get_width() == cell * count:
+                    # Subsuperfícies compartilham os pixels da faixa (sem cópia)
+                    return [strip.subsurface((i * cell, 0, cell, cell)) for i in range(count)]
+            except pygame.error as e:
+                print(f"Erro ao carregar atlas de rotação: {e}")
+        
+        sprite = self.sprites[sprite_type]
+        rotated = [pygame.transform.rotate(sprite, i * self.config.ROTATION_STEP) for i in range(count)]
+        
+        # Cada rotação centralizada em uma célula quadrada de tamanho fixo
+        cell = max(max(surface.get_width(), surface.get_height()) for surface in rotated)
+        strip = pygame.Surface((cell * count, cell), pygame.SRCALPHA, 32)
+        for i, surface in enumerate(rotated):
+            strip.blit(surface, surface.get_rect(center=(i * cell + cell // 2, cell // 2)))
+        
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                pygame.image.save(strip, path)
+            except (pygame.error, OSError) as e:
+                print(f"Erro ao salvar atlas de rotação: {e}")
+        
+        return [strip.subsurface((i * cell, 0, cell, cell)) for i in range(count)]
     
     def get_sprite(self, sprite_type):
         """Retorna o sprite original"""
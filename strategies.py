@@ -0,0 +1,100 @@
+# strategies.py
+from collections import namedtuple
+import numpy as np
+
+# Estado dos perseguidores e estimativa dos alvos: cada campo é um array (um elemento
+# por perseguidor) ou um escalar. heading é a direção do último movimento e los o ângulo
+# da linha de visada no último movimento (nan = ainda desconhecidos).
+PursuerState = namedtuple('PursuerState', 'x y speed heading los')
+TargetEstimate = namedtuple('TargetEstimate', 'x y vx vy')
+
+STRATEGIES = {}
+
+
+def register(name):
+    """Registra uma estratégia: kernel(pursuers, targets, config) -> (heading, los)"""
+    def decorator(kernel):
+        STRATEGIES[name] = kernel
+        return kernel
+    return decorator
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Estratégia desconhecida: {name}") from None
+
+
+def pursue(name, pursuers, targets, config):
+    """Aplica a estratégia e retorna (dx, dy, heading, los) do passo de cada perseguidor.
+
+    Perseguidores já sobre o alvo não se movem (como em Pursuer._direct_pursuit).
+    """
+    heading, los = get_strategy(name)(pursuers, targets, config)
+    at_target = (targets.x == pursuers.x) & (targets.y == pursuers.y)
+    step = np.where(at_target, 0.0, pursuers.speed)
+    return np.cos(heading) * step, np.sin(heading) * step, heading, los
+
+
+def intercept_time(px, py, speed, tx, ty, tvx, tvy):
+    """Tempo (frames) até o perseguidor interceptar o alvo em movimento retilíneo.
+
+    Resolve |T + V·t - P| = s·t, isto é a·t² + b·t + c = 0 com R = T - P, a = V·V - s²,
+    b = 2(R·V) e c = R·R. A menor raiz positiva é escrita como 2c / (sqrt(b² - 4ac) - b),
+    forma que também cobre a = 0 (mesma velocidade); inf quando não há interceptação.
+    Os argumentos são arrays compatíveis por broadcasting (ex.: perseguidores x alvos).
+    """
+    rx = tx - px
+    ry = ty - py
+    a = tvx * tvx + tvy * tvy - speed * speed
+    b = 2 * (rx * tvx + ry * tvy)
+    c = rx * rx + ry * ry
+    disc = b * b - 4 * a * c
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = np.sqrt(np.maximum(disc, 0)) - b
+        t = np.asarray(2 * c / denominator)
+    t[(disc < 0) | (denominator <= 0)] = np.inf
+    t[c == 0] = 0.0
+    return t
+
+
+def _line_of_sight(pursuers, targets):
+    return np.arctan2(targets.y - pursuers.y, targets.x - pursuers.x)
+
+
+@register("direct")
+def direct_pursuit(pursuers, targets, config):
+    """Perseguição direta: aponta para a posição atual do alvo"""
+    los = _line_of_sight(pursuers, targets)
+    return los, los
+
+
+@register("intercept")
+def intercept_pursuit(pursuers, targets, config):
+    """Interceptação preditiva: aponta para T + V·t, com t da solução fechada.
+
+    Quando o alvo não pode ser alcançado em linha reta (mais rápido e se afastando),
+    aponta para a posição atual, como a perseguição direta.
+    """
+    t = intercept_time(pursuers.x, pursuers.y, pursuers.speed,
+                       targets.x, targets.y, targets.vx, targets.vy)
+    t = np.where(np.isfinite(t), t, 0.0)
+    aim_x = targets.x + targets.vx * t
+    aim_y = targets.y + targets.vy * t
+    heading = np.arctan2(aim_y - pursuers.y, aim_x - pursuers.x)
+    return heading, _line_of_sight(pursuers, targets)
+
+
+@register("proportional")
+def proportional_navigation(pursuers, targets, config):
+    """Navegação proporcional: gira o rumo N vezes a variação da linha de visada.
+
+    No primeiro movimento (rumo ou linha de visada desconhecidos) aponta para o alvo.
+    """
+    los = _line_of_sight(pursuers, targets)
+    los_rate = (los - pursuers.los + np.pi) % (2 * np.pi) - np.pi  # Diferença em [-pi, pi)
+    heading = pursuers.heading + config.PN_GAIN * los_rate
+    unknown = np.isnan(pursuers.heading) | np.isnan(pursuers.los)
+    return np.where(unknown, los, heading), los
\ No newline at end of file
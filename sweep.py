@@ -0,0 +1,336 @@
+# sweep.py
+import os
+import csv
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from config import Config
+from aggregates import BenchmarkAggregate
+from results import ResultsWriter, load_results
+from benchmark import run_shard, compute_statistics, write_reports, STATISTICS_COLUMNS
+
+# Campos ajustados com mais frequência (qualquer atributo de Config pode ser varrido)
+SWEEP_FIELDS = [
+    'TARGET_MIN_SPEED', 'TARGET_MAX_SPEED', 'PURSUER_SPEED', 'PURSUER_REACTION_TIME',
+    'DETECTION_THRESHOLD', 'MOTION_THRESHOLD', 'CAPTURE_DISTANCE', 'strategy'
+]
+
+# Versão do conteúdo das células: incrementar quando a simulação mudar de comportamento
+CACHE_VERSION = 2
+
+# Atributos que não alteram os resultados de uma célula
+_UNHASHED = {
+    'current_strategy', 'SWEEP_CACHE_DIR', 'ROTATION_CACHE_DIR', 'SPRITE_CACHE_DIR', 'HUD_FONT',
+    'RECORD_QUEUE_SIZE', 'RECORD_CODEC', 'RECORD_FPS', 'SNAPSHOT_INTERVAL',
+    'DATASET_SHARD_FRAMES'
+}
+
+
+def parse_value(text):
+    """'10' -> 10, '0.5' -> 0.5, 'None' -> None; qualquer outro texto fica como string"""
+    if text == 'None':
+        return None
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_param(spec):
+    """CAMPO=v1,v2,... (lista de valores) ou CAMPO=min:max (faixa, só no desenho aleatório)"""
+    name, _, values = spec.partition('=')
+    if not values:
+        raise ValueError(f"Parâmetro sem valores: {spec}")
+    if ':' in values:
+        low, high = values.split(':', 1)
+        return name, (parse_value(low), parse_value(high))
+    return name, [parse_value(value) for value in values.split(',')]
+
+
+def grid_design(space):
+    """Todas as combinações dos valores listados: [{campo: valor}, ...]"""
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"A grade precisa de uma lista de valores em {name} (use v1,v2,...)")
+    names = list(space)
+    return [dict(zip(names, combination)) for combination in itertools.product(*space.values())]
+
+
+def random_design(space, samples, seed=None):
+    """Pontos sorteados: faixas (min, max) uniformes (inteiras se ambos forem int), listas por escolha"""
+    rng = np.random.default_rng(seed)
+    points = []
+    for _ in range(samples):
+        point = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    point[name] = int(rng.integers(low, high + 1))
+                else:
+                    point[name] = float(rng.uniform(low, high))
+            else:
+                point[name] = values[int(rng.integers(len(values)))]
+        points.append(point)
+    return points
+
+
+def point_config(base, point):
+    """Cópia de base com os campos do ponto (a estratégia não é campo de Config)"""
+    config = Config()
+    config.__dict__.update(base.__dict__)
+    for name, value in point.items():
+        if name == 'strategy':
+            continue
+        if not hasattr(config, name):
+            raise ValueError(f"Campo desconhecido em Config: {name}")
+        setattr(config, name, value)
+    return config
+
+
+def cell_key(config, strategy, seed, first_run, last_run, engine, max_frames):
+    """Conteúdo que identifica uma célula: configuração completa, estratégia e faixa fixa do bloco"""
+    fields = {name: value for name, value in vars(config).items() if name not in _UNHASHED}
+    return {
+        'version': CACHE_VERSION,
+        'config': fields,
+        'strategy': strategy,
+        'seed': seed,
+        'runs': [first_run, last_run],
+        'engine': engine,
+        'max_frames': max_frames,
+    }
+
+
+def cell_hash(key):
+    text = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _contiguous(run_ids):
+    """Divide run_ids ordenados em faixas contíguas [[a, a + 1, ...], ...]"""
+    ranges = []
+    for run_id in run_ids:
+        if ranges and run_id == ranges[-1][-1] + 1:
+            ranges[-1].append(run_id)
+        else:
+            ranges.append([run_id])
+    return ranges
+
+
+class ResultCache:
+    """Células concluídas em <diretório>/<hash[:2]>/<hash>/<primeira>-<última>/ (partes .npz de results.py).
+
+    O hash identifica o bloco (faixa fixa de SWEEP_BLOCK_RUNS execuções); dentro dele,
+    cada subcélula guarda as execuções de uma faixa contígua já calculada, então um
+    bloco parcial é completado depois só com as execuções que faltam. Cada subcélula é
+    gravada em um diretório temporário e renomeada ao final: uma varredura interrompida
+    nunca deixa células pela metade.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def cell_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest)
+
+    def subcells(self, digest):
+        """Faixas [(primeira, última)] já gravadas no bloco"""
+        path = self.cell_path(digest)
+        if not os.path.isdir(path):
+            return []
+        ranges = []
+        for name in os.listdir(path):
+            first, _, last = name.partition('-')
+            if first.isdigit() and last.isdigit():
+                ranges.append((int(first), int(last)))
+        return sorted(ranges)
+
+    def store(self, digest, key, columns):
+        run_ids = columns['run_id']
+        final = os.path.join(self.cell_path(digest), f"{int(run_ids.min())}-{int(run_ids.max())}")
+        temporary = f"{final}.tmp-{os.getpid()}"
+        writer = ResultsWriter(temporary, chunk_rows=len(run_ids) + 1)
+        writer.append(columns)
+        writer.close()
+        with open(os.path.join(temporary, 'cell.json'), 'w', encoding='utf-8') as f:
+            json.dump(key, f, indent=2, sort_keys=True, default=str)
+        try:
+            os.replace(temporary, final)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)  # Outra execução gravou a mesma subcélula
+
+    def load(self, digest, first, last):
+        return load_results(os.path.join(self.cell_path(digest), f"{first}-{last}"))
+
+
+def plan_sweep(base, points, strategies, runs, seed, block_runs, engine, max_frames):
+    """Lista as células [(ponto, estratégia, shard, hash, chave)] em blocos de block_runs execuções.
+
+    O bloco i usa a mesma SeedSequence em todos os pontos e estratégias (números
+    aleatórios comuns), igual aos blocos de benchmark.make_shards. A chave usa a faixa
+    fixa do bloco; o shard traz só as execuções pedidas (menos no último bloco parcial).
+    """
+    root = np.random.SeedSequence(seed)
+    cells = []
+    for point_index, point in enumerate(points):
+        config = point_config(base, point)
+        point_strategies = [point['strategy']] if 'strategy' in point else strategies
+        for block_index, first in enumerate(range(0, runs, block_runs)):
+            run_ids = list(range(first + 1, min(runs, first + block_runs) + 1))
+            for strategy in point_strategies:
+                key = cell_key(config, strategy, seed, first + 1, first + block_runs, engine, max_frames)
+                seed_sequence = np.random.SeedSequence(root.entropy, spawn_key=(block_index,))
+                shard = (config, strategy, run_ids, seed_sequence, max_frames, engine)
+                cells.append((point_index, strategy, shard, cell_hash(key), key))
+    return cells
+
+
+def cell_coverage(cache, digest, run_ids, engine):
+    """Subcélulas a ler e execuções que faltam para cobrir run_ids.
+
+    No motor escalar cada execução tem semente própria, então subcélulas parciais são
+    reaproveitadas e só as execuções ausentes rodam. No motor em lote o resultado depende
+    do conjunto de execuções simuladas juntas: só vale uma subcélula com a mesma faixa.
+    """
+    first, last = run_ids[0], run_ids[-1]
+    cached = cache.subcells(digest)
+    if engine == "batch":
+        if (first, last) in cached:
+            return [(first, last)], []
+        return [], [run_ids]
+    used = [(a, b) for a, b in cached if a <= last and b >= first]
+    covered = set()
+    for a, b in used:
+        covered.update(range(a, b + 1))
+    return used, _contiguous([run_id for run_id in run_ids if run_id not in covered])
+
+
+def run_sweep(base, points, strategies, runs, seed, cache, workers=None, block_runs=None,
+              engine="scalar", max_frames=None):
+    """Executa só as execuções ausentes do cache e retorna {índice do ponto: BenchmarkAggregate}"""
+    block_runs = block_runs or base.SWEEP_BLOCK_RUNS
+    max_frames = max_frames or base.MAX_EPISODE_FRAMES
+    cells = plan_sweep(base, points, strategies, runs, seed, block_runs, engine, max_frames)
+
+    # Células repetidas (ex.: o mesmo ponto sorteado duas vezes) rodam uma vez só
+    pending = {}
+    cached = 0
+    for cell in cells:
+        _, missing = cell_coverage(cache, cell[3], cell[2][2], engine)
+        cached += not missing
+        for run_ids in missing:
+            config, strategy, _, seed_sequence, _, _ = cell[2]
+            shard = (config, strategy, run_ids, seed_sequence, max_frames, engine)
+            pending[(cell[3], run_ids[0], run_ids[-1])] = (cell, shard)
+    pending = list(pending.values())
+    print(f"{len(cells)} células, {cached} no cache, {len(pending)} faixas a executar")
+
+    workers = workers or os.cpu_count() or 1
+    if pending:
+        shards = [shard for _, shard in pending]
+        if workers == 1:
+            shard_results = map(run_shard, shards)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            shard_results = executor.map(run_shard, shards)
+        for done, ((cell, shard), (columns, _)) in enumerate(zip(pending, shard_results), start=1):
+            cache.store(cell[3], cell[4], columns)
+            print(f"[{done}/{len(pending)}] ponto {cell[0]} {cell[1]} execuções {shard[2][0]}-{shard[2][-1]}")
+        if workers > 1:
+            executor.shutdown()
+
+    aggregates = {}
+    for point_index, point in enumerate(points):
+        point_strategies = [point['strategy']] if 'strategy' in point else strategies
+        aggregates[point_index] = BenchmarkAggregate(point_strategies, base.AGGREGATE_QUANTILE_ACCURACY)
+    for point_index, strategy, shard, digest, _ in cells:
+        run_ids = shard[2]
+        used, _ = cell_coverage(cache, digest, run_ids, engine)
+        for first, last in used:
+            columns = cache.load(digest, first, last)
+            # Subcélulas de uma varredura com mais execuções: só as execuções pedidas
+            selected = (columns['run_id'] >= run_ids[0]) & (columns['run_id'] <= run_ids[-1])
+            if not selected.all():
+                columns = {name: values[selected] for name, values in columns.items()}
+            aggregates[point_index].add(strategy, columns)
+    return aggregates
+
+
+def write_sweep_reports(output_dir, points, aggregates):
+    """Relatórios de cada ponto (como em benchmark.py) e sweep_summary.csv com todos os pontos"""
+    os.makedirs(output_dir, exist_ok=True)
+    names = list(dict.fromkeys(name for point in points for name in point if name != 'strategy'))
+    columns = ['Ponto'] + names + STATISTICS_COLUMNS
+
+    rows = []
+    for point_index, point in enumerate(points):
+        point_dir = os.path.join(output_dir, f"ponto_{point_index:03d}")
+        write_reports(point_dir, aggregates[point_index])
+        with open(os.path.join(point_dir, 'parametros.json'), 'w', encoding='utf-8') as f:
+            json.dump(point, f, indent=2)
+        for statistics in compute_statistics(aggregates[point_index]):
+            row = {'Ponto': point_index}
+            row.update({name: point.get(name) for name in names})
+            row.update(statistics)
+            rows.append(row)
+
+    with open(os.path.join(output_dir, 'sweep_summary.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def parse_args(argv=None):
+    config = Config()
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros com cache de resultados por célula")
+    parser.add_argument('--param', nargs='+', required=True, metavar='CAMPO=VALORES',
+                        help="Ex.: PURSUER_REACTION_TIME=0,5,10 ou CAPTURE_DISTANCE=15:30 (faixa no "
+                             f"desenho aleatório). Campos usuais: {', '.join(SWEEP_FIELDS)}")
+    parser.add_argument('--design', choices=['grid', 'random'], default='grid')
+    parser.add_argument('--samples', type=int, default=20, help="Pontos do desenho aleatório")
+    parser.add_argument('--runs', type=int, default=100, help="Execuções por ponto e estratégia")
+    parser.add_argument('--strategies', nargs='+', default=config.PURSUIT_STRATEGIES,
+                        choices=config.PURSUIT_STRATEGIES)
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Semente raiz (a mesma semente reaproveita as células do cache)")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument('--block-runs', type=int, default=config.SWEEP_BLOCK_RUNS)
+    parser.add_argument('--max-frames', type=int, default=config.MAX_EPISODE_FRAMES)
+    parser.add_argument('--engine', choices=['scalar', 'batch'], default='scalar')
+    parser.add_argument('--cache', default=config.SWEEP_CACHE_DIR, help="Diretório do cache de células")
+    parser.add_argument('--output', default=None, help="Diretório de saída")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = Config()
+    space = dict(parse_param(spec) for spec in args.param)
+    if args.design == 'grid':
+        points = grid_design(space)
+    else:
+        points = random_design(space, args.samples, args.seed)
+
+    start = time.perf_counter()
+    aggregates = run_sweep(config, points, args.strategies, args.runs, args.seed, ResultCache(args.cache),
+                           args.workers, args.block_runs, args.engine, args.max_frames)
+    elapsed = time.perf_counter() - start
+
+    output_dir = args.output or f"sweep_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    write_sweep_reports(output_dir, points, aggregates)
+    print(f"{len(points)} pontos em {elapsed:.2f}s -> {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,45 @@
+# test_profiler.py
+import time
+import pygame
+from config import Config
+from profiler import FrameProfiler
+from simulation import Simulation
+
+
+def test_render_on_unsampled_frames_is_not_measured():
+    """Headless com render a cada 16 frames fora da amostragem: as fases de render ficam vazias"""
+    pygame.font.init()
+    config = Config()
+    config.PROFILER = True
+    config.PROFILER_HEADLESS_SAMPLE = 16
+    simulation = Simulation(config, headless=True, seed=1)
+    profiler = simulation.profiler
+
+    for frame in range(1, 321):
+        profiler.begin_frame()
+        simulation.update()
+        if frame % 16 == 0:  # Frames 16, 32, ...: índices 15, 31, ... nunca são amostrados
+            simulation.render()
+        profiler.end_frame()
+
+    phases = profiler.summary()['phases']
+    assert profiler.sampled == 20
+    assert not any(phase.startswith('render') for phase in phases)
+    assert {'target', 'detection', 'pursuer'} <= set(phases)
+
+
+def test_phase_percentiles_start_when_the_phase_appears():
+    config = Config()
+    config.PROFILER_WINDOW = 100
+    profiler = FrameProfiler(config)
+    for frame in range(150):
+        profiler.begin_frame()
+        profiler.mark('early')
+        if frame >= 120:
+            time.sleep(0.001)
+            profiler.mark('late')
+        profiler.end_frame()
+
+    late = profiler.summary()['phases']['late']
+    assert late['p50'] >= 1.0
+    assert profiler.first_sample[profiler.phases.index('late')] == 120
\ No newline at end of file
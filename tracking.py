@@ -0,0 +1,120 @@
+# tracking.py
+import numpy as np
+
+
+class ROITracker:
+    """Rastreamento preditivo da região de interesse (ROI) da detecção por pixels.
+
+    Um filtro de Kalman de velocidade constante estima a posição do alvo no próximo
+    quadro; o detector processa apenas uma janela ao redor da previsão. Após falhas
+    consecutivas a janela dobra de tamanho até voltar à busca no quadro inteiro.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.width = config.WIDTH
+        self.height = config.HEIGHT
+
+        # Modelo de velocidade constante com dt = 1 frame: estado (x, y, vx, vy)
+        self.F = np.array([[1, 0, 1, 0],
+                           [0, 1, 0, 1],
+                           [0, 0, 1, 0],
+                           [0, 0, 0, 1]], dtype=float)
+        self.H = np.array([[1, 0, 0, 0],
+                           [0, 1, 0, 0]], dtype=float)
+        self.Q = np.eye(4) * config.ROI_PROCESS_NOISE
+        self.R = np.eye(2) * config.ROI_MEASUREMENT_NOISE
+
+        self.state = None
+        self.P = None
+        self.misses = 0
+
+        # Estatísticas
+        self.frames = 0
+        self.hits = 0
+        self.full_frame_searches = 0
+        self.roi_area_total = 0
+
+    def reset(self):
+        """Esquece a estimativa (ex.: o alvo reapareceu em outra borda)"""
+        self.state = None
+        self.P = None
+        self.misses = 0
+
+    def predict(self, dt=1):
+        """Avança o filtro dt quadros e retorna a ROI (x0, y0, x1, y1) a processar"""
+        self.frames += 1
+
+        if self.state is None:
+            roi = (0, 0, self.width, self.height)
+            self.full_frame_searches += 1
+        else:
+            F = self.F
+            if dt != 1:
+                F = F.copy()
+                F[0, 2] = F[1, 3] = dt
+            self.state = F @ self.state
+            self.P = F @ self.P @ F.T + self.Q * dt
+
+            # Janela de validação: N desvios-padrão da inovação, dobrando a cada falha
+            sigma = np.sqrt(max(self.P[0, 0], self.P[1, 1]) + self.R[0, 0])
+            half = max(self.config.ROI_MIN_HALF_SIZE, self.config.ROI_GATE_SIGMAS * sigma)
+            half *= 2 ** self.misses
+
+            x, y = self.state[0], self.state[1]
+            roi = (max(0, int(x - half)), max(0, int(y - half)),
+                   min(self.width, int(np.ceil(x + half))), min(self.height, int(np.ceil(y + half))))
+            if roi == (0, 0, self.width, self.height):
+                self.full_frame_searches += 1
+
+        self.roi_area_total += (roi[2] - roi[0]) * (roi[3] - roi[1])
+        return roi
+
+    def update(self, position):
+        """Incorpora uma detecção à estimativa"""
+        self.hits += 1
+        self.misses = 0
+        measurement = np.asarray(position, dtype=float)
+
+        if self.state is None:
+            self.state = np.array([measurement[0], measurement[1], 0.0, 0.0])
+            # Velocidade desconhecida: incerteza da ordem da velocidade máxima do alvo
+            speed_variance = self.config.TARGET_MAX_SPEED ** 2
+            self.P = np.diag([self.R[0, 0], self.R[1, 1], speed_variance, speed_variance])
+            return
+
+        innovation = measurement - self.H @ self.state
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.state = self.state + K @ innovation
+        self.P = (np.eye(4) - K @ self.H) @ self.P
+
+    def miss(self):
+        """Registra um quadro sem detecção; após ROI_MAX_MISSES volta à busca completa"""
+        self.misses += 1
+        if self.misses > self.config.ROI_MAX_MISSES:
+            self.reset()
+
+    def get_state(self):
+        """Estimativa do filtro e contadores (snapshot.py)"""
+        return {
+            'state': self.state.copy() if self.state is not None else None,
+            'P': self.P.copy() if self.P is not None else None,
+            'misses': self.misses,
+            'frames': self.frames,
+            'hits': self.hits,
+            'full_frame_searches': self.full_frame_searches,
+            'roi_area_total': self.roi_area_total,
+        }
+
+    def set_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value.copy() if isinstance(value, np.ndarray) else value)
+
+    def get_stats(self):
+        frames = max(1, self.frames)
+        return {
+            'roi_area_fraction': self.roi_area_total / (frames * self.width * self.height),
+            'hit_rate': self.hits / frames,
+            'full_frame_rate': self.full_frame_searches / frames,
+        }
\ No newline at end of file
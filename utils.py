@@ -14,17 +14,42 @@ def calculate_performance_metrics(simulation):
     avg_capture_time = simulation.total_capture_time / simulation.capture_count if simulation.capture_count > 0 else float('inf')
     
     precision, recall, f1 = simulation.metrics.get_metrics()
+    window_precision, window_recall, window_f1 = simulation.metrics.get_window_metrics()
     
-    return {
+    results = {
         'capture_rate': capture_rate,
         'avg_capture_time': avg_capture_time,
         'detection_precision': precision,
         'detection_recall': recall,
         'detection_f1': f1,
+        'window_precision': window_precision,
+        'window_recall': window_recall,
+        'window_f1': window_f1,
         'total_captures': simulation.capture_count,
         'total_frames': simulation.frame_count,
         'current_strategy': simulation.config.current_strategy
     }
+    
+    # Estatísticas do rastreamento de ROI (apenas com a detecção por pixels)
+    detector = simulation.detector
+    if simulation.async_detector is not None:
+        detector = simulation.async_detector.detector
+        for key, value in simulation.async_detector.get_stats().items():
+            results[f'async_{key}'] = value
+    for key, value in detector.get_tracking_stats().items():
+        results[f'tracking_{key}'] = value
+    
+    # Relógio de passo fixo (apenas no loop com janela)
+    if simulation.scheduler.frames > 0:
+        results.update(simulation.scheduler.get_stats())
+    
+    # Tempo por fase (apenas com o perfil ativo)
+    if simulation.profiler is not None:
+        summary = simulation.profiler.summary()
+        results['profile_fps'] = summary['fps']
+        for phase, stats in summary['phases'].items():
+            results[f'profile_{phase}_p95_ms'] = stats['p95']
+    return results
 
 def save_results(results, filename="results.txt"):
     """Salva resultados em arquivo"""